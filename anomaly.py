@@ -0,0 +1,191 @@
+import time
+import numpy as np
+
+# Streaming anomaly detection on the monitor's own samples: CPU/memory/
+# process-count spikes for the system, CPU spikes and steady memory growth
+# (possible leaks) per process. All state is kept in NumPy arrays aligned
+# with the rows of the latest snapshot and updated in place, so each sample
+# of each series costs O(1) and a tick over thousands of processes is a
+# handful of vectorized operations. Qt-free; the UI turns detections into
+# alerts.
+
+class EwmaStats:
+    # Exponentially weighted mean and variance for many series at once. A
+    # value's z-score is measured against the state before it is added.
+    def __init__(self, size=0, alpha=0.1):
+        self.alpha = alpha
+        self.mean = np.zeros(size)
+        self.var = np.zeros(size)
+        self.count = np.zeros(size, dtype=np.int64)
+
+    def carry(self, previous_rows):
+        # Reorder to a new set of series: previous_rows[i] is the old index
+        # of series i, or -1 for a new series (starts empty)
+        self.mean = carry(self.mean, previous_rows, 0.0)
+        self.var = carry(self.var, previous_rows, 0.0)
+        self.count = carry(self.count, previous_rows, 0)
+
+    def zscore(self, values, warmup, min_std=0.0):
+        # min_std lets a series that has been flat still register a jump
+        std = np.maximum(np.sqrt(self.var), min_std)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            z = (values - self.mean) / std
+        # Too few samples, or a flat series without a min_std
+        return np.where((self.count >= warmup) & (std > 0), z, 0.0)
+
+    def update(self, values):
+        first = self.count == 0
+        diff = values - self.mean
+        increment = self.alpha * diff
+        self.mean = np.where(first, values, self.mean + increment)
+        self.var = np.where(first, 0.0, (1 - self.alpha) * (self.var + diff * increment))
+        self.count += 1
+
+def carry(array, previous_rows, fill):
+    result = np.full(len(previous_rows), fill, dtype=array.dtype)
+    known = previous_rows >= 0
+    result[known] = array[previous_rows[known]]
+    return result
+
+class Detection:
+    __slots__ = ('kind', 'message', 'level', 'score')
+
+    def __init__(self, kind, message, level="warning", score=0.0):
+        self.kind = kind
+        self.message = message
+        self.level = level
+        self.score = score
+
+class AnomalyDetector:
+    # System series are CPU %, memory % and the process count; per-process
+    # series are CPU % and RSS. A spike needs both a z-score above
+    # z_threshold and a minimum absolute change, so quiet series with tiny
+    # variance don't alert on noise. A leak is RSS that hasn't dropped for
+    # leak_samples samples and grew by leak_growth (and leak_min_bytes)
+    # over them. Each series alerts at most once per cooldown seconds.
+    SYSTEM_SERIES = ('cpu_percent', 'memory_percent', 'process_count')
+    SYSTEM_MIN_CHANGE = (20.0, 5.0, 20)
+    SYSTEM_MIN_STD = (0.5, 0.1, 1.0)
+    PROCESS_MIN_CHANGE = 25.0
+
+    def __init__(self, z_threshold=4.0, alpha=0.1, warmup=20, cooldown=60.0,
+                 leak_samples=60, leak_growth=0.2, leak_min_bytes=50 * 1024 ** 2):
+        self.z_threshold = z_threshold
+        self.alpha = alpha
+        self.warmup = warmup
+        self.cooldown = cooldown
+        self.leak_samples = leak_samples
+        self.leak_growth = leak_growth
+        self.leak_min_bytes = leak_min_bytes
+        self.reset()
+
+    def reset(self):
+        # Forget every series, e.g. when switching to another host
+        self.system = EwmaStats(len(self.SYSTEM_SERIES), self.alpha)
+        self.system_alerted = np.full(len(self.SYSTEM_SERIES), -np.inf)
+        self.previous = None
+        self.cpu = EwmaStats(0, self.alpha)
+        self.cpu_alerted = np.zeros(0)
+        self.rss_start = np.zeros(0)
+        self.rss_last = np.zeros(0)
+        self.rss_streak = np.zeros(0, dtype=np.int64)
+        self.leak_alerted = np.zeros(0)
+
+    def align(self, snapshot):
+        # Row of each process in the previous snapshot; a reused PID (other
+        # create_time) is a new series
+        previous = self.previous
+        if previous is None:
+            return np.full(len(snapshot), -1, dtype=np.int64)
+        rows = previous.positions(snapshot.pids)
+        found = rows >= 0
+        same = np.zeros(len(snapshot), dtype=bool)
+        same[found] = previous.create_times[rows[found]] == snapshot.create_times[found]
+        return np.where(same, rows, -1)
+
+    def update(self, snapshot, system, total_memory, now=None):
+        # Returns a list of Detection, most severe first
+        now = time.monotonic() if now is None else now
+        detections = self.update_system(system, len(snapshot), now)
+
+        previous_rows = self.align(snapshot)
+        self.previous = snapshot
+        self.cpu.carry(previous_rows)
+        self.cpu_alerted = carry(self.cpu_alerted, previous_rows, -np.inf)
+        self.rss_start = carry(self.rss_start, previous_rows, np.nan)
+        self.rss_last = carry(self.rss_last, previous_rows, np.nan)
+        self.rss_streak = carry(self.rss_streak, previous_rows, 0)
+        self.leak_alerted = carry(self.leak_alerted, previous_rows, -np.inf)
+
+        detections += self.update_cpu(snapshot, now)
+        detections += self.update_rss(snapshot, snapshot.memory_percent * total_memory / 100, now)
+        detections.sort(key=lambda detection: -detection.score)
+        return detections
+
+    def update_system(self, system, process_count, now):
+        # No sample yet, e.g. a remote host that hasn't reported
+        if not system or 'cpu_percent' not in system:
+            return []
+        values = np.array([system['cpu_percent'], system['memory_percent'], process_count], dtype=np.float64)
+        z = self.system.zscore(values, self.warmup, np.array(self.SYSTEM_MIN_STD))
+        change = values - self.system.mean
+        mean, std = self.system.mean.copy(), np.sqrt(self.system.var)
+        self.system.update(values)
+
+        detections = []
+        for i, name in enumerate(self.SYSTEM_SERIES):
+            # CPU and memory only alert upwards, the process count both ways
+            score = abs(z[i]) if name == 'process_count' else z[i]
+            if (score < self.z_threshold or abs(change[i]) < self.SYSTEM_MIN_CHANGE[i]
+                    or now - self.system_alerted[i] < self.cooldown):
+                continue
+            self.system_alerted[i] = now
+            if name == 'process_count':
+                direction = "jumped" if change[i] > 0 else "dropped"
+                message = f"Process count {direction} to {values[i]:.0f} (usually {mean[i]:.0f})"
+            else:
+                label = "CPU" if name == 'cpu_percent' else "Memory"
+                message = f"{label} spike: {values[i]:.1f}% (usually {mean[i]:.1f}% ± {std[i]:.1f})"
+            detections.append(Detection(name, message, "warning", float(score)))
+        return detections
+
+    def update_cpu(self, snapshot, now):
+        values = snapshot.cpu_percent
+        z = self.cpu.zscore(values, self.warmup)
+        mean = self.cpu.mean.copy()
+        self.cpu.update(values)
+        spikes = np.nonzero((z >= self.z_threshold) & (values - mean >= self.PROCESS_MIN_CHANGE)
+                            & (now - self.cpu_alerted >= self.cooldown))[0]
+        self.cpu_alerted[spikes] = now
+        return [
+            Detection('process_cpu', f"{snapshot.names[row]} (PID {int(snapshot.pids[row])}) CPU spike: "
+                      f"{values[row]:.1f}% (usually {mean[row]:.1f}%)", "warning", float(z[row]))
+            for row in spikes.tolist()
+        ]
+
+    def update_rss(self, snapshot, rss, now):
+        # Streak of samples without a drop; a drop (or a new process) starts
+        # a new streak at the current RSS
+        grew = rss >= self.rss_last
+        self.rss_streak = np.where(grew, self.rss_streak + 1, 0)
+        self.rss_start = np.where(grew, self.rss_start, rss)
+        self.rss_last = rss.copy()
+
+        growth = rss - self.rss_start
+        leaks = np.nonzero((self.rss_streak >= self.leak_samples) & (growth >= self.leak_min_bytes)
+                           & (growth >= self.rss_start * self.leak_growth)
+                           & (now - self.leak_alerted >= self.cooldown))[0]
+        detections = []
+        for row in leaks.tolist():
+            start = self.rss_start[row]
+            detections.append(Detection(
+                'leak', f"Possible memory leak: {snapshot.names[row]} (PID {int(snapshot.pids[row])}) "
+                f"grew from {start / 1024 ** 2:.0f} MB to {rss[row] / 1024 ** 2:.0f} MB "
+                f"over {self.rss_streak[row]} samples without shrinking",
+                "warning", float(growth[row] / max(start, 1.0)) * self.z_threshold
+            ))
+        # Alert again only after another full window of growth
+        self.leak_alerted[leaks] = now
+        self.rss_streak[leaks] = 0
+        self.rss_start[leaks] = rss[leaks]
+        return detections
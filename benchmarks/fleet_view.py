@@ -0,0 +1,86 @@
+import os
+import sys
+import time
+import random
+import argparse
+
+# Fleet overview benchmark: N synthetic hosts each deliver one delta per
+# second, staggered across the second, to the real FleetOverview window
+# (offscreen). Reports per-frame and paint timings and how many tiles were
+# actually painted, with the window showing only part of the wall.
+#
+#   python benchmarks/fleet_view.py --hosts 200 --seconds 10
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from PySide6.QtWidgets import QApplication
+from PySide6.QtCore import QTimer
+from instrumentation import StageTimings
+from remote_agent import FleetClient, RemoteHost
+from fleet_view import FleetOverview
+from system_stats_ui import ThemeColors
+
+def synthetic_delta(seq, processes):
+    # Steady state: a few processes start and exit, a tenth change CPU
+    add = [[10000 + seq * 10 + i, "worker", "app", 0.0, 1, 0.0, 0.1, "sleeping"] for i in range(3)]
+    remove = [10000 + (seq - 5) * 10 + i for i in range(3)] if seq > 5 else []
+    update = [[pid, 1, round(random.random() * 50, 1), 0.1, "running"] for pid in range(processes // 10)]
+    if seq == 1:
+        add += [[pid, "proc", "root", 0.0, 1, 0.0, 0.1, "sleeping"] for pid in range(processes)]
+    system = {'time': time.time(), 'cpu_percent': random.random() * 100, 'memory_percent': 40 + random.random() * 20}
+    return {'type': 'delta', 'seq': seq, 'system': system, 'add': add, 'update': update, 'remove': remove}
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the fleet overview with synthetic hosts")
+    parser.add_argument("--hosts", type=int, default=200)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--processes", type=int, default=300, help="processes per synthetic host")
+    args = parser.parse_args()
+
+    app = QApplication([])
+    client = FleetClient()
+    for i in range(args.hosts):
+        host = RemoteHost(f"10.0.{i // 250}.{i % 250 + 1}:7400")
+        host.name = f"host-{i:03d}"
+        host.connected = True
+        client.hosts[host.address] = host
+    hosts = list(client.hosts.values())
+
+    timings = StageTimings()
+    window = FleetOverview(client, ThemeColors.DARK, timings)
+    window.resize(1400, 900)
+    window.show()
+
+    # Host i is due at i/N of every second
+    started = time.perf_counter()
+    sent = [0] * len(hosts)
+    deltas = [0]
+
+    def feed():
+        elapsed = time.perf_counter() - started
+        for i, host in enumerate(hosts):
+            due = int(elapsed + 1 - i / len(hosts))
+            while sent[i] < due:
+                sent[i] += 1
+                host.apply(synthetic_delta(sent[i], args.processes), 0)
+                client.mark_changed(host)
+                deltas[0] += 1
+        if elapsed > args.seconds:
+            app.quit()
+
+    feeder = QTimer()
+    feeder.timeout.connect(feed)
+    feeder.start(5)
+    app.exec()
+    client.close()
+
+    summary = timings.summary()
+    frames = summary.get('fleet_frame', {}).get('count', 0)
+    paints = summary.get('fleet_paint', {}).get('count', 0)
+    print(f"hosts {args.hosts}, {deltas[0]} deltas over {args.seconds:.0f} s, "
+          f"{frames} frames, {paints} paints, {window.grid.tiles_painted} tiles painted "
+          f"({window.grid.tiles_painted / max(1, paints):.1f} per paint)")
+    print(timings.format_table())
+
+if __name__ == '__main__':
+    main()
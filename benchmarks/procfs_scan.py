@@ -0,0 +1,85 @@
+import os
+import sys
+import time
+import argparse
+import statistics
+import subprocess
+import numpy as np
+
+# Compares the psutil process scan with the direct /proc collector (Linux).
+# With --spawn N it first starts N idle processes so the scan covers 5k+
+# PIDs even on a quiet machine, then checks that both collectors agree.
+#
+#   python benchmarks/procfs_scan.py --spawn 5000 --repeat 10
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from process_data import PsutilCollector, ProcfsCollector, collect_snapshot
+
+def spawn(count):
+    procs = []
+    try:
+        for _ in range(count):
+            procs.append(subprocess.Popen(["sleep", "3600"], stdin=subprocess.DEVNULL, close_fds=True))
+    except OSError as e:
+        print(f"stopped spawning after {len(procs)} processes: {e}")
+    return procs
+
+def time_collector(collector, repeat):
+    # The first scan primes per-PID state (psutil Process objects, the /proc
+    # static cache), the rest are steady-state
+    collector.collect()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        snapshot = collector.collect()
+        timings.append((time.perf_counter() - start) * 1000)
+    return snapshot, timings
+
+def compare(expected, actual):
+    # Static fields must match exactly; memory is read at slightly different
+    # moments so it gets a tolerance
+    common = np.intersect1d(expected.pids, actual.pids)
+    rows_a = expected.positions(common)
+    rows_b = actual.positions(common)
+    mismatches = {}
+    for column in ('names', 'statuses', 'usernames'):
+        a = getattr(expected, column)
+        b = getattr(actual, column)
+        mismatches[column] = sum(a[i] != b[j] for i, j in zip(rows_a.tolist(), rows_b.tolist()))
+    mismatches['create_times'] = int(np.sum(np.abs(expected.create_times[rows_a] - actual.create_times[rows_b]) > 1e-6))
+    mismatches['memory_percent'] = int(np.sum(np.abs(expected.memory_percent[rows_a] - actual.memory_percent[rows_b]) > 0.01))
+    return len(common), mismatches
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the /proc collector against psutil")
+    parser.add_argument("--spawn", type=int, default=0, help="idle processes to start first")
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    if not ProcfsCollector.available():
+        print("/proc collector is only available on Linux")
+        return
+
+    procs = spawn(args.spawn)
+    try:
+        _, psutil_times = time_collector(PsutilCollector(), args.repeat)
+        procfs_collector = ProcfsCollector()
+        _, procfs_times = time_collector(procfs_collector, args.repeat)
+        # Compare against an uncached psutil scan taken back to back
+        reference = collect_snapshot()
+        procfs_snapshot = procfs_collector.collect()
+        common, mismatches = compare(reference, procfs_snapshot)
+    finally:
+        for proc in procs:
+            proc.kill()
+        for proc in procs:
+            proc.wait()
+
+    print(f"processes scanned: {len(procfs_snapshot)}")
+    for label, timings in (("psutil", psutil_times), ("procfs", procfs_times)):
+        print(f"{label:<8} median {statistics.median(timings):8.1f} ms   min {min(timings):8.1f} ms")
+    print(f"speedup  {statistics.median(psutil_times) / statistics.median(procfs_times):.1f}x")
+    print(f"compared {common} PIDs, mismatches: {mismatches}")
+
+if __name__ == '__main__':
+    main()
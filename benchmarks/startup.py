@@ -0,0 +1,158 @@
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import subprocess
+import statistics
+
+# Startup benchmark: import time, time to first paint, time to the first
+# CPU/memory sample and to the first populated process list. Every run uses
+# a fresh interpreter so nothing is served from a warm import cache.
+#
+# Runs start without saved settings or session state, so results don't
+# depend on what this machine happens to have saved. --warm measures a warm
+# restart instead: a first, unmeasured run saves its session into a
+# temporary directory and every measured run starts from (and saves back
+# to) that directory.
+#
+#   python benchmarks/startup.py --runs 5 --history benchmarks/startup_history.jsonl
+#   python benchmarks/startup.py --runs 5 --warm
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def child(warm=False):
+    start = time.perf_counter()
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    sys.path.insert(0, REPO_ROOT)
+    import system_stats_ui
+    imported = time.perf_counter()
+
+    from PySide6.QtCore import QObject, QEvent, QTimer
+
+    marks = {}
+
+    class FirstPaint(QObject):
+        # Samples count once they are painted; polling alone can't see a
+        # sample drawn just before a long blocking step
+        def eventFilter(self, obj, event):
+            if event.type() == QEvent.Paint:
+                now = time.perf_counter()
+                marks.setdefault('first_paint', now)
+                if window.cpu_value.text() != "0%":
+                    marks.setdefault('first_sample', now)
+            return False
+
+    app = system_stats_ui.QApplication([])
+    window = system_stats_ui.SystemMonitor(persist=warm)
+    paint_filter = FirstPaint()
+    window.installEventFilter(paint_filter)
+    window.show()
+
+    def poll():
+        now = time.perf_counter()
+        if 'first_sample' not in marks and window.cpu_value.text() != "0%":
+            marks['first_sample'] = now
+        if 'first_process_list' not in marks and window.process_model.rowCount():
+            marks['first_process_list'] = now
+        if len(marks) == 3 or now - start > 30:
+            app.quit()
+
+    timer = QTimer()
+    timer.timeout.connect(poll)
+    timer.start(1)
+    app.exec()
+    if warm:
+        # Saves the session for the next run
+        window.close()
+
+    result = {'import_ms': (imported - start) * 1000}
+    for name, mark in marks.items():
+        result[f"{name}_ms"] = (mark - start) * 1000
+    print(json.dumps(result))
+
+def run_once(state_home=None):
+    command = [sys.executable, os.path.abspath(__file__), "--child"]
+    env = None
+    if state_home is not None:
+        command.append("--warm")
+        env = dict(os.environ, XDG_CONFIG_HOME=os.path.join(state_home, "config"),
+                   XDG_STATE_HOME=os.path.join(state_home, "state"))
+    output = subprocess.run(
+        command, capture_output=True, text=True, check=True, cwd=REPO_ROOT, env=env
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def import_breakdown(limit=8):
+    # Slowest direct imports of system_stats_ui, from python -X importtime
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import system_stats_ui"],
+        capture_output=True, text=True, cwd=REPO_ROOT
+    ).stderr
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        # Nesting is shown as two extra spaces per level
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        if depth <= 1:
+            rows.append((name.strip(), int(cumulative) / 1000))
+    return sorted(rows, key=lambda row: row[1], reverse=True)[:limit]
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "describe", "--always", "--dirty"],
+            capture_output=True, text=True, cwd=REPO_ROOT
+        ).stdout.strip()
+    except OSError:
+        return None
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure system_stats_ui startup time")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--history", help="append the result as a JSON line to this file")
+    parser.add_argument("--warm", action="store_true", help="start from a session saved by a previous run")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.warm)
+        return
+
+    if args.warm:
+        state_home = tempfile.mkdtemp(prefix="startup-benchmark-")
+        try:
+            run_once(state_home)
+            runs = [run_once(state_home) for _ in range(args.runs)]
+        finally:
+            shutil.rmtree(state_home, ignore_errors=True)
+    else:
+        runs = [run_once() for _ in range(args.runs)]
+    summary = {
+        'revision': git_revision(),
+        'timestamp': time.time(),
+        'python': sys.version.split()[0],
+        'mode': 'warm' if args.warm else 'cold',
+        'runs': args.runs
+    }
+    for key in runs[0]:
+        values = [run[key] for run in runs if key in run]
+        summary[key] = {'median': statistics.median(values), 'min': min(values), 'max': max(values)}
+
+    for key, stats in summary.items():
+        if isinstance(stats, dict):
+            print(f"{key:<24}{stats['median']:>10.1f} ms  (min {stats['min']:.1f}, max {stats['max']:.1f})")
+    print("\nslowest imports:")
+    for name, cumulative in import_breakdown():
+        print(f"  {name:<30}{cumulative:>10.1f} ms")
+
+    if args.history:
+        with open(args.history, 'a') as f:
+            f.write(json.dumps(summary) + "\n")
+
+if __name__ == '__main__':
+    main()
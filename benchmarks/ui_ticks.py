@@ -0,0 +1,257 @@
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import tracemalloc
+import numpy as np
+
+# UI tick benchmark: drives the real SystemMonitor (offscreen) from a
+# synthetic process source instead of psutil, so the cost of a refresh at
+# 10 or 50k processes can be measured on any headless box. For each size it
+# reports per-tick latency (scan + redraw + paint) in table and tree mode,
+# allocations per tick, widget/item counts, apply_theme and the scheduling
+# simulator's Gantt rendering. CPU/memory/disk totals still come from the
+# real host; they are a handful of calls per tick.
+#
+#   python benchmarks/ui_ticks.py --processes 10 1000 10000 50000 --churn 0.01
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from PySide6.QtWidgets import QApplication, QTreeWidgetItemIterator
+from PySide6.QtCore import QObject
+from process_data import ProcessSnapshot
+from system_stats_ui import SystemMonitor, ThemeColors
+
+NAMES = ["python", "bash", "postgres", "nginx", "java", "node", "sshd", "systemd", "chrome", "worker"]
+USERS = ["root", "www-data", "postgres", "alice", "bob"]
+STATUSES = ["sleeping", "sleeping", "sleeping", "running", "idle", "disk-sleep"]
+# Above any real pid_max, so nothing can reach a real process by accident
+FIRST_PID = 10_000_000
+
+# Some PySide6 builds drop a reference to None/True/False on calls such as
+# QTreeWidget.addTopLevelItem or pyqtgraph's TextItem. A long run then
+# crashes the interpreter (none_dealloc). They are immortal from Python
+# 3.12; before that, hold enough extra references to outlast the benchmark.
+if sys.version_info < (3, 12):
+    REFCOUNT_PADDING = [None, True, False] * 10_000_000
+
+class SyntheticCollector:
+    # Stands in for the psutil/procfs collectors. Each collect() replaces
+    # `churn` of the processes with new ones and gives everyone new CPU and
+    # memory values. Parents point at earlier PIDs so the tree has depth.
+    name = 'synthetic'
+
+    def __init__(self, count, churn=0.01, seed=1):
+        self.random = np.random.default_rng(seed)
+        self.next_pid = FIRST_PID
+        self.count = count
+        self.churn = churn
+        self.pids = np.zeros(0, dtype=np.int64)
+        self.ppids = np.zeros(0, dtype=np.int64)
+        self.names, self.users = [], []
+        self.created = np.zeros(0)
+        self.spawn(count)
+
+    def spawn(self, count):
+        pids = np.arange(self.next_pid, self.next_pid + count, dtype=np.int64)
+        self.next_pid += count
+        # A third are children of an existing process, the rest of the root
+        existing = self.pids if len(self.pids) else np.array([FIRST_PID])
+        parents = np.where(self.random.random(count) < 0.33, self.random.choice(existing, count), 1)
+        self.pids = np.concatenate([self.pids, pids])
+        self.ppids = np.concatenate([self.ppids, parents])
+        self.names += [NAMES[i] for i in self.random.integers(0, len(NAMES), count)]
+        self.users += [USERS[i] for i in self.random.integers(0, len(USERS), count)]
+        self.created = np.concatenate([self.created, np.full(count, time.time())])
+
+    def collect(self):
+        exits = int(round(len(self.pids) * self.churn))
+        if exits:
+            keep = np.ones(len(self.pids), dtype=bool)
+            keep[self.random.choice(len(self.pids), exits, replace=False)] = False
+            rows = keep.nonzero()[0]
+            self.pids, self.ppids, self.created = self.pids[keep], self.ppids[keep], self.created[keep]
+            self.names = [self.names[i] for i in rows.tolist()]
+            self.users = [self.users[i] for i in rows.tolist()]
+            self.spawn(exits)
+        count = len(self.pids)
+        cpu = np.round(self.random.exponential(2.0, count), 1)
+        memory = self.random.exponential(0.2, count)
+        statuses = [STATUSES[i] for i in self.random.integers(0, len(STATUSES), count)]
+        return ProcessSnapshot(self.pids, self.names, cpu, memory, statuses, self.users, self.created,
+                               ppids=self.ppids)
+
+class SyntheticIOSampler:
+    available = True
+
+    def __init__(self, seed=2):
+        self.random = random.Random(seed)
+
+    def sample(self, pids):
+        return {pid: (self.random.random() * 1e6, self.random.random() * 1e6) for pid in pids}
+
+class SyntheticMemoryDetail:
+    # Same results layout as MemoryDetailSampler, computed for new PIDs only
+    # and dropped when they exit
+    def __init__(self):
+        self.results = {}
+
+    def update(self, snapshot, total_memory):
+        now, previous = time.time(), self.results
+        self.results = {}
+        for pid, create_time in zip(snapshot.pids.tolist(), snapshot.create_times.tolist()):
+            self.results[pid] = previous.get(pid) or (create_time, now, pid % 997 * 4096, pid % 991 * 4096, 0)
+        return 0
+
+def percentiles(samples):
+    values = np.array(samples) * 1000
+    return {'p50_ms': float(np.percentile(values, 50)), 'p95_ms': float(np.percentile(values, 95)),
+            'max_ms': float(values.max())}
+
+def item_counts(window):
+    tree_items = 0
+    iterator = QTreeWidgetItemIterator(window.process_tree)
+    while iterator.value() is not None:
+        tree_items += 1
+        iterator += 1
+    return {
+        'qobjects': len(window.findChildren(QObject)),
+        'table_rows': window.process_model.rowCount(),
+        'tree_items': tree_items
+    }
+
+def pump(app):
+    app.processEvents()
+    # PySide can crash when events are pumped in a tight loop
+    time.sleep(0.001)
+
+def run_ticks(app, window, ticks):
+    # One tick: a process scan and a system sample, then the frame they
+    # schedule and the resulting paint
+    samples = []
+    for _ in range(ticks):
+        start = time.perf_counter()
+        window.update_process_list()
+        window.update_system_stats()
+        window.renderer.render_frame()
+        app.processEvents()
+        samples.append(time.perf_counter() - start)
+        pump(app)
+    return samples
+
+def measure_allocations(app, window, ticks):
+    # Peak is the transient high-water mark of a tick; retained is what is
+    # still allocated after it (steady growth here means a leak)
+    tracemalloc.start()
+    peaks, retained = [], []
+    for _ in range(ticks):
+        before = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        run_ticks(app, window, 1)
+        current, peak = tracemalloc.get_traced_memory()
+        peaks.append(peak - before)
+        retained.append(current - before)
+    tracemalloc.stop()
+    return {'peak_kb': float(np.median(peaks)) / 1024, 'retained_kb': float(np.mean(retained)) / 1024}
+
+def measure_size(app, count, args):
+    # Default settings, and nothing read from or written to the user's state
+    window = SystemMonitor(persist=False)
+    window.collector = SyntheticCollector(count, args.churn)
+    window.process_io = SyntheticIOSampler()
+    window.memory_detail = SyntheticMemoryDetail()
+    window.resize(1400, 900)
+    window.show()
+    # Ticks are driven from here, not by the window's own timers
+    window.scheduler.stop()
+    window.lifetime.stop()
+    window.setup_graphs()
+    app.processEvents()
+    result = {'processes': count}
+
+    for mode in ('table', 'tree'):
+        window.tree_toggle.setChecked(mode == 'tree')
+        run_ticks(app, window, args.warmup)
+        result[mode] = percentiles(run_ticks(app, window, args.ticks))
+        result[mode].update(measure_allocations(app, window, args.alloc_ticks))
+        result[mode].update(item_counts(window))
+
+    samples = []
+    themes = [ThemeColors.LIGHT, ThemeColors.CYBERPUNK, ThemeColors.DARK]
+    for i in range(args.ticks):
+        start = time.perf_counter()
+        window.apply_theme(themes[i % len(themes)])
+        app.processEvents()
+        samples.append(time.perf_counter() - start)
+        pump(app)
+    result['apply_theme'] = percentiles(samples)
+
+    # Gantt charts from the top rows of the table
+    window.tree_toggle.setChecked(False)
+    run_ticks(app, window, 1)
+    from scheduling import SchedulingWindow
+    SchedulingWindow.MAX_PROCESSES = args.gantt_processes
+    result['gantt'] = {}
+    for algorithm in ("FCFS", "Round Robin", "Priority", "SJF"):
+        simulator = SchedulingWindow(algorithm, window)
+        simulator.show()
+        samples = []
+        for _ in range(args.gantt_runs):
+            start = time.perf_counter()
+            simulator.start_simulation()
+            app.processEvents()
+            samples.append(time.perf_counter() - start)
+            pump(app)
+        result['gantt'][algorithm] = percentiles(samples)
+        result['gantt'][algorithm]['plot_items'] = len(simulator.gantt_chart.getPlotItem().items)
+        simulator.close()
+        simulator.deleteLater()
+
+    result['stages'] = window.timings.summary()
+    window.close()
+    window.deleteLater()
+    pump(app)
+    return result
+
+def print_result(result):
+    print(f"\n{result['processes']} processes")
+    print(f"  {'':<12}{'p50 ms':>9}{'p95 ms':>9}{'max ms':>9}{'peak KB':>10}{'kept KB':>9}"
+          f"{'rows':>8}{'items':>8}{'QObjects':>10}")
+    for mode in ('table', 'tree'):
+        stats = result[mode]
+        print(f"  {mode:<12}{stats['p50_ms']:>9.2f}{stats['p95_ms']:>9.2f}{stats['max_ms']:>9.2f}"
+              f"{stats['peak_kb']:>10.0f}{stats['retained_kb']:>9.1f}{stats['table_rows']:>8}"
+              f"{stats['tree_items']:>8}{stats['qobjects']:>10}")
+    stats = result['apply_theme']
+    print(f"  {'apply_theme':<12}{stats['p50_ms']:>9.2f}{stats['p95_ms']:>9.2f}{stats['max_ms']:>9.2f}")
+    for algorithm, stats in result['gantt'].items():
+        print(f"  {algorithm:<12}{stats['p50_ms']:>9.2f}{stats['p95_ms']:>9.2f}{stats['max_ms']:>9.2f}"
+              f"{'':>27}{stats['plot_items']:>8}  (Gantt)")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark UI ticks against a synthetic process source")
+    parser.add_argument("--processes", type=int, nargs="+", default=[10, 1000, 10000, 50000])
+    parser.add_argument("--churn", type=float, default=0.01, help="fraction of processes replaced per tick")
+    parser.add_argument("--ticks", type=int, default=30)
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--alloc-ticks", type=int, default=5, help="ticks measured under tracemalloc")
+    parser.add_argument("--gantt-processes", type=int, default=15)
+    parser.add_argument("--gantt-runs", type=int, default=3)
+    parser.add_argument("--json", help="append the results as a JSON line to this file")
+    args = parser.parse_args()
+
+    app = QApplication([])
+    results = []
+    for count in args.processes:
+        result = measure_size(app, count, args)
+        print_result(result)
+        results.append(result)
+
+    if args.json:
+        with open(args.json, 'a') as f:
+            f.write(json.dumps({'timestamp': time.time(), 'churn': args.churn, 'results': results}) + "\n")
+
+if __name__ == '__main__':
+    main()
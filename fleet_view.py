@@ -0,0 +1,216 @@
+import numpy as np
+from PySide6.QtWidgets import QHBoxLayout, QLabel, QMainWindow, QScrollArea, QVBoxLayout, QWidget
+from PySide6.QtCore import QPointF, QRect, QTimer, Qt, Signal
+from PySide6.QtGui import QColor, QPainter, QPen, QPolygonF
+from instrumentation import StageTimings
+
+# Fleet overview: one tile per remote agent with its current CPU/memory,
+# process count and a sparkline of recent samples. Tiles are painted by a
+# single widget rather than one widget (or plot) per host, so a wall of a few
+# hundred hosts costs a few QPainter calls per visible tile.
+
+class FleetGrid(QWidget):
+    TILE_WIDTH = 230
+    TILE_HEIGHT = 110
+    SPACING = 8
+    host_activated = Signal(str)
+
+    def __init__(self, fleet, colors, timings, parent=None):
+        super().__init__(parent)
+        self.fleet = fleet
+        self.colors = colors
+        self.timings = timings
+        self.cpu_threshold = 80
+        self.memory_threshold = 70
+        self.addresses = []
+        self.positions = {}
+        self.columns = 1
+        self.tiles_painted = 0
+        self.setAttribute(Qt.WA_OpaquePaintEvent)
+
+    def sync_hosts(self):
+        addresses = list(self.fleet.hosts)
+        if addresses == self.addresses:
+            return False
+        self.addresses = addresses
+        self.positions = {address: i for i, address in enumerate(addresses)}
+        self.relayout()
+        self.update()
+        return True
+
+    def relayout(self):
+        step = self.TILE_WIDTH + self.SPACING
+        self.columns = max(1, (self.width() - self.SPACING) // step)
+        rows = -(-len(self.addresses) // self.columns)
+        self.setMinimumHeight(self.SPACING + rows * (self.TILE_HEIGHT + self.SPACING))
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.relayout()
+
+    def tile_rect(self, index):
+        row, column = divmod(index, self.columns)
+        return QRect(
+            self.SPACING + column * (self.TILE_WIDTH + self.SPACING),
+            self.SPACING + row * (self.TILE_HEIGHT + self.SPACING),
+            self.TILE_WIDTH, self.TILE_HEIGHT
+        )
+
+    def index_at(self, pos):
+        column = (pos.x() - self.SPACING) // (self.TILE_WIDTH + self.SPACING)
+        row = (pos.y() - self.SPACING) // (self.TILE_HEIGHT + self.SPACING)
+        if column < 0 or row < 0 or column >= self.columns:
+            return None
+        index = row * self.columns + column
+        if index >= len(self.addresses) or not self.tile_rect(index).contains(pos):
+            return None
+        return index
+
+    def mouseDoubleClickEvent(self, event):
+        index = self.index_at(event.position().toPoint())
+        if index is not None:
+            self.host_activated.emit(self.addresses[index])
+
+    def level_color(self, value, threshold):
+        if value > threshold:
+            return QColor(self.colors['progress_critical'])
+        if value > threshold * 0.8:
+            return QColor(self.colors['progress_warning'])
+        return QColor(self.colors['progress_normal'])
+
+    def paintEvent(self, event):
+        with self.timings.stage('fleet_paint'):
+            painter = QPainter(self)
+            area = event.rect()
+            painter.fillRect(area, QColor(self.colors['primary_bg']))
+            # Only the rows that intersect the exposed area
+            step = self.TILE_HEIGHT + self.SPACING
+            first_row = max(0, (area.top() - self.SPACING) // step)
+            last_row = (area.bottom() - self.SPACING) // step
+            for row in range(first_row, last_row + 1):
+                for index in range(row * self.columns, min((row + 1) * self.columns, len(self.addresses))):
+                    rect = self.tile_rect(index)
+                    if rect.intersects(area):
+                        host = self.fleet.hosts.get(self.addresses[index])
+                        if host is not None:
+                            self.paint_tile(painter, rect, host)
+                            self.tiles_painted += 1
+            painter.end()
+
+    def paint_tile(self, painter, rect, host):
+        colors = self.colors
+        history, process_count = host.summary()
+        painter.setPen(QPen(QColor(colors['border'] if host.connected else colors['progress_critical']), 1))
+        painter.setBrush(QColor(colors['secondary_bg']))
+        painter.drawRoundedRect(rect.adjusted(0, 0, -1, -1), 6, 6)
+
+        text_rect = rect.adjusted(8, 6, -8, 0)
+        painter.setPen(QColor(colors['text']))
+        name = painter.fontMetrics().elidedText(host.label, Qt.ElideMiddle, text_rect.width())
+        painter.drawText(text_rect, Qt.AlignLeft | Qt.AlignTop, name)
+        if not host.connected:
+            painter.setPen(QColor(colors['progress_critical']))
+            painter.drawText(text_rect.adjusted(0, 20, 0, 0), Qt.AlignLeft | Qt.AlignTop, "offline")
+            return
+
+        cpu, memory = history[:, -1] if history.shape[1] else (0.0, 0.0)
+        values_rect = text_rect.adjusted(0, 20, 0, 0)
+        painter.setPen(self.level_color(cpu, self.cpu_threshold))
+        painter.drawText(values_rect, Qt.AlignLeft | Qt.AlignTop, f"CPU {cpu:.1f}%")
+        painter.setPen(self.level_color(memory, self.memory_threshold))
+        painter.drawText(values_rect, Qt.AlignHCenter | Qt.AlignTop, f"MEM {memory:.1f}%")
+        painter.setPen(QColor(colors['text']))
+        painter.drawText(values_rect, Qt.AlignRight | Qt.AlignTop, f"{process_count} procs")
+
+        # Sparklines share one 0-100% axis
+        spark = rect.adjusted(8, 46, -8, -8)
+        if history.shape[1] < 2:
+            return
+        xs = np.linspace(spark.left(), spark.right(), history.shape[1])
+        ys = spark.bottom() - np.clip(history, 0, 100) / 100 * spark.height()
+        painter.setBrush(Qt.NoBrush)
+        for series, key in ((ys[1], 'graph_memory'), (ys[0], 'graph_cpu')):
+            painter.setPen(QPen(QColor(colors[key]), 1.5))
+            painter.drawPolyline(QPolygonF([QPointF(x, y) for x, y in zip(xs.tolist(), series.tolist())]))
+
+class FleetOverview(QMainWindow):
+    # Repaints at most once per frame: hosts that received any number of
+    # deltas since the last frame are repainted once, and only if their tile
+    # is on screen. Nothing is drawn while the window is hidden.
+    FRAME_MS = 33
+    host_activated = Signal(str)
+
+    def __init__(self, fleet, colors, timings=None, parent=None):
+        super().__init__(parent)
+        self.fleet = fleet
+        self.timings = timings if timings is not None else StageTimings()
+        self.setWindowTitle("Fleet Overview")
+        self.resize(1200, 800)
+
+        main_widget = QWidget()
+        self.setCentralWidget(main_widget)
+        layout = QVBoxLayout(main_widget)
+        header = QHBoxLayout()
+        self.summary_label = QLabel()
+        hint = QLabel("Double-click a host to show its processes")
+        header.addWidget(self.summary_label)
+        header.addStretch()
+        header.addWidget(hint)
+
+        self.grid = FleetGrid(fleet, colors, self.timings)
+        self.grid.host_activated.connect(self.host_activated)
+        self.scroll_area = QScrollArea()
+        self.scroll_area.setWidgetResizable(True)
+        self.scroll_area.setWidget(self.grid)
+        layout.addLayout(header)
+        layout.addWidget(self.scroll_area)
+
+        self.frame_timer = QTimer(self)
+        self.frame_timer.timeout.connect(self.render_frame)
+        self.summary = None
+
+    def set_thresholds(self, cpu_threshold, memory_threshold):
+        self.grid.cpu_threshold = cpu_threshold
+        self.grid.memory_threshold = memory_threshold
+        self.grid.update()
+
+    def apply_theme(self, colors):
+        self.grid.colors = colors
+        self.grid.update()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        # Everything may have changed while hidden
+        self.fleet.take_changed('overview')
+        self.grid.sync_hosts()
+        self.grid.update()
+        self.frame_timer.start(self.FRAME_MS)
+
+    def hideEvent(self, event):
+        self.frame_timer.stop()
+        super().hideEvent(event)
+
+    def render_frame(self):
+        with self.timings.stage('fleet_frame'):
+            changed = self.fleet.take_changed('overview')
+            if self.grid.sync_hosts() or not changed:
+                self.update_summary()
+                return
+            visible = self.grid.visibleRegion().boundingRect()
+            for address in changed:
+                index = self.grid.positions.get(address)
+                if index is None:
+                    continue
+                rect = self.grid.tile_rect(index)
+                # Off-screen tiles are skipped; they paint their latest
+                # state whenever they are scrolled into view
+                if rect.intersects(visible):
+                    self.grid.update(rect)
+            self.update_summary()
+
+    def update_summary(self):
+        hosts = self.fleet.hosts.values()
+        summary = f"{len(hosts)} hosts, {sum(host.connected for host in hosts)} connected"
+        if summary != self.summary:
+            self.summary = summary
+            self.summary_label.setText(summary)
@@ -0,0 +1,140 @@
+import os
+import io
+import json
+import time
+import cProfile
+import pstats
+import tracemalloc
+from contextlib import contextmanager
+import numpy as np
+
+# Upper edges (ms) of the histogram buckets in exported timings
+HISTOGRAM_EDGES_MS = [0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000]
+
+class StageTimings:
+    # Rolling per-stage timings. Each stage keeps its last `window` durations
+    # in a ring buffer so recording is O(1) and percentiles cover recent ticks.
+    def __init__(self, window=512):
+        self.window = window
+        self.samples = {}
+        self.counts = {}
+        self.totals = {}
+        self.enabled = True
+
+    @contextmanager
+    def stage(self, name):
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, (time.perf_counter() - start) * 1000)
+
+    def record(self, name, elapsed_ms):
+        ring = self.samples.get(name)
+        if ring is None:
+            ring = self.samples[name] = np.zeros(self.window)
+        count = self.counts.get(name, 0)
+        ring[count % self.window] = elapsed_ms
+        self.counts[name] = count + 1
+        self.totals[name] = self.totals.get(name, 0.0) + elapsed_ms
+
+    def recent(self, name):
+        count = self.counts.get(name, 0)
+        return self.samples[name][:min(count, self.window)] if count else np.zeros(0)
+
+    def summary(self):
+        stats = {}
+        for name in self.samples:
+            values = self.recent(name)
+            if not len(values):
+                continue
+            p50, p95 = np.percentile(values, [50, 95])
+            stats[name] = {
+                'count': self.counts[name],
+                'p50_ms': float(p50),
+                'p95_ms': float(p95),
+                'max_ms': float(values.max()),
+                'mean_ms': float(values.mean()),
+                'total_ms': self.totals[name]
+            }
+        return stats
+
+    def histogram(self, name):
+        edges = np.array(HISTOGRAM_EDGES_MS + [np.inf])
+        counts = np.bincount(np.searchsorted(edges, self.recent(name)), minlength=len(edges))
+        return {('inf' if np.isinf(edge) else str(edge)): int(count) for edge, count in zip(edges, counts)}
+
+    def to_json(self):
+        summary = self.summary()
+        for name in summary:
+            summary[name]['histogram_ms'] = self.histogram(name)
+        return json.dumps({
+            'generated': time.time(),
+            'window': self.window,
+            'stages': summary
+        }, indent=2)
+
+    def export_json(self, path):
+        with open(path, 'w') as f:
+            f.write(self.to_json())
+
+    def format_table(self):
+        lines = [f"{'stage':<18}{'p50':>8}{'p95':>8}{'max':>8}{'n':>7}"]
+        for name, stats in sorted(self.summary().items()):
+            lines.append(
+                f"{name:<18}{stats['p50_ms']:>8.2f}{stats['p95_ms']:>8.2f}"
+                f"{stats['max_ms']:>8.2f}{stats['count']:>7}"
+            )
+        return "\n".join(lines)
+
+class ProfileCapture:
+    # cProfile (and optionally tracemalloc) over the next `ticks` ticks. The
+    # report is written next to a .prof file that snakeviz/pstats can open.
+    def __init__(self, ticks, output_dir, trace_memory=True):
+        self.remaining = ticks
+        self.ticks = ticks
+        self.output_dir = output_dir
+        self.trace_memory = trace_memory
+        self.profiler = cProfile.Profile()
+        self.memory_before = None
+        self.started_tracing = False
+
+    def start(self):
+        if self.trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(10)
+                self.started_tracing = True
+            self.memory_before = tracemalloc.take_snapshot()
+        self.profiler.enable()
+
+    def tick(self):
+        # Returns the report path once the last tick has been captured
+        self.remaining -= 1
+        if self.remaining > 0:
+            return None
+        return self.finish()
+
+    def finish(self):
+        self.profiler.disable()
+        stamp = time.strftime('%Y%m%d-%H%M%S')
+        os.makedirs(self.output_dir, exist_ok=True)
+        prof_path = os.path.join(self.output_dir, f"profile-{stamp}.prof")
+        report_path = os.path.join(self.output_dir, f"profile-{stamp}.txt")
+        self.profiler.dump_stats(prof_path)
+
+        out = io.StringIO()
+        out.write(f"cProfile over {self.ticks} ticks ({prof_path})\n\n")
+        pstats.Stats(self.profiler, stream=out).sort_stats('cumulative').print_stats(30)
+        if self.memory_before is not None:
+            memory_after = tracemalloc.take_snapshot()
+            if self.started_tracing:
+                tracemalloc.stop()
+            out.write("\ntracemalloc: top allocation growth\n\n")
+            for stat in memory_after.compare_to(self.memory_before, 'lineno')[:20]:
+                out.write(f"{stat}\n")
+        with open(report_path, 'w') as f:
+            f.write(out.getvalue())
+        return report_path
@@ -0,0 +1,278 @@
+import csv
+import time
+import threading
+import numpy as np
+
+# Recorded history plus ways to get data out of the monitor: bulk CSV/Parquet
+# export and a Prometheus/OpenMetrics endpoint. Qt-free so it can be reused
+# by the agent or scripts.
+
+class MetricHistory:
+    # One row per sample, stored in fixed-size NumPy chunks. Once max_rows is
+    # reached the oldest chunk is dropped whole, so appends never move data
+    # and an export can walk the chunk list while sampling carries on.
+    def __init__(self, columns, chunk_rows=3600, max_rows=172800):
+        self.columns = ['time'] + list(columns)
+        self.chunk_rows = chunk_rows
+        self.max_chunks = max(1, -(-max_rows // chunk_rows))
+        self.chunks = []
+        self.fill = chunk_rows
+        self.index = {column: i for i, column in enumerate(self.columns)}
+
+    def __len__(self):
+        if not self.chunks:
+            return 0
+        return (len(self.chunks) - 1) * self.chunk_rows + self.fill
+
+    def append(self, timestamp, values):
+        # values: one number per column after 'time', in column order
+        if self.fill == self.chunk_rows:
+            self.chunks.append(np.full((self.chunk_rows, len(self.columns)), np.nan))
+            if len(self.chunks) > self.max_chunks:
+                self.chunks.pop(0)
+            self.fill = 0
+        row = self.chunks[-1][self.fill]
+        row[0] = timestamp
+        row[1:] = values
+        self.fill += 1
+
+    def restore(self, rows):
+        # Starts from previously saved rows (e.g. a read-only memory map).
+        # Full chunks stay views of it and are never written to; the partial
+        # last chunk is copied so appends can continue it.
+        rows = rows[-self.max_chunks * self.chunk_rows:]
+        full = len(rows) // self.chunk_rows * self.chunk_rows
+        self.chunks = [rows[i:i + self.chunk_rows] for i in range(0, full, self.chunk_rows)]
+        self.fill = self.chunk_rows
+        if full < len(rows):
+            self.chunks.append(np.full((self.chunk_rows, len(self.columns)), np.nan))
+            self.fill = len(rows) - full
+            self.chunks[-1][:self.fill] = rows[full:]
+
+    def latest(self):
+        if not self.chunks:
+            return None
+        return dict(zip(self.columns, self.chunks[-1][self.fill - 1].tolist()))
+
+    def tail(self, column, count):
+        # Last `count` values of a column, oldest first
+        column = self.index[column]
+        parts, needed = [], count
+        for i in range(len(self.chunks) - 1, -1, -1):
+            rows = self.fill if i == len(self.chunks) - 1 else self.chunk_rows
+            take = min(rows, needed)
+            parts.append(self.chunks[i][rows - take:rows, column])
+            needed -= take
+            if not needed:
+                break
+        return np.concatenate(parts[::-1]) if parts else np.zeros(0)
+
+    def iter_chunks(self, start=None, end=None):
+        # Yields row blocks (views) with start <= time < end. The chunk list
+        # and fill are captured up front, rows appended later are not included.
+        chunks, fill = list(self.chunks), self.fill
+        for i, chunk in enumerate(chunks):
+            block = chunk[:fill] if i == len(chunks) - 1 else chunk
+            if not len(block):
+                continue
+            if start is not None and block[-1, 0] < start:
+                continue
+            if end is not None and block[0, 0] >= end:
+                break
+            times = block[:, 0]
+            lo = 0 if start is None else np.searchsorted(times, start)
+            hi = len(block) if end is None else np.searchsorted(times, end)
+            if hi > lo:
+                yield block[lo:hi]
+
+def export_csv(history, path, start=None, end=None):
+    # Writes one history chunk at a time; returns the number of rows
+    rows = 0
+    with open(path, 'w', newline='') as f:
+        csv.writer(f).writerow(history.columns)
+        for block in history.iter_chunks(start, end):
+            np.savetxt(f, block, delimiter=',', fmt=['%.3f'] + ['%.6g'] * (block.shape[1] - 1))
+            rows += len(block)
+    return rows
+
+def export_parquet(history, path, start=None, end=None):
+    # One row group per history chunk. pyarrow is optional.
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise RuntimeError("Parquet export needs pyarrow (pip install pyarrow)")
+    schema = pa.schema([(column, pa.float64()) for column in history.columns])
+    rows = 0
+    with pq.ParquetWriter(path, schema) as writer:
+        for block in history.iter_chunks(start, end):
+            writer.write_table(pa.Table.from_arrays(list(block.T), schema=schema))
+            rows += len(block)
+    return rows
+
+def export_history(history, path, start=None, end=None):
+    if path.lower().endswith('.parquet'):
+        return export_parquet(history, path, start, end)
+    return export_csv(history, path, start, end)
+
+def escape_label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+class MetricsExporter:
+    # Serves /metrics from whatever the monitor last published. A scrape never
+    # triggers a scan; the text is rendered once per published sample and
+    # reused by every scrape until the next one.
+    PROMETHEUS_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+    OPENMETRICS_TYPE = 'application/openmetrics-text; version=1.0.0; charset=utf-8'
+    # Per-process series are limited to the busiest processes to keep
+    # cardinality bounded
+    TOP_PROCESSES = 20
+
+    def __init__(self, port, host='127.0.0.1'):
+        self.address = (host, port)
+        self.lock = threading.Lock()
+        self.system = None
+        self.snapshot = None
+        # StageTimings.summary() as of the last publish
+        self.timings = None
+        # (cgroup keys, cpu percent, memory bytes) from CgroupSampler
+        self.groups = None
+        self.version = 0
+        self.cache = {}
+        self.server = None
+        self.thread = None
+
+    def start(self):
+        # http.server pulls in email/ssl, only load it when serving
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        exporter = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] != '/metrics':
+                    self.send_error(404)
+                    return
+                openmetrics = 'application/openmetrics-text' in self.headers.get('Accept', '')
+                body = exporter.render(openmetrics)
+                self.send_response(200)
+                self.send_header('Content-Type', exporter.OPENMETRICS_TYPE if openmetrics else exporter.PROMETHEUS_TYPE)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(self.address, Handler)
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, name="metrics-exporter", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+    @property
+    def port(self):
+        return self.server.server_address[1] if self.server is not None else self.address[1]
+
+    def publish(self, system=None, snapshot=None, timings=None, groups=None):
+        # Called from the UI thread after each sample. Snapshots and system
+        # dicts are never modified once published, so only references are
+        # swapped; StageTimings keeps being recorded into, so it is
+        # summarized here rather than on the scrape thread.
+        if timings is not None:
+            timings = timings.summary()
+        with self.lock:
+            if system is not None:
+                self.system = system
+            if snapshot is not None:
+                self.snapshot = snapshot
+            if timings is not None:
+                self.timings = timings
+            if groups is not None:
+                self.groups = groups
+            self.version += 1
+
+    def render(self, openmetrics=False):
+        # Built outside the lock so publish() never waits for a scrape
+        with self.lock:
+            key = (self.version, openmetrics)
+            body = self.cache.get(key)
+            state = self.system, self.snapshot, self.timings, self.groups
+        if body is None:
+            body = self.build(openmetrics, *state).encode()
+            with self.lock:
+                self.cache = {k: v for k, v in self.cache.items() if k[0] == self.version}
+                if key[0] == self.version:
+                    self.cache[key] = body
+        return body
+
+    def build(self, openmetrics, system, snapshot, timings, groups=None):
+        lines = []
+
+        def metric(name, kind, help_text, samples):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in samples:
+                label_text = ",".join(f'{key}="{escape_label(val)}"' for key, val in labels.items())
+                lines.append(f"{name}{{{label_text}}} {value}" if label_text else f"{name} {value}")
+
+        if system is not None:
+            metric("process_monitor_cpu_percent", "gauge", "System-wide CPU utilisation.",
+                   [({}, system['cpu_percent'])])
+            metric("process_monitor_memory_percent", "gauge", "Used memory as a percentage of total.",
+                   [({}, system['memory_percent'])])
+            metric("process_monitor_memory_used_bytes", "gauge", "Used memory in bytes.",
+                   [({}, system['memory_used'])])
+            metric("process_monitor_memory_total_bytes", "gauge", "Total memory in bytes.",
+                   [({}, system['memory_total'])])
+            for key, name, help_text in (
+                ('disk_read_bps', "process_monitor_disk_read_bytes_per_second", "Disk read throughput."),
+                ('disk_write_bps', "process_monitor_disk_write_bytes_per_second", "Disk write throughput."),
+                ('net_recv_bps', "process_monitor_network_receive_bytes_per_second", "Network receive throughput."),
+                ('net_sent_bps', "process_monitor_network_transmit_bytes_per_second", "Network transmit throughput.")
+            ):
+                if key in system:
+                    metric(name, "gauge", help_text, [({}, round(system[key], 1))])
+            metric("process_monitor_sample_age_seconds", "gauge", "Seconds since the last CPU/memory sample.",
+                   [({}, round(time.time() - system['time'], 3))])
+
+        if snapshot is not None:
+            labels, codes = snapshot.codes('statuses')
+            counts = np.bincount(codes, minlength=len(labels)) if len(codes) else []
+            metric("process_monitor_processes", "gauge", "Processes by status.",
+                   [({'status': label}, int(count)) for label, count in zip(labels, counts)])
+            top = np.argsort(-snapshot.cpu_percent, kind='stable')[:self.TOP_PROCESSES].tolist()
+            for name, column, help_text in (
+                ("process_monitor_process_cpu_percent", snapshot.cpu_percent, "CPU of the busiest processes."),
+                ("process_monitor_process_memory_percent", snapshot.memory_percent, "Memory of the busiest processes.")
+            ):
+                metric(name, "gauge", help_text, [
+                    ({'pid': int(snapshot.pids[i]), 'name': snapshot.names[i], 'user': snapshot.usernames[i]},
+                     float(column[i]))
+                    for i in top
+                ])
+
+        if groups is not None:
+            keys, cpu, memory = groups
+            metric("process_monitor_cgroup_cpu_percent", "gauge", "CPU of each process group (cgroup).",
+                   [({'cgroup': key or ""}, round(float(value), 2)) for key, value in zip(keys, cpu)])
+            metric("process_monitor_cgroup_memory_bytes", "gauge", "Memory of each process group (cgroup).",
+                   [({'cgroup': key or ""}, float(value)) for key, value in zip(keys, memory)])
+
+        if timings is not None:
+            # The monitor's own refresh stages, as a summary in seconds
+            lines.append("# HELP process_monitor_stage_seconds Duration of the monitor's refresh stages.")
+            lines.append("# TYPE process_monitor_stage_seconds summary")
+            for stage, stats in sorted(timings.items()):
+                for quantile, key in (("0.5", 'p50_ms'), ("0.95", 'p95_ms')):
+                    lines.append(f'process_monitor_stage_seconds{{stage="{stage}",quantile="{quantile}"}} {stats[key] / 1000:.6f}')
+                lines.append(f'process_monitor_stage_seconds_count{{stage="{stage}"}} {stats["count"]}')
+                lines.append(f'process_monitor_stage_seconds_sum{{stage="{stage}"}} {stats["total_ms"] / 1000:.6f}')
+
+        if openmetrics:
+            lines.append("# EOF")
+        return "\n".join(lines) + "\n"
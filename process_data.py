@@ -0,0 +1,923 @@
+import os
+import re
+import sys
+import time
+import socket
+import threading
+import psutil
+import numpy as np
+
+try:
+    import pwd
+except ImportError:
+    pwd = None
+
+# Attributes fetched for every process on each scan
+SNAPSHOT_ATTRS = ['pid', 'name', 'cpu_percent', 'memory_percent', 'status', 'username', 'create_time']
+
+class ProcessSnapshot:
+    # Column-oriented result of one process scan. Numeric columns are NumPy
+    # arrays so filtering, sorting and aggregation stay vectorized.
+    def __init__(self, pids, names, cpu_percent, memory_percent, statuses, usernames, create_times,
+                 timestamp=None, ppids=None):
+        self.pids = np.asarray(pids, dtype=np.int64)
+        self.names = list(names)
+        self.cpu_percent = np.asarray(cpu_percent, dtype=np.float64)
+        self.memory_percent = np.asarray(memory_percent, dtype=np.float64)
+        self.statuses = list(statuses)
+        self.usernames = list(usernames)
+        self.create_times = np.asarray(create_times, dtype=np.float64)
+        self.timestamp = time.time() if timestamp is None else timestamp
+        # Only set when the source already knows parents (e.g. a remote agent)
+        self.ppids = None if ppids is None else np.asarray(ppids, dtype=np.int64)
+        self._sorter = None
+        self._codes = {}
+        self._names_lower = None
+
+    def __len__(self):
+        return len(self.pids)
+
+    def positions(self, pids):
+        # Row position of each PID in this snapshot, -1 where it is missing
+        pids = np.asarray(pids, dtype=np.int64)
+        if self._sorter is None:
+            self._sorter = np.argsort(self.pids, kind='stable')
+        if not len(self.pids):
+            return np.full(len(pids), -1, dtype=np.int64)
+        sorted_pids = self.pids[self._sorter]
+        found = np.searchsorted(sorted_pids, pids)
+        found = np.clip(found, 0, len(sorted_pids) - 1)
+        hit = sorted_pids[found] == pids
+        return np.where(hit, self._sorter[found], -1)
+
+    def codes(self, column):
+        # Distinct values of a string column plus the code of each row. Labels
+        # come back sorted, so codes double as a sort key.
+        if column not in self._codes:
+            values = np.array(getattr(self, column), dtype=object)
+            if len(values):
+                labels, codes = np.unique(values, return_inverse=True)
+            else:
+                labels, codes = np.array([], dtype=object), np.zeros(0, dtype=np.int64)
+            self._codes[column] = (labels.tolist(), codes.reshape(-1))
+        return self._codes[column]
+
+    def names_lower(self):
+        if self._names_lower is None:
+            self._names_lower = [name.lower() for name in self.names]
+        return self._names_lower
+
+def format_bytes(count):
+    for unit in ("B", "KB", "MB", "GB", "TB"):
+        if count < 1024 or unit == "TB":
+            return f"{count:.0f} {unit}" if unit == "B" else f"{count:.1f} {unit}"
+        count /= 1024
+
+class ProcessFilter:
+    # Filter over a full snapshot. Numeric and categorical tests are NumPy
+    # masks; the name test only runs on rows that survived them.
+    def __init__(self, text="", regex=False, user=None, status=None,
+                 cpu_range=(0.0, None), memory_range=(0.0, None), hide_system=False):
+        self.text = text
+        self.regex = regex
+        self.user = user
+        self.status = status
+        self.cpu_range = cpu_range
+        self.memory_range = memory_range
+        self.hide_system = hide_system
+        self.pattern = re.compile(text, re.IGNORECASE) if regex and text else None
+
+    def mask(self, snapshot):
+        keep = np.ones(len(snapshot), dtype=bool)
+        if self.hide_system:
+            keep &= self.column_mask(snapshot, 'usernames', 'root', invert=True)
+        if self.user is not None:
+            keep &= self.column_mask(snapshot, 'usernames', self.user)
+        if self.status is not None:
+            keep &= self.column_mask(snapshot, 'statuses', self.status)
+        keep &= self.range_mask(snapshot.cpu_percent, self.cpu_range)
+        keep &= self.range_mask(snapshot.memory_percent, self.memory_range)
+
+        if self.text:
+            rows = np.nonzero(keep)[0]
+            if self.pattern is not None:
+                names = snapshot.names
+                matched = [self.pattern.search(names[row]) is not None for row in rows.tolist()]
+            else:
+                needle = self.text.lower()
+                names = snapshot.names_lower()
+                matched = [needle in names[row] for row in rows.tolist()]
+            keep[rows[~np.array(matched, dtype=bool)]] = False
+        return keep
+
+    def column_mask(self, snapshot, column, value, invert=False):
+        labels, codes = snapshot.codes(column)
+        if value in labels:
+            match = codes == labels.index(value)
+        else:
+            match = np.zeros(len(snapshot), dtype=bool)
+        return ~match if invert else match
+
+    def range_mask(self, values, value_range):
+        low, high = value_range
+        keep = values >= (low or 0.0)
+        if high is not None:
+            keep &= values <= high
+        return keep
+
+def collect_snapshot():
+    pids, names, cpu, memory, statuses, users, created = [], [], [], [], [], [], []
+    for proc in psutil.process_iter(SNAPSHOT_ATTRS):
+        try:
+            pinfo = proc.info
+            pids.append(pinfo['pid'])
+            names.append(pinfo['name'] or "")
+            cpu.append(pinfo['cpu_percent'] if pinfo['cpu_percent'] is not None else 0.0)
+            memory.append(pinfo['memory_percent'] if pinfo['memory_percent'] is not None else 0.0)
+            statuses.append(pinfo['status'] or "")
+            users.append(pinfo['username'] or "")
+            created.append(pinfo['create_time'] or 0.0)
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            pass
+    return ProcessSnapshot(pids, names, cpu, memory, statuses, users, created)
+
+class StaticAttributeCache:
+    # Per-PID cache of attributes that can't change during a process's
+    # lifetime. Each entry carries the identity it was read under (e.g. the
+    # create_time), so a reused PID misses instead of returning the previous
+    # owner's values. PIDs missing from the latest scan are evicted.
+    def __init__(self):
+        self.entries = {}
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, pid, identity):
+        entry = self.entries.get(pid)
+        if entry is not None and entry[0] == identity:
+            return entry[1]
+        return None
+
+    def put(self, pid, identity, value):
+        self.entries[pid] = (identity, value)
+        return value
+
+    def retain(self, pids):
+        # Every scanned PID has an entry, so a larger cache means exits
+        if len(self.entries) > len(pids):
+            alive = set(pids)
+            self.entries = {pid: entry for pid, entry in self.entries.items() if pid in alive}
+
+class PsutilCollector:
+    # Portable collector. Steady-state scans only fetch the dynamic fields;
+    # name and username are read once per process and cached against the
+    # create_time psutil holds for that Process, which is also its identity
+    # for cpu_percent().
+    name = 'psutil'
+    DYNAMIC_ATTRS = ['cpu_percent', 'memory_percent', 'status']
+    STATIC_ATTRS = ['name', 'username']
+
+    def __init__(self):
+        self.static = StaticAttributeCache()
+
+    def collect(self):
+        pids, names, cpu, memory, statuses, users, created = [], [], [], [], [], [], []
+        for proc in psutil.process_iter(self.DYNAMIC_ATTRS):
+            try:
+                pid = proc.pid
+                create_time = proc.create_time()
+                static = self.static.get(pid, create_time)
+                if static is None:
+                    info = proc.as_dict(self.STATIC_ATTRS, ad_value=None)
+                    static = self.static.put(pid, create_time, (info['name'] or "", info['username'] or ""))
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+            pinfo = proc.info
+            pids.append(pid)
+            names.append(static[0])
+            users.append(static[1])
+            created.append(create_time)
+            cpu.append(pinfo['cpu_percent'] if pinfo['cpu_percent'] is not None else 0.0)
+            memory.append(pinfo['memory_percent'] if pinfo['memory_percent'] is not None else 0.0)
+            statuses.append(pinfo['status'] or "")
+        self.static.retain(pids)
+        return ProcessSnapshot(pids, names, cpu, memory, statuses, users, created)
+
+    def export_static(self):
+        # The static cache in a JSON-friendly form, see import_static
+        return {'collector': self.name, 'entries': [
+            [pid, create_time, name, user] for pid, (create_time, (name, user)) in self.static.entries.items()
+        ]}
+
+    def import_static(self, saved):
+        # Entries still have to match a process's identity to be used
+        if saved.get('collector') != self.name:
+            return
+        for pid, create_time, name, user in saved['entries']:
+            self.static.put(pid, create_time, (name, user))
+
+# Map of /proc/[pid]/stat state letters, same values as psutil's STATUS_*
+PROC_STATUSES = {
+    'R': "running",
+    'S': "sleeping",
+    'D': "disk-sleep",
+    'T': "stopped",
+    't': "tracing-stop",
+    'Z': "zombie",
+    'X': "dead",
+    'x': "dead",
+    'K': "wake-kill",
+    'W': "waking",
+    'I': "idle",
+    'P': "parked"
+}
+
+class ProcfsCollector:
+    # Linux fast path. Two reads per PID (stat and statm) into a reused
+    # buffer, no Process objects. Fields that can't change while a process
+    # lives (create_time, the full name, the owner) are cached per PID and
+    # revalidated by starttime, and CPU % comes from tick deltas computed in
+    # NumPy against the previous scan. Produces the same snapshot as
+    # collect_snapshot().
+    name = 'procfs'
+
+    def __init__(self, procfs_path='/proc'):
+        self.procfs_path = procfs_path
+        self.buffer = bytearray(4096)
+        self.clock_ticks = os.sysconf('SC_CLK_TCK')
+        self.page_size = os.sysconf('SC_PAGE_SIZE')
+        self.boot_time = psutil.boot_time()
+        self.total_memory = psutil.virtual_memory().total
+        # (name, username, create_time) per PID, keyed by (starttime, comm)
+        self.static = StaticAttributeCache()
+        self.usernames = {}
+        self.prev_pids = np.zeros(0, dtype=np.int64)
+        self.prev_ticks = np.zeros(0, dtype=np.int64)
+        self.prev_starts = np.zeros(0, dtype=np.int64)
+        self.prev_time = None
+
+    @staticmethod
+    def available():
+        return sys.platform.startswith('linux') and os.path.exists('/proc/self/stat')
+
+    def read(self, path):
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            size = os.readv(fd, [self.buffer])
+        finally:
+            os.close(fd)
+        return bytes(self.buffer[:size])
+
+    def collect(self):
+        now = time.monotonic()
+        root = self.procfs_path
+        pids = sorted(int(entry) for entry in os.listdir(root) if entry.isdigit())
+
+        seen, names, statuses, users, created = [], [], [], [], []
+        ticks = np.empty(len(pids), dtype=np.int64)
+        starts = np.empty(len(pids), dtype=np.int64)
+        rss_pages = np.empty(len(pids), dtype=np.int64)
+        count = 0
+        for pid in pids:
+            try:
+                stat = self.read(f"{root}/{pid}/stat")
+                statm = self.read(f"{root}/{pid}/statm")
+            except (FileNotFoundError, ProcessLookupError, PermissionError):
+                # Exited since listdir, or hidden by hidepid
+                continue
+            if not stat or not statm:
+                continue
+
+            # comm may contain spaces and parens, fields follow the last ')'
+            close = stat.rfind(b')')
+            comm = stat[stat.find(b'(') + 1:close]
+            fields = stat[close + 2:].split()
+            starttime = int(fields[19])
+
+            static = self.static.get(pid, (starttime, comm))
+            if static is None:
+                static = self.load_static(pid, starttime, comm)
+                if static is None:
+                    continue
+
+            seen.append(pid)
+            names.append(static[0])
+            users.append(static[1])
+            created.append(static[2])
+            statuses.append(PROC_STATUSES.get(fields[0].decode(), '?'))
+            ticks[count] = int(fields[11]) + int(fields[12])
+            starts[count] = starttime
+            rss_pages[count] = int(statm.split()[1])
+            count += 1
+
+        seen = np.array(seen, dtype=np.int64)
+        ticks, starts, rss_pages = ticks[:count], starts[:count], rss_pages[:count]
+        cpu = self.cpu_percent(seen, ticks, starts, now)
+        memory = rss_pages * self.page_size / self.total_memory * 100
+
+        self.static.retain(seen.tolist())
+        self.prev_pids, self.prev_ticks, self.prev_starts, self.prev_time = seen, ticks, starts, now
+        return ProcessSnapshot(seen, names, cpu, memory, statuses, users, created)
+
+    def export_static(self):
+        return {'collector': self.name, 'entries': [
+            [pid, starttime, os.fsdecode(comm), *value] for pid, ((starttime, comm), value) in self.static.entries.items()
+        ]}
+
+    def import_static(self, saved):
+        if saved.get('collector') != self.name:
+            return
+        for pid, starttime, comm, name, user, create_time in saved['entries']:
+            self.static.put(pid, (starttime, os.fsencode(comm)), (name, user, create_time))
+
+    def cpu_percent(self, pids, ticks, starts, now):
+        # Same definition as psutil: CPU seconds used since the last scan over
+        # wall seconds elapsed, not divided by the CPU count. Processes that
+        # are new (or whose PID was reused) report 0.0 like psutil's first call.
+        cpu = np.zeros(len(pids))
+        if self.prev_time is None or not len(self.prev_pids) or now <= self.prev_time:
+            return cpu
+        found = np.clip(np.searchsorted(self.prev_pids, pids), 0, len(self.prev_pids) - 1)
+        known = (self.prev_pids[found] == pids) & (self.prev_starts[found] == starts)
+        delta = (ticks - self.prev_ticks[found]) / self.clock_ticks
+        cpu[known] = delta[known] / (now - self.prev_time) * 100
+        return np.round(cpu, 1)
+
+    def load_static(self, pid, starttime, comm):
+        root = self.procfs_path
+        name = os.fsdecode(comm)
+        try:
+            if len(name) >= 15:
+                # comm is truncated to 15 chars; like psutil, use the
+                # cmdline's basename when it extends the truncated name
+                cmdline = self.read(f"{root}/{pid}/cmdline").split(b'\0')
+                if cmdline and cmdline[0]:
+                    extended = os.path.basename(os.fsdecode(cmdline[0]))
+                    if extended.startswith(name):
+                        name = extended
+            uid = None
+            with open(f"{root}/{pid}/status", 'rb') as f:
+                for line in f:
+                    if line.startswith(b'Uid:'):
+                        uid = int(line.split()[1])
+                        break
+        except (FileNotFoundError, ProcessLookupError):
+            return None
+        except PermissionError:
+            uid = None
+
+        create_time = starttime / self.clock_ticks + self.boot_time
+        return self.static.put(pid, (starttime, comm), (name, self.username(uid), create_time))
+
+    def username(self, uid):
+        if uid is None:
+            return ""
+        if uid not in self.usernames:
+            try:
+                self.usernames[uid] = pwd.getpwuid(uid).pw_name
+            except (KeyError, AttributeError):
+                self.usernames[uid] = str(uid)
+        return self.usernames[uid]
+
+def collector_name(fast=False):
+    # Name of the collector make_collector(fast) returns, without creating it
+    return ProcfsCollector.name if fast and ProcfsCollector.available() else PsutilCollector.name
+
+def make_collector(fast=False):
+    if fast and ProcfsCollector.available():
+        return ProcfsCollector()
+    return PsutilCollector()
+
+class ProcessTreeIndex:
+    # Parent -> children index kept up to date from snapshot diffs. ppid is
+    # only looked up for PIDs that are new since the last snapshot, plus the
+    # children of exited processes since those get reparented.
+    def __init__(self):
+        self.parent = {}
+        self.children = {}
+        self.create_times = {}
+
+    def update(self, snapshot):
+        current = dict(zip(snapshot.pids.tolist(), snapshot.create_times.tolist()))
+
+        # A PID whose create_time changed was reused, treat it as exit + start
+        exited = [pid for pid, created in self.create_times.items()
+                  if current.get(pid) != created]
+        orphans = set()
+        for pid in exited:
+            self.remove(pid)
+        for pid in exited:
+            orphans.update(self.children.pop(pid, ()))
+
+        new = [pid for pid in current if pid not in self.parent]
+        for pid in new:
+            self.create_times[pid] = current[pid]
+        targets = [pid for pid in orphans.union(new) if pid in current]
+        if snapshot.ppids is not None:
+            rows = snapshot.positions(targets)
+            for pid, ppid in zip(targets, snapshot.ppids[rows].tolist()):
+                self.attach(pid, ppid)
+        else:
+            for pid in targets:
+                self.attach(pid, self.lookup_ppid(pid))
+
+        return new, exited
+
+    def lookup_ppid(self, pid):
+        try:
+            return psutil.Process(pid).ppid()
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+            return 0
+
+    def attach(self, pid, ppid):
+        old = self.parent.get(pid)
+        if old is not None and old in self.children:
+            self.children[old].discard(pid)
+        self.parent[pid] = ppid
+        self.children.setdefault(ppid, set()).add(pid)
+
+    def remove(self, pid):
+        ppid = self.parent.pop(pid, None)
+        self.create_times.pop(pid, None)
+        if ppid is not None and ppid in self.children:
+            self.children[ppid].discard(pid)
+
+    def children_of(self, pid):
+        return self.children.get(pid, ())
+
+    def parent_positions(self, snapshot):
+        # Row of each process's parent in the snapshot, -1 for roots
+        ppids = np.fromiter((self.parent.get(pid, 0) for pid in snapshot.pids.tolist()),
+                            dtype=np.int64, count=len(snapshot))
+        positions = snapshot.positions(ppids)
+        # Guard against a process being listed as its own parent (pid 0 on some platforms)
+        positions[positions == np.arange(len(snapshot))] = -1
+        return positions
+
+    def roots(self, snapshot):
+        positions = self.parent_positions(snapshot)
+        return snapshot.pids[positions < 0]
+
+    def subtree_totals(self, snapshot, parent_positions=None):
+        # Bottom-up CPU/memory/process-count totals for every subtree. Nodes
+        # are grouped by depth and each level is folded into its parents with
+        # one np.add.at, so the cost is O(N * tree height) in NumPy, not Python.
+        if parent_positions is None:
+            parent_positions = self.parent_positions(snapshot)
+        count = len(snapshot)
+        depth = np.zeros(count, dtype=np.int64)
+        cursor = parent_positions.copy()
+        for _ in range(count):
+            active = cursor >= 0
+            if not active.any():
+                break
+            depth[active] += 1
+            cursor[active] = parent_positions[cursor[active]]
+
+        cpu = snapshot.cpu_percent.copy()
+        memory = snapshot.memory_percent.copy()
+        processes = np.ones(count, dtype=np.int64)
+        for level in range(int(depth.max()) if count else 0, 0, -1):
+            nodes = np.nonzero(depth == level)[0]
+            parents = parent_positions[nodes]
+            np.add.at(cpu, parents, cpu[nodes])
+            np.add.at(memory, parents, memory[nodes])
+            np.add.at(processes, parents, processes[nodes])
+        return cpu, memory, processes
+
+def counter_deltas(previous, current, wrap=2 ** 32):
+    # Elementwise increase of monotonic counters. A decrease means the counter
+    # wrapped (if the old value fit in `wrap` bits) or was reset, in which
+    # case everything counted since the reset is the delta.
+    delta = current - previous
+    wrapped = delta < 0
+    if wrapped.any():
+        delta = np.where(wrapped, np.where(previous < wrap, current + wrap - previous, current), delta)
+    return delta
+
+class CounterRates:
+    # Per-second rates for keyed counters (disks, NICs, processes) sampled
+    # repeatedly. Each sample is a (keys, counters) matrix; rows are matched
+    # to the previous sample by key so devices or processes coming and going
+    # don't shift the others. Keys seen for the first time get NaN.
+    def __init__(self):
+        self.index = {}
+        self.values = None
+        self.time = None
+
+    def update(self, keys, values, timestamp=None):
+        now = time.monotonic() if timestamp is None else timestamp
+        values = np.asarray(values, dtype=np.float64).reshape(len(keys), -1) if len(keys) else np.zeros((0, 0))
+        rates = np.full(values.shape, np.nan)
+        if self.values is not None and now > self.time:
+            rows = np.array([self.index.get(key, -1) for key in keys], dtype=np.int64)
+            known = rows >= 0
+            if known.any():
+                rates[known] = counter_deltas(self.values[rows[known]], values[known]) / (now - self.time)
+        self.index = {key: i for i, key in enumerate(keys)}
+        self.values = values
+        self.time = now
+        return rates
+
+DISK_FIELDS = ('read_bytes', 'write_bytes')
+NET_FIELDS = ('bytes_recv', 'bytes_sent')
+
+class SystemIOSampler:
+    # Disk and network throughput from psutil's per-device counters. Totals
+    # leave out partitions (already counted in their disk) and loopback.
+    def __init__(self):
+        self.disk = CounterRates()
+        self.net = CounterRates()
+        self.disk_names = []
+        self.disk_rates = np.zeros((0, len(DISK_FIELDS)))
+        self.nic_names = []
+        self.nic_rates = np.zeros((0, len(NET_FIELDS)))
+        self.whole_disks = {}
+
+    def is_whole_disk(self, name):
+        if name not in self.whole_disks:
+            # Linux lists partitions in /proc/diskstats but not in /sys/block
+            self.whole_disks[name] = not os.path.isdir('/sys/block') or os.path.exists(f'/sys/block/{name}')
+        return self.whole_disks[name]
+
+    def sample(self):
+        now = time.monotonic()
+        disks = psutil.disk_io_counters(perdisk=True) or {}
+        nics = psutil.net_io_counters(pernic=True) or {}
+        self.disk_names = list(disks)
+        self.disk_rates = self.disk.update(
+            self.disk_names, [[getattr(c, f) for f in DISK_FIELDS] for c in disks.values()], now
+        )
+        self.nic_names = list(nics)
+        self.nic_rates = self.net.update(
+            self.nic_names, [[getattr(c, f) for f in NET_FIELDS] for c in nics.values()], now
+        )
+        return self.totals()
+
+    def totals(self):
+        disk_mask = np.array([self.is_whole_disk(name) for name in self.disk_names], dtype=bool)
+        nic_mask = np.array([name != 'lo' for name in self.nic_names], dtype=bool)
+        disk = np.nansum(self.disk_rates[disk_mask], axis=0) if disk_mask.any() else np.zeros(2)
+        net = np.nansum(self.nic_rates[nic_mask], axis=0) if nic_mask.any() else np.zeros(2)
+        return {
+            'disk_read_bps': float(disk[0]),
+            'disk_write_bps': float(disk[1]),
+            'net_recv_bps': float(net[0]),
+            'net_sent_bps': float(net[1])
+        }
+
+    def busiest(self, count=3):
+        # (name, bytes/s) of the busiest whole disks and interfaces
+        devices = [
+            (name, total) for name, total in zip(self.disk_names, np.nansum(self.disk_rates, axis=1).tolist())
+            if self.is_whole_disk(name)
+        ]
+        devices += [
+            (name, total) for name, total in zip(self.nic_names, np.nansum(self.nic_rates, axis=1).tolist())
+            if name != 'lo'
+        ]
+        return sorted(devices, key=lambda device: device[1], reverse=True)[:count]
+
+class ProcessIOSampler:
+    # Read/write rates for a handful of PIDs, normally the rows on screen.
+    # Doing this for every process would add a syscall per process to each
+    # scan. Keys include create_time so a reused PID starts over.
+    available = hasattr(psutil.Process, 'io_counters')
+
+    def __init__(self):
+        self.rates = CounterRates()
+        self.procs = {}
+
+    def sample(self, pids):
+        if not self.available:
+            return {}
+        keys, values, procs = [], [], {}
+        for pid in pids:
+            try:
+                proc = self.procs.get(pid) or psutil.Process(pid)
+                io = proc.io_counters()
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+            procs[pid] = proc
+            keys.append((pid, proc.create_time()))
+            values.append((io.read_bytes, io.write_bytes))
+        self.procs = procs
+        rates = self.rates.update(keys, values)
+        return {key[0]: tuple(rate) for key, rate in zip(keys, rates.tolist())}
+
+class MemoryDetailSampler:
+    # USS, PSS and swap per process from memory_full_info(). That call parses
+    # smaps and can take milliseconds per process, so each update spends at
+    # most budget_ms on it: processes with no result, or one older than
+    # max_age seconds, are refreshed largest RSS first and the rest wait for
+    # a later tick. Results are kept per PID with the create_time they were
+    # read under and the time they were read, so the UI can show their age.
+    available = hasattr(psutil.Process, 'memory_full_info')
+
+    def __init__(self, budget_ms=25, max_age=30.0):
+        self.budget_ms = budget_ms
+        self.max_age = max_age
+        # pid -> (create_time, sampled_at, uss, pss, swap); None values for
+        # processes we may not read, so they aren't retried every tick
+        self.results = {}
+
+    def update(self, snapshot, total_memory):
+        if not self.available or not self.budget_ms or not len(snapshot):
+            return 0
+        now = time.time()
+        pids = snapshot.pids.tolist()
+        created = snapshot.create_times.tolist()
+        results = self.results
+        alive = {}
+        sampled_at = np.full(len(pids), -np.inf)
+        for i, pid in enumerate(pids):
+            entry = results.get(pid)
+            if entry is not None and entry[0] == created[i]:
+                alive[pid] = entry
+                sampled_at[i] = entry[1]
+        self.results = alive
+
+        due = np.nonzero(now - sampled_at > self.max_age)[0]
+        rss = snapshot.memory_percent[due] * total_memory / 100
+        deadline = time.perf_counter() + self.budget_ms / 1000
+        count = 0
+        for i in due[np.argsort(-rss, kind='stable')].tolist():
+            if time.perf_counter() > deadline:
+                break
+            pid = pids[i]
+            try:
+                info = psutil.Process(pid).memory_full_info()
+                detail = (getattr(info, 'uss', None), getattr(info, 'pss', None), getattr(info, 'swap', None))
+            except psutil.AccessDenied:
+                detail = (None, None, None)
+            except psutil.NoSuchProcess:
+                continue
+            alive[pid] = (created[i], time.time(), *detail)
+            count += 1
+        return count
+
+def cgroup2_mount(mountinfo='/proc/self/mountinfo'):
+    # Where the unified (v2) hierarchy is mounted, None without one. On
+    # hybrid hosts it is usually /sys/fs/cgroup/unified.
+    try:
+        with open(mountinfo) as f:
+            for line in f:
+                fields = line.split()
+                separator = fields.index('-')
+                if fields[separator + 1] == 'cgroup2':
+                    return fields[4]
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+CONTAINER_ID = re.compile(r'[0-9a-f]{64}')
+UNIT_SUFFIXES = ('.service', '.scope')
+
+def cgroup_group(path, by='unit'):
+    # Group key for a cgroup path. 'unit' cuts the path at the first systemd
+    # service/scope or container, so a container's or service's sub-cgroups
+    # count as one group; 'path' keeps every cgroup separate.
+    if path is None or by == 'path':
+        return path
+    parts = path.split('/')
+    for i, part in enumerate(parts):
+        if part.endswith(UNIT_SUFFIXES) or CONTAINER_ID.search(part):
+            return '/'.join(parts[:i + 1])
+    return path
+
+def cgroup_label(key):
+    if key is None:
+        return "(unknown)"
+    container = CONTAINER_ID.search(key)
+    if container:
+        return f"container {container.group()[:12]}"
+    return key.rsplit('/', 1)[-1] or "/"
+
+class CgroupSampler:
+    # Processes grouped by cgroup v2, with each group's CPU and memory read
+    # from its own cpu.stat and memory.current. Those are the kernel's
+    # hierarchical totals, exact (threads and exited children included) and
+    # one read per group rather than a sum over its processes. Where a file
+    # is missing (no memory controller, the root cgroup) the group falls back
+    # to summing its processes and is marked as not exact.
+    #
+    # The PID -> cgroup map is cached per PID and only read again when the
+    # PID's create_time changes; processes moved to another cgroup after
+    # they were first seen keep their old group.
+    HISTORY = 60
+
+    def __init__(self, by='unit', root=None, procfs_path='/proc'):
+        self.root = cgroup2_mount() if root is None else root
+        self.procfs_path = procfs_path
+        self.by = by
+        # pid -> (create_time, cgroup path)
+        self.paths = {}
+        self.cpu = CounterRates()
+        self.keys = []
+        self.codes = np.zeros(0, dtype=np.int64)
+        self.cpu_percent = np.zeros(0)
+        self.memory_bytes = np.zeros(0)
+        self.process_counts = np.zeros(0, dtype=np.int64)
+        # Whether CPU / memory came from the cgroup rather than a sum
+        self.exact_cpu = np.zeros(0, dtype=bool)
+        self.exact_memory = np.zeros(0, dtype=bool)
+        # key -> (2, HISTORY) ring of CPU % and memory bytes, plus next slot
+        self.history = {}
+        self.filled = {}
+
+    @staticmethod
+    def available():
+        return cgroup2_mount() is not None
+
+    def path_of(self, pid):
+        try:
+            with open(f"{self.procfs_path}/{pid}/cgroup", 'rb') as f:
+                for line in f:
+                    if line.startswith(b'0::'):
+                        return os.fsdecode(line[3:].rstrip(b'\n'))
+        except (FileNotFoundError, ProcessLookupError, PermissionError):
+            pass
+        return None
+
+    def read_value(self, key, name, field=None):
+        try:
+            with open(f"{self.root}{key.rstrip('/')}/{name}", 'rb') as f:
+                if field is None:
+                    return float(f.read())
+                for line in f:
+                    if line.startswith(field):
+                        return float(line.split()[1])
+        except (OSError, ValueError):
+            pass
+        return None
+
+    def update(self, snapshot, total_memory):
+        now = time.monotonic()
+        paths = {}
+        cached = self.paths
+        keys = []
+        for pid, create_time in zip(snapshot.pids.tolist(), snapshot.create_times.tolist()):
+            entry = cached.get(pid)
+            if entry is None or entry[0] != create_time:
+                entry = (create_time, self.path_of(pid))
+            paths[pid] = entry
+            keys.append(cgroup_group(entry[1], self.by))
+        self.paths = paths
+
+        # Unreadable PIDs (None) sort first as their own group
+        labels = sorted(set(keys), key=lambda key: (key is not None, key or ""))
+        index = {key: i for i, key in enumerate(labels)}
+        codes = np.fromiter((index[key] for key in keys), dtype=np.int64, count=len(keys))
+        count = len(labels)
+        summed_cpu = np.bincount(codes, weights=snapshot.cpu_percent, minlength=count)
+        summed_memory = np.bincount(codes, weights=snapshot.memory_percent, minlength=count) * total_memory / 100
+
+        usage = np.array([
+            np.nan if key is None else (self.read_value(key, 'cpu.stat', b'usage_usec ') or np.nan)
+            for key in labels
+        ])
+        memory = np.array([
+            np.nan if key is None else (self.read_value(key, 'memory.current') or np.nan)
+            for key in labels
+        ])
+        # usage_usec per second / 10^4 = percent of one CPU, like cpu_percent
+        cpu = self.cpu.update(labels, usage, now)[:, 0] / 1e4 if count else np.zeros(0)
+        self.exact_cpu = ~np.isnan(cpu)
+        self.exact_memory = ~np.isnan(memory)
+
+        self.keys = labels
+        self.codes = codes
+        self.cpu_percent = np.where(self.exact_cpu, cpu, summed_cpu)
+        self.memory_bytes = np.where(self.exact_memory, memory, summed_memory)
+        self.process_counts = np.bincount(codes, minlength=count)
+        self.record_history()
+
+    def record_history(self):
+        history, filled = {}, {}
+        for i, key in enumerate(self.keys):
+            series = self.history.get(key)
+            if series is None:
+                series = np.full((2, self.HISTORY), np.nan)
+            slot = self.filled.get(key, 0)
+            series[:, slot % self.HISTORY] = (self.cpu_percent[i], self.memory_bytes[i])
+            history[key] = series
+            filled[key] = slot + 1
+        self.history, self.filled = history, filled
+
+    def series(self, key):
+        # Recorded (cpu_percent, memory_bytes) of a group, oldest first
+        series = self.history.get(key)
+        if series is None:
+            return np.zeros((2, 0))
+        filled = self.filled[key]
+        if filled < self.HISTORY:
+            return series[:, :filled]
+        return np.roll(series, -(filled % self.HISTORY), axis=1)
+
+    def rows_of(self, key):
+        # Snapshot rows of a group, empty if it has none in the last update
+        if key not in self.keys:
+            return np.zeros(0, dtype=np.int64)
+        return np.nonzero(self.codes == self.keys.index(key))[0]
+
+class ProcessDetails:
+    # Expensive per-process information (environment, open files, memory
+    # maps...) for the detail pane, one section at a time. fetch() is meant
+    # for a worker thread; results are cached for `ttl` seconds per
+    # (pid, create_time, section) so switching tabs back and forth doesn't
+    # repeat the calls. Threads are fetched more often by the caller and get
+    # per-thread CPU % from the difference with the previous fetch.
+    SECTIONS = ('overview', 'environment', 'files', 'connections', 'threads', 'memory_maps')
+
+    def __init__(self, ttl=3.0):
+        self.ttl = ttl
+        self.cache = {}
+        self.lock = threading.Lock()
+        self.thread_rates = CounterRates()
+        self.thread_owner = None
+
+    def get(self, pid, create_time, section):
+        # (value, error) if a fresh result is cached, else None
+        with self.lock:
+            entry = self.cache.get((pid, create_time, section))
+        if entry is None or time.monotonic() - entry[0] > self.ttl:
+            return None
+        return entry[1]
+
+    def fetch(self, pid, create_time, section):
+        # Returns (value, error). NoSuchProcess (also for a reused PID) is
+        # reported as an error rather than raised.
+        try:
+            proc = psutil.Process(pid)
+            if abs(proc.create_time() - create_time) > 1:
+                raise psutil.NoSuchProcess(pid)
+            result = getattr(self, f"read_{section}")(proc), None
+        except psutil.NoSuchProcess:
+            result = None, "Process has exited"
+        except psutil.AccessDenied:
+            result = None, "Access denied"
+        now = time.monotonic()
+        with self.lock:
+            # Only the open process is cached, so drop everything else
+            self.cache = {key: entry for key, entry in self.cache.items()
+                          if key[:2] == (pid, create_time) and now - entry[0] <= self.ttl}
+            self.cache[(pid, create_time, section)] = (now, result)
+        return result
+
+    def read_overview(self, proc):
+        info = {}
+        with proc.oneshot():
+            for name in ('cmdline', 'exe', 'cwd', 'status', 'username', 'ppid', 'nice', 'num_threads',
+                         'num_fds', 'cpu_times', 'memory_info', 'io_counters', 'num_ctx_switches'):
+                method = getattr(proc, name, None)
+                if method is None:
+                    continue
+                try:
+                    info[name] = method()
+                except psutil.AccessDenied:
+                    info[name] = None
+        return info
+
+    def read_environment(self, proc):
+        return sorted(proc.environ().items())
+
+    def read_files(self, proc):
+        return [(f.fd, f.path, getattr(f, 'mode', ''), getattr(f, 'position', None)) for f in proc.open_files()]
+
+    def read_connections(self, proc):
+        connections = proc.net_connections(kind='inet') if hasattr(proc, 'net_connections') else proc.connections(kind='inet')
+        rows = []
+        for conn in connections:
+            local = f"{conn.laddr.ip}:{conn.laddr.port}" if conn.laddr else ""
+            remote = f"{conn.raddr.ip}:{conn.raddr.port}" if conn.raddr else ""
+            kind = "TCP" if conn.type == socket.SOCK_STREAM else "UDP"
+            rows.append((kind, local, remote, conn.status))
+        return rows
+
+    def read_memory_maps(self, proc):
+        maps = proc.memory_maps(grouped=True)
+        rows = [(m.path, m.rss, getattr(m, 'size', None), getattr(m, 'pss', None), getattr(m, 'swap', None))
+                for m in maps]
+        return sorted(rows, key=lambda row: -row[1])
+
+    def read_threads(self, proc):
+        # (tid, name, cpu %, user s, system s), busiest first. The first
+        # fetch for a process has no CPU % yet (NaN).
+        threads = proc.threads()
+        if self.thread_owner != (proc.pid, proc.create_time()):
+            self.thread_owner = (proc.pid, proc.create_time())
+            self.thread_rates = CounterRates()
+        keys = [thread.id for thread in threads]
+        rates = self.thread_rates.update(keys, [thread.user_time + thread.system_time for thread in threads])
+        rows = []
+        for thread, rate in zip(threads, rates[:, 0].tolist() if len(keys) else []):
+            rows.append((thread.id, self.thread_name(proc.pid, thread.id), rate * 100,
+                         thread.user_time, thread.system_time))
+        return sorted(rows, key=lambda row: -row[2] if row[2] == row[2] else 0)
+
+    def thread_name(self, pid, tid):
+        try:
+            with open(f"/proc/{pid}/task/{tid}/comm") as f:
+                return f.read().strip()
+        except OSError:
+            return ""
@@ -0,0 +1,201 @@
+import time
+from datetime import datetime
+from PySide6.QtWidgets import (
+    QAbstractItemView, QDockWidget, QHeaderView, QLabel, QPlainTextEdit, QTabWidget, QTableWidget,
+    QTableWidgetItem, QVBoxLayout, QWidget
+)
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, QTimer, Signal
+from process_data import ProcessDetails, format_bytes
+
+# Detail pane for one process, opened by double-clicking it. Only the tab on
+# screen is fetched, on a single worker thread of its own so a slow call
+# (memory maps of a large process) can neither block the UI nor queue up
+# behind the process scans. Nothing is fetched while the pane is closed.
+
+def format_size(count):
+    return "" if count is None else format_bytes(count)
+
+class DetailSignals(QObject):
+    finished = Signal(object)
+
+class DetailTask(QRunnable):
+    def __init__(self, details, pid, create_time, section):
+        super().__init__()
+        self.details = details
+        self.request = (pid, create_time, section)
+        self.signals = DetailSignals()
+
+    def run(self):
+        value, error = self.details.fetch(*self.request)
+        self.signals.finished.emit((*self.request, value, error))
+
+class ProcessDetailPane(QDockWidget):
+    # Sections other than threads are refreshed every REFRESH_MS while their
+    # tab is shown (served from the cache within its TTL); threads are
+    # sampled every THREAD_MS for per-thread CPU.
+    REFRESH_MS = 3000
+    THREAD_MS = 250
+    TABS = [
+        ('overview', "Overview", None),
+        ('threads', "Threads", ["TID", "Name", "CPU %", "User s", "System s"]),
+        ('files', "Open Files", ["FD", "Path", "Mode", "Position"]),
+        ('connections', "Connections", ["Type", "Local", "Remote", "Status"]),
+        ('memory_maps', "Memory Maps", ["Path", "RSS", "Size", "PSS", "Swap"]),
+        ('environment', "Environment", ["Variable", "Value"])
+    ]
+
+    def __init__(self, parent=None):
+        super().__init__("Process Details", parent)
+        self.details = ProcessDetails(ttl=self.REFRESH_MS / 1000)
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(1)
+        self.process = None
+        self.in_flight = False
+        self.last_fetch = {}
+        self.tasks = set()
+
+        widget = QWidget()
+        layout = QVBoxLayout(widget)
+        self.title_label = QLabel()
+        self.title_label.setStyleSheet("font-weight: bold;")
+        self.status_label = QLabel()
+        self.tabs = QTabWidget()
+        self.views = {}
+        for section, label, headers in self.TABS:
+            if headers is None:
+                view = QPlainTextEdit()
+                view.setReadOnly(True)
+            else:
+                view = QTableWidget(0, len(headers))
+                view.setHorizontalHeaderLabels(headers)
+                view.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
+                view.horizontalHeader().setStretchLastSection(True)
+                view.verticalHeader().setVisible(False)
+                view.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+            self.views[section] = view
+            self.tabs.addTab(view, label)
+        layout.addWidget(self.title_label)
+        layout.addWidget(self.tabs)
+        layout.addWidget(self.status_label)
+        self.setWidget(widget)
+
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.poll)
+        self.tabs.currentChanged.connect(self.poll)
+
+    def set_process(self, pid, create_time, name):
+        self.process = (pid, create_time)
+        self.last_fetch = {}
+        self.title_label.setText(f"{name} (PID {pid})")
+        for section, _, headers in self.TABS:
+            view = self.views[section]
+            if headers is None:
+                view.clear()
+            else:
+                view.setRowCount(0)
+        self.show()
+        self.raise_()
+        self.poll()
+
+    def current_section(self):
+        return self.TABS[self.tabs.currentIndex()][0]
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.timer.start(self.THREAD_MS)
+
+    def hideEvent(self, event):
+        self.timer.stop()
+        super().hideEvent(event)
+
+    def poll(self):
+        if self.process is None or not self.isVisible():
+            return
+        section = self.current_section()
+        interval = self.THREAD_MS if section == 'threads' else self.REFRESH_MS
+        now = time.monotonic()
+        if now - self.last_fetch.get(section, -interval) < interval / 1000:
+            return
+        cached = None if section == 'threads' else self.details.get(*self.process, section)
+        if cached is not None:
+            self.last_fetch[section] = now
+            self.show_result(section, *cached)
+            return
+        # One fetch at a time; the next poll picks up whatever is due
+        if self.in_flight:
+            return
+        self.in_flight = True
+        self.last_fetch[section] = now
+        task = DetailTask(self.details, *self.process, section)
+        task.signals.finished.connect(self.fetch_finished)
+        # Keep the signals object alive until its result is delivered
+        self.tasks.add(task.signals)
+        self.pool.start(task)
+
+    def fetch_finished(self, result):
+        pid, create_time, section, value, error = result
+        self.in_flight = False
+        self.tasks.discard(self.sender())
+        if (pid, create_time) == self.process:
+            self.show_result(section, value, error)
+
+    def show_result(self, section, value, error):
+        self.status_label.setText(error or f"Updated {datetime.now().strftime('%H:%M:%S')}")
+        if error:
+            return
+        view = self.views[section]
+        if section == 'overview':
+            view.setPlainText(self.overview_text(value))
+            return
+        rows = [self.format_row(section, row) for row in value]
+        view.setUpdatesEnabled(False)
+        view.setRowCount(len(rows))
+        for i, row in enumerate(rows):
+            for column, text in enumerate(row):
+                item = view.item(i, column)
+                if item is None:
+                    view.setItem(i, column, QTableWidgetItem(text))
+                elif item.text() != text:
+                    item.setText(text)
+        view.setUpdatesEnabled(True)
+
+    def format_row(self, section, row):
+        if section == 'threads':
+            tid, name, cpu, user, system = row
+            return [str(tid), name, "" if cpu != cpu else f"{cpu:.1f}", f"{user:.2f}", f"{system:.2f}"]
+        if section == 'files':
+            fd, path, mode, position = row
+            return [str(fd), path, mode, "" if position is None else str(position)]
+        if section == 'memory_maps':
+            path, rss, size, pss, swap = row
+            return [path, format_size(rss), format_size(size), format_size(pss), format_size(swap)]
+        return [str(value) for value in row]
+
+    def overview_text(self, info):
+        def show(value):
+            return "(access denied)" if value is None else value
+
+        lines = []
+        cmdline = info.get('cmdline')
+        lines.append(f"Command line: {' '.join(cmdline) if cmdline else show(cmdline)}")
+        for key, label in (('exe', "Executable"), ('cwd', "Working directory"), ('status', "Status"),
+                           ('username', "User"), ('ppid', "Parent PID"), ('nice', "Nice"),
+                           ('num_threads', "Threads"), ('num_fds', "Open file descriptors")):
+            if key in info:
+                lines.append(f"{label}: {show(info[key])}")
+        times = info.get('cpu_times')
+        if times is not None:
+            lines.append(f"CPU time: {times.user:.2f} s user, {times.system:.2f} s system")
+        memory = info.get('memory_info')
+        if memory is not None:
+            lines.append(f"Memory: {format_size(memory.rss)} RSS, {format_size(memory.vms)} virtual")
+        io = info.get('io_counters')
+        if io is not None:
+            lines.append(f"I/O: {format_size(io.read_bytes)} read, {format_size(io.write_bytes)} written, "
+                         f"{io.read_count} reads, {io.write_count} writes")
+        elif 'io_counters' in info:
+            lines.append("I/O: (access denied)")
+        switches = info.get('num_ctx_switches')
+        if switches is not None:
+            lines.append(f"Context switches: {switches.voluntary} voluntary, {switches.involuntary} involuntary")
+        return "\n".join(lines)
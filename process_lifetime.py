@@ -0,0 +1,426 @@
+import os
+import sys
+import time
+import errno
+import socket
+import struct
+import threading
+from collections import deque
+import psutil
+import numpy as np
+
+# Process start/exit events. The tick-based scans only see processes alive at
+# the moment of a scan, so anything that starts and exits in between is
+# invisible to them. A background source watches for starts and exits as
+# they happen: the kernel's proc connector over netlink when we are allowed
+# to open it (root or CAP_NET_ADMIN), otherwise fast polling of /proc.
+# Without either, events are derived from consecutive scans. Qt-free so the
+# agent, scripts and the scheduling simulator can use it.
+
+class LifetimeEvent:
+    __slots__ = ('kind', 'time', 'pid', 'ppid', 'name', 'create_time', 'duration',
+                 'cpu_time', 'cpu_percent', 'memory_percent', 'exit_code', 'scanned')
+
+    def __init__(self, kind, time, pid, ppid, name, create_time, duration=None, cpu_time=None,
+                 cpu_percent=None, memory_percent=None, exit_code=None, scanned=True):
+        self.kind = kind            # 'start' or 'exit'
+        self.time = time            # wall time the event was observed
+        self.pid = pid
+        self.ppid = ppid
+        self.name = name
+        self.create_time = create_time
+        self.duration = duration    # seconds alive, exits only
+        self.cpu_time = cpu_time    # user + system seconds, when known
+        # Last values from a scan; None when the process was never scanned
+        self.cpu_percent = cpu_percent
+        self.memory_percent = memory_percent
+        self.exit_code = exit_code  # netlink only
+        self.scanned = scanned      # False for processes that lived between scans
+
+class LifetimeLog:
+    # Bounded, append-only. Consumers keep the sequence number they last read
+    # and call since() to get only what is new; events older than max_events
+    # are dropped and a consumer that falls that far behind just skips them.
+    def __init__(self, max_events=20000):
+        self.events = deque(maxlen=max_events)
+        self.seq = 0
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.events)
+
+    def append(self, event):
+        with self.lock:
+            self.events.append(event)
+            self.seq += 1
+
+    def since(self, seq):
+        # Returns (events after seq, oldest first; the seq to pass next time)
+        with self.lock:
+            missing = min(self.seq - seq, len(self.events))
+            events = [self.events[-i] for i in range(missing, 0, -1)]
+            return events, self.seq
+
+    def trace(self, limit=None):
+        # Completed lifetimes as (pid, name, arrival, duration, cpu_time),
+        # ordered by arrival: an arrival/burst trace for the scheduling
+        # simulator. cpu_time is None when it could not be read.
+        with self.lock:
+            exits = [event for event in self.events if event.kind == 'exit' and event.duration is not None]
+        if limit is not None:
+            exits = exits[-limit:]
+        exits.sort(key=lambda event: event.create_time)
+        return [(event.pid, event.name, event.create_time, event.duration, event.cpu_time) for event in exits]
+
+def read_proc_stat(pid, clock_ticks, boot_time, root='/proc'):
+    # (name, ppid, create_time, cpu_time) or None if the process is gone.
+    # Zombies still have their stat, so this also works right after exit.
+    try:
+        with open(f"{root}/{pid}/stat", 'rb') as f:
+            stat = f.read()
+    except (FileNotFoundError, ProcessLookupError, PermissionError):
+        return None
+    close = stat.rfind(b')')
+    fields = stat[close + 2:].split()
+    if len(fields) < 20:
+        return None
+    name = os.fsdecode(stat[stat.find(b'(') + 1:close])
+    cpu_time = (int(fields[11]) + int(fields[12])) / clock_ticks
+    return name, int(fields[1]), int(fields[19]) / clock_ticks + boot_time, cpu_time
+
+class ProcPollSource:
+    # Lists /proc every interval and diffs the PID set. Catches anything that
+    # lives longer than the interval. Young processes get their stat re-read
+    # on each poll so short-lived ones exit with their final CPU time.
+    name = 'proc'
+    YOUNG_SECONDS = 2.0
+
+    def __init__(self, tracker, interval=0.05, root='/proc'):
+        self.tracker = tracker
+        self.interval = interval
+        self.root = root
+        self.clock_ticks = os.sysconf('SC_CLK_TCK')
+        self.boot_time = psutil.boot_time()
+        self.stop_event = threading.Event()
+        self.thread = None
+
+    @staticmethod
+    def available():
+        return sys.platform.startswith('linux') and os.path.exists('/proc/self/stat')
+
+    def list_pids(self):
+        return {int(entry) for entry in os.listdir(self.root) if entry.isdigit()}
+
+    def start(self):
+        # The first listing is the baseline, not a burst of start events
+        known = {}
+        for pid in self.list_pids():
+            info = read_proc_stat(pid, self.clock_ticks, self.boot_time, self.root)
+            if info is not None:
+                known[pid] = info
+                self.tracker.process_existing(pid, info[1], info[0], info[2])
+        self.thread = threading.Thread(target=self.run, args=(known,), name="lifetime-proc", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.stop_event.set()
+
+    def run(self, known):
+        while not self.stop_event.wait(self.interval):
+            now = time.time()
+            pids = self.list_pids()
+            for pid in known.keys() - pids:
+                info = known.pop(pid)
+                self.tracker.process_exited(pid, now, cpu_time=info[3])
+            for pid in pids - known.keys():
+                info = read_proc_stat(pid, self.clock_ticks, self.boot_time, self.root)
+                if info is not None:
+                    known[pid] = info
+                    self.tracker.process_started(pid, info[1], info[0], info[2], cpu_time=info[3])
+            for pid, info in list(known.items()):
+                if now - info[2] < self.YOUNG_SECONDS:
+                    latest = read_proc_stat(pid, self.clock_ticks, self.boot_time, self.root)
+                    if latest is not None and latest[2] == info[2]:
+                        if latest[0] != info[0]:
+                            self.tracker.process_renamed(pid, latest[0])
+                        known[pid] = latest
+
+# linux/connector.h and linux/cn_proc.h
+NETLINK_CONNECTOR = 11
+CN_IDX_PROC = 1
+CN_VAL_PROC = 1
+PROC_CN_MCAST_LISTEN = 1
+PROC_CN_MCAST_IGNORE = 2
+PROC_EVENT_NONE = 0x00000000
+PROC_EVENT_FORK = 0x00000001
+PROC_EVENT_EXEC = 0x00000002
+PROC_EVENT_EXIT = 0x80000000
+NLMSG_DONE = 3
+NLMSG_HEADER = struct.Struct('=IHHII')
+CN_MSG_HEADER = struct.Struct('=IIIIHH')
+PROC_EVENT_HEADER = struct.Struct('=IIQ')
+FORK_EVENT = struct.Struct('=IIII')
+EXEC_EVENT = struct.Struct('=II')
+EXIT_EVENT = struct.Struct('=IIII')
+ACK_EVENT = struct.Struct('=I')
+
+class NetlinkProcSource:
+    # Subscribes to the proc connector: the kernel reports every fork, exec
+    # and exit, so nothing is missed however short-lived. Threads share the
+    # connector, events for them (pid != tgid) are ignored.
+    name = 'netlink'
+    # How long start() waits for the kernel to confirm the subscription
+    CONFIRM_SECONDS = 0.25
+
+    def __init__(self, tracker):
+        self.tracker = tracker
+        self.clock_ticks = os.sysconf('SC_CLK_TCK')
+        self.boot_time = psutil.boot_time()
+        self.sock = None
+        self.stop_event = threading.Event()
+        self.thread = None
+
+    @staticmethod
+    def available():
+        return sys.platform.startswith('linux') and hasattr(socket, 'AF_NETLINK')
+
+    def control_message(self, op):
+        payload = struct.pack('=I', op)
+        cn = CN_MSG_HEADER.pack(CN_IDX_PROC, CN_VAL_PROC, 0, 0, len(payload), 0)
+        size = NLMSG_HEADER.size + len(cn) + len(payload)
+        return NLMSG_HEADER.pack(size, NLMSG_DONE, 0, 0, os.getpid()) + cn + payload
+
+    def start(self):
+        # Raises OSError (usually EPERM) when we may not listen
+        sock = socket.socket(socket.AF_NETLINK, socket.SOCK_DGRAM, NETLINK_CONNECTOR)
+        try:
+            sock.bind((0, CN_IDX_PROC))
+            sock.send(self.control_message(PROC_CN_MCAST_LISTEN))
+            pending = self.confirm(sock)
+            sock.settimeout(0.5)
+        except OSError:
+            sock.close()
+            raise
+        self.sock = sock
+        # Existing processes are the baseline; subscribed first so nothing
+        # starting during the listing is lost
+        for pid in (int(entry) for entry in os.listdir('/proc') if entry.isdigit()):
+            info = read_proc_stat(pid, self.clock_ticks, self.boot_time)
+            if info is not None:
+                self.tracker.process_existing(pid, info[1], info[0], info[2])
+        for data in pending:
+            self.handle(data)
+        self.thread = threading.Thread(target=self.run, name="lifetime-netlink", daemon=True)
+        self.thread.start()
+
+    def confirm(self, sock):
+        # bind() and send() succeed even where the kernel refuses the
+        # subscription, which would leave us waiting for events that never
+        # come. The kernel answers LISTEN with an ack carrying an error code,
+        # so wait for it (any event also proves delivery works) and raise
+        # OSError on an error or no answer. Returns what was received
+        # meanwhile, to be handled once the baseline is in.
+        deadline = time.monotonic() + self.CONFIRM_SECONDS
+        pending = []
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise OSError(errno.ETIMEDOUT, "proc connector did not confirm the subscription")
+            sock.settimeout(remaining)
+            try:
+                data = sock.recv(65536)
+            except socket.timeout:
+                continue
+            pending.append(data)
+            for offset in self.events(data):
+                what = PROC_EVENT_HEADER.unpack_from(data, offset)[0]
+                if what != PROC_EVENT_NONE:
+                    return pending
+                error = ACK_EVENT.unpack_from(data, offset + PROC_EVENT_HEADER.size)[0]
+                if error:
+                    raise OSError(error, os.strerror(error))
+                return pending
+
+    def stop(self):
+        self.stop_event.set()
+
+    def run(self):
+        sock = self.sock
+        try:
+            while not self.stop_event.is_set():
+                try:
+                    data = sock.recv(65536)
+                except socket.timeout:
+                    continue
+                except OSError:
+                    # ENOBUFS: the kernel dropped events while we were busy
+                    continue
+                self.handle(data)
+        finally:
+            try:
+                sock.send(self.control_message(PROC_CN_MCAST_IGNORE))
+            except OSError:
+                pass
+            sock.close()
+
+    def events(self, data):
+        # Offset of each proc event in a datagram
+        offset = 0
+        while offset + NLMSG_HEADER.size <= len(data):
+            size = NLMSG_HEADER.unpack_from(data, offset)[0]
+            if size < NLMSG_HEADER.size:
+                break
+            event_offset = offset + NLMSG_HEADER.size + CN_MSG_HEADER.size
+            if event_offset + PROC_EVENT_HEADER.size + ACK_EVENT.size <= offset + size:
+                yield event_offset
+            offset += (size + 3) & ~3
+
+    def handle(self, data):
+        for offset in self.events(data):
+            self.handle_event(data, offset)
+
+    def handle_event(self, data, offset):
+        what = PROC_EVENT_HEADER.unpack_from(data, offset)[0]
+        offset += PROC_EVENT_HEADER.size
+        now = time.time()
+        if what == PROC_EVENT_FORK:
+            parent_pid, parent_tgid, child_pid, child_tgid = FORK_EVENT.unpack_from(data, offset)
+            if child_pid != child_tgid:
+                return
+            info = read_proc_stat(child_pid, self.clock_ticks, self.boot_time)
+            if info is None:
+                # Already gone; still a real start (and exit to follow)
+                self.tracker.process_started(child_pid, parent_tgid, "", now)
+            else:
+                self.tracker.process_started(child_pid, parent_tgid, info[0], info[2], cpu_time=info[3])
+        elif what == PROC_EVENT_EXEC:
+            pid, tgid = EXEC_EVENT.unpack_from(data, offset)
+            if pid == tgid:
+                info = read_proc_stat(pid, self.clock_ticks, self.boot_time)
+                if info is not None:
+                    self.tracker.process_renamed(pid, info[0])
+        elif what == PROC_EVENT_EXIT:
+            pid, tgid, exit_code, exit_signal = EXIT_EVENT.unpack_from(data, offset)
+            if pid != tgid:
+                return
+            # Wait status: exit code in the high byte, or the signal that
+            # killed it, reported negated like subprocess does
+            exit_code = exit_code >> 8 if exit_code & 0x7f == 0 else -(exit_code & 0x7f)
+            info = read_proc_stat(pid, self.clock_ticks, self.boot_time)
+            if info is None:
+                self.tracker.process_exited(pid, now, exit_code=exit_code)
+            else:
+                self.tracker.process_exited(pid, now, exit_code=exit_code, cpu_time=info[3], name=info[0])
+
+class LifetimeTracker:
+    # Owns the per-PID state and turns source callbacks (from a background
+    # thread) or scan diffs (from observe()) into events in the log. The last
+    # scan is kept so an exit can report the process's final CPU/memory.
+    def __init__(self, log=None):
+        self.log = log if log is not None else LifetimeLog()
+        # pid -> [ppid, name, create_time, cpu_time, started]. started is
+        # when a source saw the start: create_time is derived from the boot
+        # time, which is only known to the second, too coarse for lifetimes
+        # of short-lived processes.
+        self.live = {}
+        self.lock = threading.Lock()
+        self.source = None
+        self.requested = None
+        self.last_snapshot = None
+
+    def start(self, mode='auto', interval=0.05):
+        # mode: 'auto' (netlink, else /proc polling), 'netlink', 'proc' or
+        # 'scan' (diff consecutive scans only). Returns the mode in use.
+        self.stop()
+        self.requested = mode
+        candidates = {'auto': ('netlink', 'proc'), 'netlink': ('netlink',), 'proc': ('proc',)}.get(mode, ())
+        for name in candidates:
+            if name == 'netlink' and NetlinkProcSource.available():
+                source = NetlinkProcSource(self)
+            elif name == 'proc' and ProcPollSource.available():
+                source = ProcPollSource(self, interval)
+            else:
+                continue
+            with self.lock:
+                self.live.clear()
+            try:
+                source.start()
+            except OSError:
+                continue
+            self.source = source
+            return source.name
+        return 'scan'
+
+    def stop(self):
+        if self.source is not None:
+            self.source.stop()
+            self.source = None
+
+    @property
+    def mode(self):
+        return self.source.name if self.source is not None else 'scan'
+
+    def process_existing(self, pid, ppid, name, create_time):
+        with self.lock:
+            self.live[pid] = [ppid, name, create_time, None, None]
+
+    def process_started(self, pid, ppid, name, create_time, cpu_time=None):
+        now = time.time()
+        with self.lock:
+            self.live[pid] = [ppid, name, create_time, cpu_time, now]
+        self.log.append(LifetimeEvent('start', now, pid, ppid, name, create_time,
+                                      cpu_time=cpu_time, scanned=False))
+
+    def process_renamed(self, pid, name):
+        with self.lock:
+            if pid in self.live:
+                self.live[pid][1] = name
+
+    def process_exited(self, pid, when, exit_code=None, cpu_time=None, name=None):
+        with self.lock:
+            state = self.live.pop(pid, None)
+        if state is None:
+            return
+        ppid, last_name, create_time, last_cpu_time, started = state
+        name = name or last_name
+        cpu_percent = memory_percent = None
+        snapshot = self.last_snapshot
+        if snapshot is not None:
+            row = int(snapshot.positions([pid])[0])
+            if row >= 0 and abs(snapshot.create_times[row] - create_time) < 1:
+                cpu_percent = float(snapshot.cpu_percent[row])
+                memory_percent = float(snapshot.memory_percent[row])
+                name = name or snapshot.names[row]
+        self.log.append(LifetimeEvent(
+            'exit', when, pid, ppid, name, create_time,
+            duration=max(0.0, when - (create_time if started is None else started)),
+            cpu_time=cpu_time if cpu_time is not None else last_cpu_time,
+            cpu_percent=cpu_percent, memory_percent=memory_percent, exit_code=exit_code,
+            scanned=cpu_percent is not None
+        ))
+
+    def observe(self, snapshot):
+        # Called with each process scan. With a background source this only
+        # keeps the scan for exit details; otherwise consecutive scans are
+        # diffed, with (pid, create_time) as identity so reuse counts as an
+        # exit plus a start.
+        previous, self.last_snapshot = self.last_snapshot, snapshot
+        if self.source is not None or previous is None:
+            return
+        rows = previous.positions(snapshot.pids)
+        same = rows >= 0
+        same[same] = abs(previous.create_times[rows[same]] - snapshot.create_times[same]) < 1
+        exited = np.ones(len(previous), dtype=bool)
+        exited[rows[same]] = False
+        now = snapshot.timestamp
+        for row in exited.nonzero()[0].tolist():
+            create_time = float(previous.create_times[row])
+            self.log.append(LifetimeEvent(
+                'exit', now, int(previous.pids[row]), None, previous.names[row], create_time,
+                duration=max(0.0, now - create_time), cpu_percent=float(previous.cpu_percent[row]),
+                memory_percent=float(previous.memory_percent[row])
+            ))
+        for row in (~same).nonzero()[0].tolist():
+            self.log.append(LifetimeEvent(
+                'start', now, int(snapshot.pids[row]), None, snapshot.names[row], float(snapshot.create_times[row])
+            ))
@@ -0,0 +1,382 @@
+import sys
+import json
+import zlib
+import time
+import socket
+import struct
+import asyncio
+import argparse
+import threading
+import subprocess
+import psutil
+import numpy as np
+from process_data import ProcessSnapshot, ProcessTreeIndex, SystemIOSampler, make_collector
+
+# Remote agent mode. An agent samples its host with the same collectors as
+# the UI and streams delta-encoded snapshots to any number of viewers:
+#
+#   python remote_agent.py --listen tcp://0.0.0.0:7400
+#   python remote_agent.py --listen unix:///tmp/process-agent.sock
+#   python system_stats_ui.py --connect tcp://host-a:7400 --connect tcp://host-b:7400
+#
+# Wire format: frames of a 4-byte big-endian length, a 1-byte flag (1 = zlib)
+# and a JSON body. After a 'hello', every frame is a 'delta' against what that
+# viewer already has: 'add' carries full rows, 'update' only the dynamic fields
+# of rows that changed, 'remove' the PIDs that exited. A viewer's first delta
+# is against an empty state, i.e. the full snapshot.
+
+PROTOCOL_VERSION = 1
+DEFAULT_PORT = 7400
+FRAME_HEADER = struct.Struct('>IB')
+COMPRESS_THRESHOLD = 1024
+MAX_FRAME = 64 * 1024 * 1024
+# CPU/memory samples each RemoteHost keeps for sparklines
+HOST_HISTORY = 60
+
+def parse_address(address):
+    # "unix:///path", "tcp://host:port", "host:port" or just "host"
+    if address.startswith('unix://'):
+        return 'unix', address[len('unix://'):]
+    if address.startswith('tcp://'):
+        address = address[len('tcp://'):]
+    host, _, port = address.rpartition(':')
+    if not host:
+        return 'tcp', (port, DEFAULT_PORT)
+    return 'tcp', (host.strip('[]'), int(port))
+
+def encode_frame(message):
+    body = json.dumps(message, separators=(',', ':')).encode()
+    flags = 0
+    if len(body) > COMPRESS_THRESHOLD:
+        body = zlib.compress(body, 1)
+        flags = 1
+    return FRAME_HEADER.pack(len(body), flags) + body
+
+async def read_frame(reader):
+    length, flags = FRAME_HEADER.unpack(await reader.readexactly(FRAME_HEADER.size))
+    if length > MAX_FRAME:
+        raise ValueError(f"frame too large: {length} bytes")
+    body = await reader.readexactly(length)
+    if flags & 1:
+        # MAX_FRAME also bounds what a frame may expand to
+        inflater = zlib.decompressobj()
+        body = inflater.decompress(body, MAX_FRAME)
+        if inflater.unconsumed_tail or not inflater.eof:
+            raise ValueError(f"frame truncated or expands to more than {MAX_FRAME} bytes")
+    return json.loads(body), FRAME_HEADER.size + length
+
+def snapshot_rows(snapshot, tree_index):
+    # pid -> (name, user, create_time, ppid, cpu, memory, status). CPU and
+    # memory are rounded so jitter below display precision isn't a change.
+    cpu = np.round(snapshot.cpu_percent, 1).tolist()
+    memory = np.round(snapshot.memory_percent, 2).tolist()
+    parent = tree_index.parent
+    return {
+        pid: (snapshot.names[i], snapshot.usernames[i], created, parent.get(pid, 0), cpu[i], memory[i], snapshot.statuses[i])
+        for i, (pid, created) in enumerate(zip(snapshot.pids.tolist(), snapshot.create_times.tolist()))
+    }
+
+def encode_delta(previous, current):
+    add, update = [], []
+    for pid, row in current.items():
+        old = previous.get(pid)
+        if old == row:
+            continue
+        if old is None or old[:3] != row[:3]:
+            # New process, or a reused PID
+            add.append([pid, *row])
+        else:
+            update.append([pid, *row[3:]])
+    remove = [pid for pid in previous if pid not in current]
+    return add, update, remove
+
+class AgentServer:
+    # Samples on its own schedule; each viewer gets the delta between what it
+    # last received and the latest sample. A slow viewer blocks only its own
+    # writer.drain(), and the samples it missed are coalesced into one delta.
+    def __init__(self, interval=1.0, fast=False):
+        self.interval = interval
+        self.collector = make_collector(fast)
+        self.tree_index = ProcessTreeIndex()
+        self.io_sampler = SystemIOSampler()
+        self.host = socket.gethostname()
+        self.rows = {}
+        self.system = {}
+        self.seq = 0
+        self.updated = None
+
+    def sample(self):
+        cpu_percent = psutil.cpu_percent()
+        mem = psutil.virtual_memory()
+        snapshot = self.collector.collect()
+        self.tree_index.update(snapshot)
+        system = {
+            'time': snapshot.timestamp,
+            'cpu_percent': cpu_percent,
+            'memory_percent': mem.percent,
+            'memory_used': mem.used,
+            'memory_total': mem.total,
+            **self.io_sampler.sample()
+        }
+        return snapshot_rows(snapshot, self.tree_index), system
+
+    async def sample_loop(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            started = time.monotonic()
+            rows, system = await loop.run_in_executor(None, self.sample)
+            async with self.updated:
+                self.rows, self.system = rows, system
+                self.seq += 1
+                self.updated.notify_all()
+            await asyncio.sleep(max(0.0, self.interval - (time.monotonic() - started)))
+
+    async def handle_viewer(self, reader, writer):
+        sent_rows, sent_seq = {}, 0
+        try:
+            writer.write(encode_frame({
+                'type': 'hello', 'version': PROTOCOL_VERSION, 'host': self.host, 'interval': self.interval
+            }))
+            await writer.drain()
+            while True:
+                async with self.updated:
+                    await self.updated.wait_for(lambda: self.seq > sent_seq)
+                    rows, system, seq = self.rows, self.system, self.seq
+                add, update, remove = encode_delta(sent_rows, rows)
+                writer.write(encode_frame({
+                    'type': 'delta', 'seq': seq, 'system': system,
+                    'add': add, 'update': update, 'remove': remove
+                }))
+                await writer.drain()
+                sent_rows, sent_seq = rows, seq
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, address):
+        self.updated = asyncio.Condition()
+        kind, target = parse_address(address)
+        if kind == 'unix':
+            server = await asyncio.start_unix_server(self.handle_viewer, path=target)
+        else:
+            server = await asyncio.start_server(self.handle_viewer, host=target[0], port=target[1])
+        async with server:
+            await asyncio.gather(server.serve_forever(), self.sample_loop())
+
+class RemoteHost:
+    # Viewer-side state of one agent, rebuilt from deltas. Deltas are applied
+    # on the client thread in O(changed rows); a ProcessSnapshot is only built
+    # when the UI asks for this host and something changed.
+    def __init__(self, address):
+        self.address = address
+        self.name = address
+        self.rows = {}
+        self.system = {}
+        self.seq = 0
+        self.connected = False
+        self.error = None
+        self.bytes_received = 0
+        self.frames_received = 0
+        self.lock = threading.Lock()
+        self.task = None
+        self._snapshot = None
+        # Ring buffer of (cpu, memory) per sample, see summary()
+        self.history = np.zeros((2, HOST_HISTORY))
+        self.samples = 0
+
+    @property
+    def label(self):
+        return self.name if self.name == self.address else f"{self.name} ({self.address})"
+
+    def apply(self, message, size):
+        with self.lock:
+            self.bytes_received += size
+            self.frames_received += 1
+            if message['type'] == 'hello':
+                self.name = message.get('host', self.address)
+                return False
+            for pid, *row in message['add']:
+                self.rows[pid] = row
+            for pid, ppid, cpu, memory, status in message['update']:
+                row = self.rows.get(pid)
+                if row is not None:
+                    row[3:] = [ppid, cpu, memory, status]
+            for pid in message['remove']:
+                self.rows.pop(pid, None)
+            self.system = message['system']
+            self.seq = message['seq']
+            self.history[:, self.samples % HOST_HISTORY] = (
+                self.system.get('cpu_percent', 0.0), self.system.get('memory_percent', 0.0)
+            )
+            self.samples += 1
+            self._snapshot = None
+            return True
+
+    def reset(self):
+        # A reconnect starts from a fresh full snapshot
+        with self.lock:
+            self.rows = {}
+            self._snapshot = None
+
+    def summary(self):
+        # CPU/memory history in time order plus the process count; much
+        # cheaper than snapshot() for views that don't list processes
+        with self.lock:
+            order = np.arange(max(0, self.samples - HOST_HISTORY), self.samples) % HOST_HISTORY
+            return self.history[:, order], len(self.rows)
+
+    def snapshot(self):
+        with self.lock:
+            if self._snapshot is None:
+                pids = list(self.rows)
+                rows = list(self.rows.values())
+                columns = list(zip(*rows)) if rows else [()] * 7
+                names, users, created, ppids, cpu, memory, statuses = columns
+                self._snapshot = ProcessSnapshot(
+                    pids, names, cpu, memory, statuses, users, created,
+                    timestamp=self.system.get('time'), ppids=ppids
+                )
+            return self._snapshot, dict(self.system)
+
+class FleetClient:
+    # One asyncio loop on a background thread with one connection task per
+    # agent. Each task reconnects with exponential backoff. Views poll
+    # take_changed() on their own schedule, so many deltas from one host
+    # between polls cost a single redraw. Each consumer gets its own set.
+    RECONNECT_MIN = 0.5
+    RECONNECT_MAX = 10.0
+
+    def __init__(self):
+        self.hosts = {}
+        self.changed = {}
+        self.lock = threading.Lock()
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, name="fleet-client", daemon=True)
+        self.thread.start()
+
+    def add_host(self, address):
+        if address in self.hosts:
+            return self.hosts[address]
+        host = RemoteHost(address)
+        self.hosts[address] = host
+        host.task = asyncio.run_coroutine_threadsafe(self.run_host(host), self.loop)
+        return host
+
+    def remove_host(self, address):
+        host = self.hosts.pop(address, None)
+        if host is not None and host.task is not None:
+            host.task.cancel()
+
+    def take_changed(self, consumer=None):
+        # Addresses that changed since this consumer last asked
+        with self.lock:
+            changed = self.changed.get(consumer, set(self.hosts))
+            self.changed[consumer] = set()
+        return changed
+
+    def mark_changed(self, host):
+        with self.lock:
+            for changed in self.changed.values():
+                changed.add(host.address)
+
+    async def run_host(self, host):
+        delay = self.RECONNECT_MIN
+        while True:
+            try:
+                kind, target = parse_address(host.address)
+                if kind == 'unix':
+                    reader, writer = await asyncio.open_unix_connection(target)
+                else:
+                    reader, writer = await asyncio.open_connection(*target)
+                host.connected, host.error = True, None
+                delay = self.RECONNECT_MIN
+                self.mark_changed(host)
+                try:
+                    while True:
+                        message, size = await read_frame(reader)
+                        if host.apply(message, size):
+                            self.mark_changed(host)
+                finally:
+                    writer.close()
+            except asyncio.CancelledError:
+                raise
+            except (OSError, ValueError, asyncio.IncompleteReadError, zlib.error,
+                    KeyError, TypeError, IndexError) as e:
+                # Connection lost, or a corrupt frame or malformed message
+                # (ValueError covers bad JSON): drop the host's state and
+                # reconnect for a fresh full snapshot
+                host.error = str(e) or type(e).__name__
+            host.connected = False
+            host.reset()
+            self.mark_changed(host)
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.RECONNECT_MAX)
+
+    def close(self):
+        for address in list(self.hosts):
+            self.remove_host(address)
+        self.loop.call_soon_threadsafe(self.loop.stop)
+
+def watch(addresses, duration):
+    # Headless viewer: prints per-host process counts and bandwidth
+    client = FleetClient()
+    for address in addresses:
+        client.add_host(address)
+    started = time.monotonic()
+    try:
+        while duration is None or time.monotonic() - started < duration:
+            time.sleep(1)
+            client.take_changed()
+            elapsed = time.monotonic() - started
+            for host in client.hosts.values():
+                snapshot, system = host.snapshot()
+                state = "up" if host.connected else f"down ({host.error})"
+                print(f"{host.label:<40} {state:<10} procs={len(snapshot):<6} "
+                      f"cpu={system.get('cpu_percent', 0):5.1f}% seq={host.seq:<6} "
+                      f"{host.bytes_received / elapsed / 1024:8.1f} KiB/s")
+            print()
+    finally:
+        client.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Process monitor agent")
+    parser.add_argument("--listen", default=f"tcp://127.0.0.1:{DEFAULT_PORT}",
+                        help="tcp://host:port or unix:///path")
+    parser.add_argument("--interval", type=float, default=1.0, help="seconds between samples")
+    parser.add_argument("--fast", action="store_true", help="use the /proc collector on Linux")
+    parser.add_argument("--spawn", type=int, metavar="N",
+                        help="start N local agents on consecutive ports from --listen's port")
+    parser.add_argument("--watch", nargs="+", metavar="ADDRESS", help="print what agents are sending")
+    parser.add_argument("--duration", type=float, help="stop --watch after this many seconds")
+    args = parser.parse_args()
+
+    if args.watch:
+        watch(args.watch, args.duration)
+        return
+
+    if args.spawn:
+        # Local fleet for testing: N agents on consecutive TCP ports
+        host, port = parse_address(args.listen)[1]
+        agents = []
+        for i in range(args.spawn):
+            command = [sys.executable, __file__, "--listen", f"tcp://{host}:{port + i}", "--interval", str(args.interval)]
+            if args.fast:
+                command.append("--fast")
+            agents.append(subprocess.Popen(command))
+            print(f"agent {i} listening on tcp://{host}:{port + i}")
+        try:
+            for agent in agents:
+                agent.wait()
+        except KeyboardInterrupt:
+            for agent in agents:
+                agent.terminate()
+        return
+
+    try:
+        asyncio.run(AgentServer(args.interval, args.fast).serve(args.listen))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == '__main__':
+    main()
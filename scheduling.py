@@ -0,0 +1,208 @@
+import random
+from PySide6.QtWidgets import (
+    QCheckBox, QHBoxLayout, QHeaderView, QLabel, QMainWindow, QPushButton, QSpinBox, QTableWidget,
+    QTableWidgetItem, QVBoxLayout, QWidget
+)
+import pyqtgraph as pg
+from scheduling_engine import Process, cycle_bursts, simulate
+
+def trace_processes(trace, ticks=100):
+    # Recorded lifetimes (see LifetimeLog.trace) as simulator processes.
+    # Times are scaled so the whole trace spans about `ticks` time units.
+    # CPU time is split into bursts with the rest of the lifetime as I/O
+    # between them; without a CPU time the lifetime is one CPU burst.
+    if not trace:
+        return [], 0
+    start = trace[0][2]
+    end = max(arrival + duration for _, _, arrival, duration, _ in trace)
+    unit = max(0.01, (end - start) / ticks)
+    processes = []
+    for pid, name, arrival, duration, cpu_time in trace:
+        cpu = (cpu_time if cpu_time else duration) / unit
+        io = max(0.0, duration - cpu_time) / unit if cpu_time else 0.0
+        cycles = 1 if io < 1 else min(4, 2 + int(io // max(cpu, 1)))
+        processes.append(Process(
+            pid=pid,
+            name=name,
+            burst_time=max(1, round(cpu)),
+            priority=random.randint(1, 5),
+            arrival_time=int((arrival - start) / unit),
+            bursts=cycle_bursts(cpu, io, cycles)
+        ))
+    return processes, unit
+
+class SchedulingWindow(QMainWindow):
+    # The process list can hold every process, only simulate the top rows
+    MAX_PROCESSES = 15
+    
+    def __init__(self, algorithm, parent=None):
+        super().__init__(parent)
+        self.algorithm = algorithm
+        self.processes = []
+        self.setup_ui()
+        self.load_processes()
+        
+    def setup_ui(self):
+        self.setWindowTitle(f"CPU Scheduling - {self.algorithm}")
+        self.setMinimumSize(800, 600)
+        
+        # Create main widget and layout
+        main_widget = QWidget()
+        self.setCentralWidget(main_widget)
+        layout = QVBoxLayout(main_widget)
+        
+        # Control panel
+        control_panel = QHBoxLayout()
+        
+        # Time Quantum input only for Round Robin
+        if self.algorithm == "Round Robin":
+            self.quantum_label = QLabel("Time Quantum:")
+            self.quantum_input = QSpinBox()
+            self.quantum_input.setRange(1, 10)
+            self.quantum_input.setValue(2)
+            control_panel.addWidget(self.quantum_label)
+            control_panel.addWidget(self.quantum_input)
+        
+        self.start_btn = QPushButton("Start Simulation")
+        self.reset_btn = QPushButton("Reset")
+        # Arrivals and bursts from real process lifetimes instead of the
+        # process list's CPU usage
+        self.trace_toggle = QCheckBox("Recorded lifetimes")
+        self.trace_toggle.setToolTip("Use the most recently exited processes as the workload")
+        self.trace_label = QLabel()
+        # Off runs every process as a single CPU burst of its total CPU time
+        self.io_toggle = QCheckBox("I/O waits")
+        self.io_toggle.setChecked(True)
+        self.io_toggle.setToolTip("Alternate CPU bursts with I/O bursts during which the process is blocked")
+        control_panel.addWidget(self.start_btn)
+        control_panel.addWidget(self.reset_btn)
+        control_panel.addWidget(self.trace_toggle)
+        control_panel.addWidget(self.io_toggle)
+        control_panel.addWidget(self.trace_label)
+        control_panel.addStretch()
+        
+        # Process table
+        self.process_table = QTableWidget()
+        self.process_table.setColumnCount(8)
+        self.process_table.setHorizontalHeaderLabels([
+            "PID", "Name", "Bursts (CPU/I-O)", "Priority", "Arrival Time", "Waiting Time", "Response Time",
+            "Turnaround Time"
+        ])
+        self.process_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        
+        # Gantt chart
+        self.gantt_chart = pg.PlotWidget(background=None)
+        self.gantt_chart.setMinimumHeight(200)
+        self.gantt_chart.showGrid(True, True, alpha=0.3)
+        
+        self.summary_label = QLabel()
+        
+        # Add all components to main layout
+        layout.addLayout(control_panel)
+        layout.addWidget(self.process_table)
+        layout.addWidget(self.summary_label)
+        layout.addWidget(self.gantt_chart)
+        
+        # Connect signals
+        self.start_btn.clicked.connect(self.start_simulation)
+        self.reset_btn.clicked.connect(self.reset_simulation)
+        self.trace_toggle.toggled.connect(self.reset_simulation)
+        
+    def load_processes(self):
+        # Get processes from parent window
+        parent = self.parent()
+        self.trace_label.setText("")
+        if self.trace_toggle.isChecked() and parent and hasattr(parent, 'lifetime'):
+            trace = parent.lifetime.log.trace(self.MAX_PROCESSES)
+            self.processes, unit = trace_processes(trace)
+            self.trace_label.setText(f"1 time unit = {unit * 1000:.0f} ms" if trace else "No exited processes recorded yet")
+        elif parent and hasattr(parent, 'process_model'):
+            model = parent.process_model
+            for row in range(min(model.rowCount(), self.MAX_PROCESSES)):
+                pid = int(model.index(row, 0).data())
+                name = model.index(row, 1).data()
+                cpu_percent = float(model.index(row, 2).data())
+                
+                # Convert CPU percentage to burst time (1-10)
+                burst_time = max(1, min(10, int(cpu_percent / 10)))
+                
+                # A process on the CPU x% of the time is blocked for the
+                # rest of each cycle (counted as at least 10% busy)
+                cycles = random.randint(1, 4)
+                share = min(max(cpu_percent, 10.0), 100.0) / 100
+                io_per_cycle = min(10.0, burst_time / cycles * (1 - share) / share)
+                
+                # Create process with random priority and arrival time
+                process = Process(
+                    pid=pid,
+                    name=name,
+                    burst_time=burst_time,
+                    priority=random.randint(1, 5),
+                    arrival_time=random.randint(0, 5),
+                    bursts=cycle_bursts(burst_time, io_per_cycle * (cycles - 1), cycles)
+                )
+                self.processes.append(process)
+        
+        self.update_table()
+        
+    def update_table(self):
+        self.process_table.setRowCount(len(self.processes))
+        for i, proc in enumerate(self.processes):
+            bursts = "/".join(str(burst) for burst in proc.bursts) if self.io_toggle.isChecked() else str(proc.burst_time)
+            self.process_table.setItem(i, 0, QTableWidgetItem(str(proc.pid)))
+            self.process_table.setItem(i, 1, QTableWidgetItem(proc.name))
+            self.process_table.setItem(i, 2, QTableWidgetItem(bursts))
+            self.process_table.setItem(i, 3, QTableWidgetItem(str(proc.priority)))
+            self.process_table.setItem(i, 4, QTableWidgetItem(str(proc.arrival_time)))
+            self.process_table.setItem(i, 5, QTableWidgetItem(f"{proc.waiting_time:.2f}"))
+            self.process_table.setItem(i, 6, QTableWidgetItem(f"{proc.response_time:.2f}"))
+            self.process_table.setItem(i, 7, QTableWidgetItem(f"{proc.turnaround_time:.2f}"))
+            
+    def start_simulation(self):
+        # Get time quantum for Round Robin
+        quantum = self.quantum_input.value() if self.algorithm == "Round Robin" else 0
+        result = simulate(self.processes, self.algorithm, quantum, with_io=self.io_toggle.isChecked())
+        self.summary_label.setText(
+            f"CPU utilization {result.utilization * 100:.1f}%  ·  "
+            f"avg response {result.average_response:.2f}  ·  avg waiting {result.average_waiting:.2f}  ·  "
+            f"avg turnaround {result.average_turnaround:.2f}  ·  "
+            f"throughput {result.throughput:.3f}/unit  ·  {result.context_switches} dispatches"
+        )
+        self.draw_gantt(result)
+        self.update_table()
+        
+    def reset_simulation(self):
+        self.processes = []
+        self.load_processes()
+        self.gantt_chart.clear()
+        self.summary_label.setText("")
+        self.update_table()
+        
+    def draw_gantt(self, result):
+        # One lane per process, first process on top: CPU slices in the
+        # process's color, I/O waits as thin gray bars. Each kind is a single
+        # bar item however many slices there are.
+        self.gantt_chart.clear()
+        count = len(self.processes)
+        if not count:
+            return
+        colors = [pg.intColor(i, hues=max(count, 2)) for i in range(count)]
+        for segments, height, brush in ((result.cpu_segments, 0.8, None), (result.io_segments, 0.3, (128, 128, 128))):
+            if not segments:
+                continue
+            lanes = [count - 1 - i for i, _, _ in segments]
+            self.gantt_chart.addItem(pg.BarGraphItem(
+                x0=[start for _, start, _ in segments],
+                width=[end - start for _, start, end in segments],
+                y0=[lane + (0.8 - height) / 2 for lane in lanes],
+                height=height,
+                brushes=[colors[i] for i, _, _ in segments] if brush is None else None,
+                brush=brush,
+                pen=None
+            ))
+        self.gantt_chart.getAxis('left').setTicks([
+            [(count - 1 - i + 0.4, f"P{proc.pid}") for i, proc in enumerate(self.processes)]
+        ])
+        start = min(proc.arrival_time for proc in self.processes)
+        self.gantt_chart.setXRange(start, max(proc.end_time for proc in self.processes))
+        self.gantt_chart.setYRange(-0.2, count)
@@ -0,0 +1,160 @@
+import heapq
+from collections import deque
+
+# Discrete-event engine behind the scheduling simulator. Each process is a
+# sequence of alternating CPU and I/O bursts. A heap of timed events
+# (arrivals, I/O completions, the end of the running slice) drives it; the
+# single CPU takes processes from the ready queue, a process that starts an
+# I/O burst is blocked until its completion event, and I/O devices are
+# assumed to serve every blocked process at once. Per-process state is kept
+# in plain lists indexed by position so a run over millions of events stays
+# in the seconds. Qt-free.
+
+ARRIVAL, IO_DONE, CPU_DONE = 0, 1, 2
+ALGORITHMS = ("FCFS", "Round Robin", "Priority", "SJF")
+
+class Process:
+    def __init__(self, pid, name, burst_time, priority=0, arrival_time=0, bursts=None):
+        self.pid = pid
+        self.name = name
+        # CPU, I/O, CPU, ... ending with a CPU burst; without bursts the
+        # process is a single CPU burst of burst_time
+        self.bursts = [burst_time] if bursts is None else list(bursts)
+        self.burst_time = sum(self.bursts[::2])
+        self.io_time = sum(self.bursts[1::2])
+        self.remaining_time = self.burst_time
+        self.priority = priority
+        self.arrival_time = arrival_time
+        self.waiting_time = 0
+        self.response_time = 0
+        self.turnaround_time = 0
+        self.completed = False
+        self.start_time = -1
+        self.end_time = -1
+
+def cycle_bursts(cpu, io, cycles):
+    # `cpu` and `io` time units spread over `cycles` CPU bursts with an I/O
+    # burst between each pair, every burst at least one unit long
+    if cycles <= 1 or io < 1:
+        return [max(1, round(cpu))]
+    bursts = []
+    for i in range(cycles):
+        if i:
+            bursts.append(max(1, round(io / (cycles - 1))))
+        bursts.append(max(1, round(cpu / cycles)))
+    return bursts
+
+class SimulationResult:
+    # Totals of one run. Segments are (process index, start, end) and only
+    # recorded when asked for, e.g. for a Gantt chart.
+    def __init__(self, processes, makespan, busy, events, context_switches, cpu_segments, io_segments):
+        count = len(processes) or 1
+        self.makespan = makespan
+        self.busy = busy
+        self.utilization = busy / makespan if makespan else 0.0
+        self.throughput = len(processes) / makespan if makespan else 0.0
+        self.events = events
+        self.context_switches = context_switches
+        self.cpu_segments = cpu_segments
+        self.io_segments = io_segments
+        self.average_waiting = sum(p.waiting_time for p in processes) / count
+        self.average_response = sum(p.response_time for p in processes) / count
+        self.average_turnaround = sum(p.turnaround_time for p in processes) / count
+
+def simulate(processes, algorithm, quantum=2, with_io=True, record=True):
+    # Runs `processes` under FCFS, Round Robin (preempted every `quantum`),
+    # non-preemptive Priority (higher number first) or SJF (shortest next
+    # CPU burst first) and fills in each process's waiting, response and
+    # turnaround times. Without with_io every process is one CPU burst of
+    # its total CPU time.
+    if algorithm not in ALGORITHMS:
+        raise ValueError(f"unknown algorithm: {algorithm}")
+    count = len(processes)
+    bursts = [p.bursts if with_io else [p.burst_time] for p in processes]
+    arrival = [p.arrival_time for p in processes]
+    priority = [p.priority for p in processes]
+    phase = [0] * count
+    left = [b[0] for b in bursts]
+    ready_since = [0] * count
+    waiting = [0] * count
+    first_run = [-1] * count
+    end = [0] * count
+    last_phase = [len(b) - 1 for b in bursts]
+    slice_limit = quantum if algorithm == "Round Robin" else None
+
+    # Ready queue: FIFO, or a heap on (key, sequence) for the key-ordered
+    # algorithms so ties go to whoever became ready first. SJF's key is the
+    # next CPU burst, i.e. `left` itself.
+    keyed = algorithm in ("SJF", "Priority")
+    key = left if algorithm == "SJF" else [-p for p in priority]
+    ready = [] if keyed else deque()
+    append, popleft = (None, None) if keyed else (ready.append, ready.popleft)
+
+    # Events at the same time are handled in the order they were scheduled
+    events = [(arrival[i], i, ARRIVAL, i) for i in range(count)]
+    heapq.heapify(events)
+    seq = count
+    push, pop = heapq.heappush, heapq.heappop
+    cpu_segments, io_segments = [], []
+    running = last = -1
+    slice_start = busy = handled = switches = 0
+    now = 0
+    while events:
+        now, _, kind, i = pop(events)
+        handled += 1
+        if kind == CPU_DONE:
+            ran = now - slice_start
+            busy += ran
+            left[i] -= ran
+            running = -1
+            if record:
+                cpu_segments.append((i, slice_start, now))
+            if left[i] > 0:
+                # Quantum used up (Round Robin only), back to the end of
+                # the ready queue
+                ready_since[i] = now
+                append(i)
+            elif phase[i] == last_phase[i]:
+                end[i] = now
+            else:
+                # Blocked until the I/O burst completes
+                k = phase[i] + 1
+                io = bursts[i][k]
+                push(events, (now + io, seq, IO_DONE, i))
+                seq += 1
+                phase[i] = k + 1
+                left[i] = bursts[i][k + 1]
+                if record:
+                    io_segments.append((i, now, now + io))
+        else:
+            ready_since[i] = now
+            if keyed:
+                push(ready, (key[i], seq, i))
+                seq += 1
+            else:
+                append(i)
+
+        # Dispatch once everything happening at this instant is queued
+        if running < 0 and ready and (not events or events[0][0] > now):
+            i = pop(ready)[2] if keyed else popleft()
+            waiting[i] += now - ready_since[i]
+            if first_run[i] < 0:
+                first_run[i] = now
+            run = left[i] if slice_limit is None else min(slice_limit, left[i])
+            push(events, (now + run, seq, CPU_DONE, i))
+            seq += 1
+            running, slice_start = i, now
+            if i != last:
+                switches += 1
+                last = i
+
+    for i, p in enumerate(processes):
+        p.remaining_time = 0
+        p.completed = True
+        p.start_time = first_run[i]
+        p.end_time = end[i]
+        p.waiting_time = waiting[i]
+        p.response_time = first_run[i] - arrival[i]
+        p.turnaround_time = end[i] - arrival[i]
+    makespan = max(end) - min(arrival) if count else 0
+    return SimulationResult(processes, makespan, busy, handled, switches, cpu_segments, io_segments)
@@ -0,0 +1,336 @@
+import os
+import sys
+import tempfile
+import numpy as np
+from multiprocessing import shared_memory, resource_tracker
+from process_data import ProcessSnapshot, collector_name, make_collector
+
+try:
+    import fcntl
+except ImportError:
+    # Sharing needs POSIX shared memory and file locks
+    fcntl = None
+
+# Local snapshot bus. When several monitors run on one host (several users'
+# windows, or one user's), only one of them scans processes: it publishes
+# every snapshot into a shared memory segment and the others map it and read
+# the columns from there. Scan cost stays that of a single monitor however
+# many are open.
+#
+# The publisher is whoever holds an exclusive lock on a lock file, so a
+# crashed or closed publisher is replaced by the next viewer to tick. The
+# segment holds two buffers, each guarded by a sequence counter (a seqlock):
+# the publisher writes the buffer readers aren't directed to, bumping its
+# counter to odd before and to even after, then points readers at it. A
+# reader that sees the counter odd or changed while it was reading retries.
+
+MAGIC = b'PMBUS\0\0\1'
+HEADER = np.dtype([
+    ('magic', 'S8'), ('capacity', '<u8'), ('text_capacity', '<u8'), ('closed', '<u8'),
+    ('current', '<u8'), ('generation', '<u8')
+])
+BUFFER_HEADER = np.dtype([('seq', '<u8'), ('rows', '<u8'), ('text_size', '<u8'), ('timestamp', '<f8')])
+# Numeric columns of a buffer, in layout order
+COLUMNS = [('pids', np.int64), ('cpu_percent', np.float64), ('memory_percent', np.float64),
+           ('create_times', np.float64)]
+MIN_CAPACITY = 16384
+TEXT_PER_ROW = 64
+READ_RETRIES = 8
+
+def default_name():
+    # One bus per user: a viewer only ever sees what its own scans could
+    uid = os.getuid() if hasattr(os, 'getuid') else 0
+    return f"process-monitor-{uid}"
+
+def open_segment(name, create=False, size=0):
+    # Before Python 3.13 every process that opens a segment also registers it
+    # with its resource tracker, which unlinks it when that process exits
+    # even though other monitors still use it. Unlinking is done here.
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name, create=create, size=size, track=False)
+    segment = shared_memory.SharedMemory(name, create=create, size=size)
+    resource_tracker.unregister(segment._name, 'shared_memory')
+    return segment
+
+def unlink_segment(segment):
+    if sys.version_info < (3, 13):
+        # unlink() unregisters it again, see open_segment
+        resource_tracker.register(segment._name, 'shared_memory')
+    segment.unlink()
+
+class SnapshotSegment:
+    # Typed views over one segment: the header, and per buffer its header,
+    # numeric columns and text (names, users and statuses, NUL-separated).
+    # Readers' views are read-only.
+    def __init__(self, segment, writable=True):
+        self.segment = segment
+        buf = segment.buf
+        self.header = np.ndarray((), HEADER, buffer=buf)
+        if self.header['magic'] != MAGIC:
+            raise ValueError(f"{segment.name} is not a snapshot bus")
+        capacity = int(self.header['capacity'])
+        text_capacity = int(self.header['text_capacity'])
+        self.capacity, self.text_capacity = capacity, text_capacity
+        offset = HEADER.itemsize
+        self.buffers = []
+        for _ in range(2):
+            views = {'header': np.ndarray((), BUFFER_HEADER, buffer=buf, offset=offset)}
+            offset += BUFFER_HEADER.itemsize
+            for column, dtype in COLUMNS:
+                views[column] = np.ndarray(capacity, dtype, buffer=buf, offset=offset)
+                offset += capacity * np.dtype(dtype).itemsize
+            views['text'] = np.ndarray(text_capacity, np.uint8, buffer=buf, offset=offset)
+            offset += text_capacity
+            if not writable:
+                for view in views.values():
+                    view.flags.writeable = False
+            self.buffers.append(views)
+
+    @staticmethod
+    def size(capacity, text_capacity):
+        row = sum(np.dtype(dtype).itemsize for _, dtype in COLUMNS)
+        return HEADER.itemsize + 2 * (BUFFER_HEADER.itemsize + capacity * row + text_capacity)
+
+    @classmethod
+    def create(cls, name, capacity, text_capacity):
+        segment = open_segment(name, create=True, size=cls.size(capacity, text_capacity))
+        header = np.ndarray((), HEADER, buffer=segment.buf)
+        header['capacity'] = capacity
+        header['text_capacity'] = text_capacity
+        header['magic'] = MAGIC
+        return cls(segment)
+
+    @classmethod
+    def attach(cls, name, writable=True):
+        return cls(open_segment(name), writable)
+
+    def close(self):
+        # Views must go before the mapping can be closed; if a caller still
+        # holds some, the mapping is released along with them
+        self.header = None
+        self.buffers = []
+        try:
+            self.segment.close()
+        except BufferError:
+            pass
+
+class SnapshotPublisher:
+    # Writes snapshots into the segment, creating it or growing it (as a new
+    # segment under the same name) when a snapshot doesn't fit
+    def __init__(self, name):
+        self.name = name
+        self.bus = None
+        try:
+            self.bus = SnapshotSegment.attach(name)
+        except (FileNotFoundError, ValueError):
+            pass
+
+    def publish(self, snapshot):
+        text = "\0".join(snapshot.names + snapshot.usernames + snapshot.statuses)
+        text = np.frombuffer(text.encode('utf-8', 'surrogateescape'), dtype=np.uint8)
+        rows = len(snapshot)
+        bus = self.bus
+        if bus is None or bus.header['closed'] or rows > bus.capacity or len(text) > bus.text_capacity:
+            bus = self.recreate(rows, len(text))
+
+        header = bus.header
+        index = 1 - int(header['current'])
+        buffer = bus.buffers[index]
+        buffer_header = buffer['header']
+        buffer_header['seq'] += 1
+        for column, _ in COLUMNS:
+            buffer[column][:rows] = getattr(snapshot, column)
+        buffer['text'][:len(text)] = text
+        buffer_header['rows'] = rows
+        buffer_header['text_size'] = len(text)
+        buffer_header['timestamp'] = snapshot.timestamp
+        buffer_header['seq'] += 1
+        header['current'] = index
+        header['generation'] += 1
+
+    def recreate(self, rows, text_size):
+        # Readers of the old segment see it closed and attach to the new one
+        capacity = max(MIN_CAPACITY, 2 * rows)
+        text_capacity = max(capacity * TEXT_PER_ROW, 2 * text_size)
+        if self.bus is not None:
+            self.bus.header['closed'] = 1
+            self.bus.close()
+            self.bus = None
+        try:
+            stale = open_segment(self.name)
+            unlink_segment(stale)
+            stale.close()
+        except FileNotFoundError:
+            pass
+        self.bus = SnapshotSegment.create(self.name, capacity, text_capacity)
+        return self.bus
+
+    def close(self, unlink=False):
+        if self.bus is None:
+            return
+        if unlink:
+            self.bus.header['closed'] = 1
+            unlink_segment(self.bus.segment)
+        self.bus.close()
+        self.bus = None
+
+class SnapshotReader:
+    # Read-only side. read() copies the columns out (a memcpy each) so the
+    # snapshot stays valid after the publisher reuses the buffer; view()
+    # returns zero-copy NumPy views that are only good until valid() says
+    # otherwise, for callers that use them right away.
+    def __init__(self, name):
+        self.name = name
+        self.bus = None
+        self.generation = None
+        self.snapshot = None
+        self.text = None
+        self.strings = None
+
+    def attach(self):
+        if self.bus is not None and self.bus.header['closed']:
+            self.detach()
+        if self.bus is None:
+            try:
+                self.bus = SnapshotSegment.attach(self.name, writable=False)
+            except (FileNotFoundError, ValueError):
+                return False
+            self.generation = None
+        return True
+
+    def detach(self):
+        if self.bus is not None:
+            self.bus.close()
+            self.bus = None
+
+    def view(self):
+        # (token, rows, {column: view}, text view) of the latest complete
+        # snapshot, or None
+        if not self.attach():
+            return None
+        header = self.bus.header
+        for _ in range(READ_RETRIES):
+            index = int(header['current'])
+            buffer = self.bus.buffers[index]
+            seq = int(buffer['header']['seq'])
+            if seq & 1 or not seq:
+                continue
+            rows = int(buffer['header']['rows'])
+            columns = {column: buffer[column][:rows] for column, _ in COLUMNS}
+            text = buffer['text'][:int(buffer['header']['text_size'])]
+            token = (index, seq)
+            if self.valid(token):
+                return token, rows, columns, text
+        return None
+
+    def valid(self, token):
+        index, seq = token
+        return self.bus is not None and int(self.bus.buffers[index]['header']['seq']) == seq
+
+    def read(self):
+        # Latest snapshot, the same object again until a new one is published
+        if not self.attach():
+            return None
+        generation = int(self.bus.header['generation'])
+        if generation == self.generation:
+            return self.snapshot
+        for _ in range(READ_RETRIES):
+            found = self.view()
+            if found is None:
+                return self.snapshot
+            token, rows, columns, text = found
+            timestamp = float(self.bus.buffers[token[0]]['header']['timestamp'])
+            columns = {column: values.copy() for column, values in columns.items()}
+            text = text.tobytes()
+            if self.valid(token):
+                break
+        else:
+            return self.snapshot
+
+        # Names rarely change between scans, reuse the split strings then
+        if text != self.text:
+            strings = text.decode('utf-8', 'surrogateescape').split("\0") if rows else []
+            self.text, self.strings = text, (strings[:rows], strings[rows:2 * rows], strings[2 * rows:])
+        names, users, statuses = self.strings
+        self.generation = generation
+        self.snapshot = ProcessSnapshot(columns['pids'], names, columns['cpu_percent'], columns['memory_percent'],
+                                        statuses, users, columns['create_times'], timestamp=timestamp)
+        return self.snapshot
+
+class SharedCollector:
+    # Collector for the UI: scans and publishes while it holds the
+    # publisher lock, otherwise returns what the publisher last wrote. Every
+    # tick a viewer tries the lock, so it takes over as soon as the
+    # publisher exits, crashes or steps down with release().
+    def __init__(self, fast=False, name=None):
+        self.name = self.collector_name(fast)
+        self.segment_name = name or default_name()
+        self.lock_path = os.path.join(tempfile.gettempdir(), self.segment_name + ".lock")
+        self.lock = None
+        # Only scans while publishing; kept across hand-offs so CPU % has a
+        # previous scan to diff against
+        self.collector = make_collector(fast)
+        self.publisher = None
+        self.reader = SnapshotReader(self.segment_name)
+        self.empty = ProcessSnapshot([], [], [], [], [], [], [])
+
+    @staticmethod
+    def available():
+        return fcntl is not None
+
+    @staticmethod
+    def collector_name(fast=False):
+        return 'shared-' + collector_name(fast)
+
+    @property
+    def publishing(self):
+        return self.lock is not None
+
+    def collect(self):
+        if self.lock is None:
+            self.acquire()
+        if self.lock is not None:
+            snapshot = self.collector.collect()
+            self.publisher.publish(snapshot)
+            return snapshot
+        snapshot = self.reader.read()
+        return self.empty if snapshot is None else snapshot
+
+    def export_static(self):
+        return self.collector.export_static()
+
+    def import_static(self, saved):
+        self.collector.import_static(saved)
+
+    def acquire(self):
+        try:
+            fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o600)
+        except OSError:
+            return
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            return
+        self.lock = fd
+        self.reader.detach()
+        self.publisher = SnapshotPublisher(self.segment_name)
+
+    def release(self):
+        # Step down but leave the segment, the next publisher reuses it
+        if self.lock is None:
+            return
+        self.publisher.close()
+        self.publisher = None
+        os.close(self.lock)
+        self.lock = None
+
+    def close(self):
+        # Last one out removes the segment; a viewer still running
+        # recreates it when it takes over
+        if self.lock is not None:
+            self.publisher.close(unlink=True)
+            self.publisher = None
+            os.close(self.lock)
+            self.lock = None
+        self.reader.detach()
@@ -1,14 +1,50 @@
 import sys
 import psutil
 import datetime
-from PySide6.QtWidgets import *
-from PySide6.QtCore import *
-from PySide6.QtGui import *
-import pyqtgraph as pg
+# Explicit imports: a star import forces PySide6 to materialize every class
+# in each module, which costs more than loading the modules themselves
+from PySide6.QtWidgets import (
+    QAbstractItemView, QApplication, QCheckBox, QComboBox, QDialog, QDialogButtonBox,
+    QDoubleSpinBox, QFileDialog, QFormLayout, QFrame, QGridLayout, QGroupBox, QHBoxLayout,
+    QHeaderView, QInputDialog, QLabel, QLineEdit, QListWidget, QListWidgetItem, QMainWindow,
+    QMenu, QProgressBar, QPushButton, QSpinBox, QStackedWidget, QTableView, QTableWidget,
+    QTableWidgetItem, QTreeWidget, QTreeWidgetItem, QVBoxLayout, QWidget
+)
+from PySide6.QtCore import (
+    QAbstractTableModel, QEvent, QItemSelection, QItemSelectionModel, QModelIndex, QObject,
+    QRunnable, QThreadPool, QTimer, Qt, Signal
+)
+from PySide6.QtGui import QColor, QFontDatabase, QKeySequence, QShortcut
 import numpy as np
 from datetime import datetime
 import platform
-import random
+import os
+import re
+import time
+from process_data import (
+    ProcessSnapshot, ProcessFilter, ProcessTreeIndex, ProcfsCollector, ProcessIOSampler, SystemIOSampler,
+    MemoryDetailSampler, CgroupSampler, cgroup_label, format_bytes, collector_name, make_collector
+)
+from instrumentation import StageTimings, ProfileCapture
+from metrics_export import MetricHistory, MetricsExporter, export_history
+from process_lifetime import LifetimeTracker
+from anomaly import AnomalyDetector
+from snapshot_bus import SharedCollector
+from warm_state import load_settings, save_settings, load_state, save_state
+import tempfile
+import argparse
+from functools import lru_cache
+
+# pyqtgraph is by far the most expensive import; it is loaded after the
+# window is on screen, see SystemMonitor.setup_graphs
+pg = None
+
+def load_pyqtgraph():
+    global pg
+    if pg is None:
+        import pyqtgraph
+        pg = pyqtgraph
+    return pg
 
 class ThemeColors:
     DARK = {
@@ -21,6 +57,8 @@ class ThemeColors:
         'progress_critical': '#FF4C4C',
         'graph_cpu': '#00BFFF',
         'graph_memory': '#FFD700',
+        'graph_disk': '#FF7F50',
+        'graph_network': '#7CFC00',
         'button_refresh': '#4CAF50',
         'button_kill': '#FF4C4C',
         'button_settings': '#8A2BE2'
@@ -36,6 +74,8 @@ class ThemeColors:
         'progress_critical': '#FF4500',  # Orange Red for error
         'graph_cpu': '#1E90FF',  # Dodger Blue
         'graph_memory': '#32CD32',  # Lime Green
+        'graph_disk': '#FF8C00',  # Dark Orange
+        'graph_network': '#8A2BE2',  # Blue Violet
         'button_refresh': '#1E90FF',  # Dodger Blue
         'button_kill': '#FF4500',  # Orange Red
         'button_settings': '#FF8C00'  # Dark Orange
@@ -51,6 +91,8 @@ class ThemeColors:
         'progress_critical': '#FF3131',
         'graph_cpu': '#FF007F',
         'graph_memory': '#00FFFF',
+        'graph_disk': '#FFBF00',
+        'graph_network': '#39FF14',
         'button_refresh': '#00FFFF',
         'button_kill': '#FF3131',
         'button_settings': '#8A2BE2'
@@ -89,7 +131,11 @@ class AlertPanel(QFrame):
         
     def add_alert(self, message, level="warning"):
         timestamp = datetime.now().strftime("%H:%M:%S")
-        item = QListWidgetItem(f"[{timestamp}] {message}")
+        self.insert_alert(f"[{timestamp}] {message}", level)
+        
+    def insert_alert(self, text, level):
+        item = QListWidgetItem(text)
+        item.setData(Qt.UserRole, level)
         if level == "critical":
             item.setForeground(QColor("#FF4C4C"))
         elif level == "warning":
@@ -98,6 +144,15 @@ class AlertPanel(QFrame):
         if self.alerts_list.count() > 100:
             self.alerts_list.takeItem(self.alerts_list.count() - 1)
             
+    def saved_alerts(self):
+        # [(text, level)], newest first
+        items = (self.alerts_list.item(i) for i in range(self.alerts_list.count()))
+        return [(item.text(), item.data(Qt.UserRole)) for item in items]
+        
+    def restore_alerts(self, alerts):
+        for text, level in reversed(alerts):
+            self.insert_alert(text, level)
+            
     def apply_theme(self, colors):
         self.setStyleSheet(f"""
             QFrame {{
@@ -120,459 +175,437 @@ class AlertPanel(QFrame):
             }}
         """)
 
-class Process:
-    def __init__(self, pid, name, burst_time, priority=0, arrival_time=0):
-        self.pid = pid
-        self.name = name
-        self.burst_time = burst_time
-        self.remaining_time = burst_time
-        self.priority = priority
-        self.arrival_time = arrival_time
-        self.waiting_time = 0
-        self.turnaround_time = 0
-        self.completed = False
-        self.start_time = -1
-        self.end_time = -1
+class BulkActionResult:
+    def __init__(self, action):
+        self.action = action
+        self.succeeded = []
+        self.escalated = []
+        self.not_found = []
+        self.access_denied = []
+        self.failed = []
+
+    def merge(self, other):
+        self.succeeded.extend(other.succeeded)
+        self.escalated.extend(other.escalated)
+        self.not_found.extend(other.not_found)
+        self.access_denied.extend(other.access_denied)
+        self.failed.extend(other.failed)
+
+    def has_errors(self):
+        return bool(self.access_denied or self.failed)
+
+    def summary(self):
+        label = ProcessActionTask.ACTION_LABELS[self.action]
+        parts = [f"{len(self.succeeded)} ok"]
+        if self.escalated:
+            parts.append(f"{len(self.escalated)} escalated to SIGKILL")
+        if self.not_found:
+            parts.append(f"{len(self.not_found)} not found")
+        if self.access_denied:
+            parts.append(f"{len(self.access_denied)} access denied")
+        if self.failed:
+            parts.append(f"{len(self.failed)} failed")
+        return f"{label}: " + ", ".join(parts)
+
+class ProcessActionSignals(QObject):
+    finished = Signal(object)
+
+class ProcessActionTask(QRunnable):
+    ACTION_LABELS = {
+        'terminate': "Terminate",
+        'kill': "Kill",
+        'kill_tree': "Kill process tree",
+        'suspend': "Suspend",
+        'resume': "Resume",
+        'renice': "Renice",
+        'affinity': "Set CPU affinity"
+    }
+    # Seconds to wait for SIGTERM before escalating, and for SIGKILL to land
+    TERMINATE_TIMEOUT = 3
+    KILL_TIMEOUT = 2
+
+    def __init__(self, action, pids, argument=None):
+        super().__init__()
+        self.action = action
+        self.pids = pids
+        self.argument = argument
+        self.signals = ProcessActionSignals()
+
+    def run(self):
+        result = BulkActionResult(self.action)
+        procs = []
+        for pid in self.pids:
+            try:
+                procs.append(psutil.Process(pid))
+            except psutil.NoSuchProcess:
+                result.not_found.append(pid)
+            except psutil.AccessDenied:
+                result.access_denied.append(pid)
+
+        if self.action == 'kill_tree':
+            procs = self.expand_trees(procs)
+
+        if self.action in ('terminate', 'kill', 'kill_tree'):
+            self.signal_and_wait(procs, result)
+        else:
+            for proc in procs:
+                try:
+                    if self.action == 'suspend':
+                        proc.suspend()
+                    elif self.action == 'resume':
+                        proc.resume()
+                    elif self.action == 'renice':
+                        proc.nice(self.argument)
+                    elif self.action == 'affinity':
+                        proc.cpu_affinity(self.argument)
+                    result.succeeded.append(proc.pid)
+                except psutil.NoSuchProcess:
+                    result.not_found.append(proc.pid)
+                except psutil.AccessDenied:
+                    result.access_denied.append(proc.pid)
+                except (AttributeError, ValueError, OSError):
+                    # cpu_affinity is not available everywhere and bad
+                    # nice/affinity values are rejected by the kernel
+                    result.failed.append(proc.pid)
 
-class SchedulingWindow(QMainWindow):
-    def __init__(self, algorithm, parent=None):
+        self.signals.finished.emit(result)
+
+    def expand_trees(self, roots):
+        # Children first so the parent can't respawn them before it dies
+        procs = {}
+        for root in roots:
+            try:
+                for child in root.children(recursive=True):
+                    procs.setdefault(child.pid, child)
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                pass
+            procs.setdefault(root.pid, root)
+        # The selection is already filtered, but the monitor can still be a
+        # descendant, e.g. of the shell or terminal it was started from
+        procs.pop(os.getpid(), None)
+        return list(procs.values())
+
+    def signal_and_wait(self, procs, result):
+        signalled = []
+        for proc in procs:
+            try:
+                if self.action == 'kill':
+                    proc.kill()
+                else:
+                    proc.terminate()
+                signalled.append(proc)
+            except psutil.NoSuchProcess:
+                result.not_found.append(proc.pid)
+            except psutil.AccessDenied:
+                result.access_denied.append(proc.pid)
+
+        timeout = self.KILL_TIMEOUT if self.action == 'kill' else self.TERMINATE_TIMEOUT
+        gone, alive = psutil.wait_procs(signalled, timeout=timeout)
+        result.succeeded.extend(proc.pid for proc in gone)
+
+        if alive and self.action != 'kill':
+            # Escalate from SIGTERM to SIGKILL for whatever ignored the request
+            escalated = []
+            for proc in alive:
+                try:
+                    proc.kill()
+                    escalated.append(proc)
+                except psutil.NoSuchProcess:
+                    result.succeeded.append(proc.pid)
+                except psutil.AccessDenied:
+                    result.access_denied.append(proc.pid)
+            gone, alive = psutil.wait_procs(escalated, timeout=self.KILL_TIMEOUT)
+            result.succeeded.extend(proc.pid for proc in gone)
+            result.escalated.extend(proc.pid for proc in gone)
+
+        result.failed.extend(proc.pid for proc in alive)
+
+class BulkActionJob(QObject):
+    completed = Signal(object)
+
+    # PIDs per pool task, so hundreds of targets are signalled in parallel
+    CHUNK_SIZE = 32
+
+    def __init__(self, action, pids, argument=None, parent=None):
         super().__init__(parent)
-        self.algorithm = algorithm
-        self.processes = []
-        self.setup_ui()
-        self.load_processes()
-        
-    def setup_ui(self):
-        self.setWindowTitle(f"CPU Scheduling - {self.algorithm}")
-        self.setMinimumSize(800, 600)
-        
-        # Create main widget and layout
-        main_widget = QWidget()
-        self.setCentralWidget(main_widget)
-        layout = QVBoxLayout(main_widget)
-        
-        # Control panel
-        control_panel = QHBoxLayout()
-        
-        # Time Quantum input only for Round Robin
-        if self.algorithm == "Round Robin":
-            self.quantum_label = QLabel("Time Quantum:")
-            self.quantum_input = QSpinBox()
-            self.quantum_input.setRange(1, 10)
-            self.quantum_input.setValue(2)
-            control_panel.addWidget(self.quantum_label)
-            control_panel.addWidget(self.quantum_input)
-        
-        self.start_btn = QPushButton("Start Simulation")
-        self.reset_btn = QPushButton("Reset")
-        control_panel.addWidget(self.start_btn)
-        control_panel.addWidget(self.reset_btn)
-        control_panel.addStretch()
-        
-        # Process table
-        self.process_table = QTableWidget()
-        self.process_table.setColumnCount(7)
-        self.process_table.setHorizontalHeaderLabels([
-            "PID", "Name", "Burst Time", "Priority", "Arrival Time", "Waiting Time", "Turnaround Time"
-        ])
-        self.process_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
-        
-        # Gantt chart
-        self.gantt_chart = pg.PlotWidget(background=None)
-        self.gantt_chart.setMinimumHeight(100)
-        self.gantt_chart.showGrid(True, True, alpha=0.3)
-        
-        # Add all components to main layout
-        layout.addLayout(control_panel)
-        layout.addWidget(self.process_table)
-        layout.addWidget(self.gantt_chart)
-        
-        # Connect signals
-        self.start_btn.clicked.connect(self.start_simulation)
-        self.reset_btn.clicked.connect(self.reset_simulation)
-        
-    def load_processes(self):
-        # Get processes from parent window
-        parent = self.parent()
-        if parent and hasattr(parent, 'process_table'):
-            for row in range(parent.process_table.rowCount()):
-                pid = int(parent.process_table.item(row, 0).text())
-                name = parent.process_table.item(row, 1).text()
-                cpu_percent = float(parent.process_table.item(row, 2).text())
-                
-                # Convert CPU percentage to burst time (1-10)
-                burst_time = max(1, min(10, int(cpu_percent / 10)))
-                
-                # Create process with random priority and arrival time
-                process = Process(
-                    pid=pid,
-                    name=name,
-                    burst_time=burst_time,
-                    priority=random.randint(1, 5),
-                    arrival_time=random.randint(0, 5)
-                )
-                self.processes.append(process)
-        
-        self.update_table()
-        
-    def update_table(self):
-        self.process_table.setRowCount(len(self.processes))
-        for i, proc in enumerate(self.processes):
-            self.process_table.setItem(i, 0, QTableWidgetItem(str(proc.pid)))
-            self.process_table.setItem(i, 1, QTableWidgetItem(proc.name))
-            self.process_table.setItem(i, 2, QTableWidgetItem(str(proc.burst_time)))
-            self.process_table.setItem(i, 3, QTableWidgetItem(str(proc.priority)))
-            self.process_table.setItem(i, 4, QTableWidgetItem(str(proc.arrival_time)))
-            self.process_table.setItem(i, 5, QTableWidgetItem(f"{proc.waiting_time:.2f}"))
-            self.process_table.setItem(i, 6, QTableWidgetItem(f"{proc.turnaround_time:.2f}"))
-            
-    def start_simulation(self):
-        # Reset process states
-        for proc in self.processes:
-            proc.remaining_time = proc.burst_time
-            proc.waiting_time = 0
-            proc.turnaround_time = 0
-            proc.completed = False
-        
-        # Get time quantum for Round Robin
-        quantum = self.quantum_input.value() if self.algorithm == "Round Robin" else 0
-        
-        # Run the selected algorithm
-        if self.algorithm == "FCFS":
-            self.run_fcfs()
-        elif self.algorithm == "Round Robin":
-            self.run_round_robin(quantum)
-        elif self.algorithm == "Priority":
-            self.run_priority()
-        elif self.algorithm == "SJF":
-            self.run_sjf()
-            
-        self.update_table()
-        
-    def reset_simulation(self):
-        self.processes = []
-        self.load_processes()
-        self.gantt_chart.clear()
-        self.update_table()
+        self.result = BulkActionResult(action)
+        if action == 'kill_tree':
+            # Trees may overlap, so expand them all in one task
+            chunks = [pids]
+        else:
+            chunks = [pids[i:i + self.CHUNK_SIZE] for i in range(0, len(pids), self.CHUNK_SIZE)]
+        self.tasks = [ProcessActionTask(action, chunk, argument) for chunk in chunks]
+        self.remaining = len(self.tasks)
 
-    def run_fcfs(self):
-        self.gantt_chart.clear()
-        
-        # Sort processes by arrival time
-        processes = sorted(self.processes, key=lambda x: x.arrival_time)
-        
-        current_time = 0
-        gantt_bars = []
-        gantt_labels = []
-        
-        # Execute each process in order of arrival
-        for i, proc in enumerate(processes):
-            # If there's a gap between processes, advance the clock
-            if proc.arrival_time > current_time:
-                current_time = proc.arrival_time
-                
-            # Process starts execution
-            proc.start_time = current_time
-            
-            # Execute for burst time
-            current_time += proc.burst_time
-            
-            # Process completes
-            proc.end_time = current_time
-            proc.turnaround_time = proc.end_time - proc.arrival_time
-            proc.waiting_time = proc.turnaround_time - proc.burst_time
-            proc.completed = True
-            
-            # Create gantt chart bar for this process
-            color = QColor(random.randint(50, 200), random.randint(50, 200), random.randint(50, 200))
-            bar = pg.BarGraphItem(
-                x=[proc.start_time + proc.burst_time/2], 
-                height=[0.8], 
-                width=[proc.burst_time],
-                brush=color
-            )
-            gantt_bars.append(bar)
-            
-            # Add label
-            text = pg.TextItem(text=f"P{proc.pid}", anchor=(0.5, 0.5), color='k')
-            text.setPos(proc.start_time + proc.burst_time/2, 0.4)
-            gantt_labels.append(text)
-        
-        # Add all bars and labels to chart
-        for bar in gantt_bars:
-            self.gantt_chart.addItem(bar)
-        for label in gantt_labels:
-            self.gantt_chart.addItem(label)
-            
-        # Set chart range
-        self.gantt_chart.setXRange(0, current_time)
-        self.gantt_chart.setYRange(0, 1)
-        
-        # Add time markers
-        for t in range(0, current_time + 1):
-            time_label = pg.TextItem(text=str(t), anchor=(0.5, 0), color='w')
-            time_label.setPos(t, -0.1)
-            self.gantt_chart.addItem(time_label)
-    
-    def run_sjf(self):
-        self.gantt_chart.clear()
-        
-        # Sort processes by arrival time initially
-        processes = sorted(self.processes, key=lambda x: x.arrival_time)
-        
-        current_time = 0
-        completed = 0
-        gantt_bars = []
-        gantt_labels = []
-        total_processes = len(processes)
-        remaining_processes = processes.copy()
-        
-        while completed < total_processes:
-            # Find processes that have arrived
-            available_processes = [p for p in remaining_processes if p.arrival_time <= current_time]
-            
-            if not available_processes:
-                # No process available, advance time to next arrival
-                if remaining_processes:
-                    current_time = min(remaining_processes, key=lambda x: x.arrival_time).arrival_time
-                continue
-            
-            # Select process with shortest burst time
-            selected_process = min(available_processes, key=lambda x: x.burst_time)
-            remaining_processes.remove(selected_process)
-            
-            # Process starts execution
-            selected_process.start_time = current_time
-            
-            # Execute for burst time
-            current_time += selected_process.burst_time
-            
-            # Process completes
-            selected_process.end_time = current_time
-            selected_process.turnaround_time = selected_process.end_time - selected_process.arrival_time
-            selected_process.waiting_time = selected_process.turnaround_time - selected_process.burst_time
-            selected_process.completed = True
-            completed += 1
-            
-            # Create gantt chart bar for this process
-            color = QColor(random.randint(50, 200), random.randint(50, 200), random.randint(50, 200))
-            bar = pg.BarGraphItem(
-                x=[selected_process.start_time + selected_process.burst_time/2], 
-                height=[0.8], 
-                width=[selected_process.burst_time],
-                brush=color
-            )
-            gantt_bars.append(bar)
-            
-            # Add label
-            text = pg.TextItem(text=f"P{selected_process.pid}", anchor=(0.5, 0.5), color='k')
-            text.setPos(selected_process.start_time + selected_process.burst_time/2, 0.4)
-            gantt_labels.append(text)
-        
-        # Add all bars and labels to chart
-        for bar in gantt_bars:
-            self.gantt_chart.addItem(bar)
-        for label in gantt_labels:
-            self.gantt_chart.addItem(label)
-            
-        # Set chart range
-        self.gantt_chart.setXRange(0, current_time)
-        self.gantt_chart.setYRange(0, 1)
-        
-        # Add time markers
-        for t in range(0, current_time + 1):
-            time_label = pg.TextItem(text=str(t), anchor=(0.5, 0), color='w')
-            time_label.setPos(t, -0.1)
-            self.gantt_chart.addItem(time_label)
-    
-    def run_priority(self):
-        self.gantt_chart.clear()
-        
-        # Sort processes by arrival time initially
-        processes = sorted(self.processes, key=lambda x: x.arrival_time)
-        
-        current_time = 0
-        completed = 0
-        gantt_bars = []
-        gantt_labels = []
-        total_processes = len(processes)
-        remaining_processes = processes.copy()
-        
-        while completed < total_processes:
-            # Find processes that have arrived
-            available_processes = [p for p in remaining_processes if p.arrival_time <= current_time]
-            
-            if not available_processes:
-                # No process available, advance time to next arrival
-                if remaining_processes:
-                    current_time = min(remaining_processes, key=lambda x: x.arrival_time).arrival_time
-                continue
-            
-            # Select process with highest priority (higher number = higher priority)
-            selected_process = max(available_processes, key=lambda x: x.priority)
-            remaining_processes.remove(selected_process)
+    def start(self, pool):
+        for task in self.tasks:
+            task.signals.finished.connect(self.task_finished)
+            pool.start(task)
+
+    def task_finished(self, result):
+        self.result.merge(result)
+        self.remaining -= 1
+        if self.remaining == 0:
+            self.completed.emit(self.result)
+
+class HistoryExportSignals(QObject):
+    finished = Signal(object)
+
+class HistoryExportTask(QRunnable):
+    # Writes recorded history to CSV/Parquet off the GUI thread, one chunk at
+    # a time so long histories are never materialized as a whole
+    def __init__(self, history, path):
+        super().__init__()
+        self.history = history
+        self.path = path
+        self.signals = HistoryExportSignals()
+
+    def run(self):
+        try:
+            rows = export_history(self.history, self.path)
+            self.signals.finished.emit((self.path, rows, None))
+        except (OSError, RuntimeError) as e:
+            self.signals.finished.emit((self.path, 0, str(e)))
+
+class SamplingSource:
+    def __init__(self, name, callback, interval_ms, budget_ms=None, hidden_interval_ms=None, max_backoff=8):
+        self.name = name
+        self.callback = callback
+        self.interval_ms = interval_ms
+        self.budget_ms = budget_ms
+        # None pauses the source while the window is hidden
+        self.hidden_interval_ms = hidden_interval_ms
+        self.max_backoff = max_backoff
+        self.backoff = 1
+        self.elapsed_ms = 0.0
+        self.timer = None
+        
+    def current_interval(self, hidden):
+        if hidden:
+            return self.hidden_interval_ms
+        return self.interval_ms * self.backoff
+
+class SamplingScheduler(QObject):
+    # Runs each metric source from its own timer. Sources with a budget back
+    # off (doubling their interval) while their smoothed collection time is
+    # over budget, and recover once it drops well below it.
+    def __init__(self, parent=None, timings=None):
+        super().__init__(parent)
+        self.timings = timings
+        self.sources = {}
+        self.hidden = False
+        self.running = False
+        
+    def add_source(self, name, callback, interval_ms, budget_ms=None, hidden_interval_ms=None):
+        source = SamplingSource(name, callback, interval_ms, budget_ms, hidden_interval_ms)
+        source.timer = QTimer(self)
+        source.timer.timeout.connect(lambda: self.run_source(source))
+        self.sources[name] = source
+        return source
+        
+    def start(self):
+        self.running = True
+        for source in self.sources.values():
+            self.schedule(source)
             
-            # Process starts execution
-            selected_process.start_time = current_time
+    def stop(self):
+        self.running = False
+        for source in self.sources.values():
+            source.timer.stop()
             
-            # Execute for burst time
-            current_time += selected_process.burst_time
+    def schedule(self, source):
+        interval = source.current_interval(self.hidden)
+        if not self.running or interval is None:
+            source.timer.stop()
+        elif source.timer.interval() != interval or not source.timer.isActive():
+            source.timer.start(interval)
             
-            # Process completes
-            selected_process.end_time = current_time
-            selected_process.turnaround_time = selected_process.end_time - selected_process.arrival_time
-            selected_process.waiting_time = selected_process.turnaround_time - selected_process.burst_time
-            selected_process.completed = True
-            completed += 1
+    def run_source(self, source):
+        start = time.perf_counter()
+        source.callback()
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        if self.timings is not None:
+            self.timings.record(f"tick.{source.name}", elapsed_ms)
+        source.elapsed_ms = elapsed_ms if not source.elapsed_ms else 0.7 * source.elapsed_ms + 0.3 * elapsed_ms
+        
+        if source.budget_ms:
+            if source.elapsed_ms > source.budget_ms and source.backoff < source.max_backoff:
+                source.backoff *= 2
+            elif source.elapsed_ms < source.budget_ms / 2 and source.backoff > 1:
+                source.backoff //= 2
+            self.schedule(source)
             
-            # Create gantt chart bar for this process
-            color = QColor(random.randint(50, 200), random.randint(50, 200), random.randint(50, 200))
-            bar = pg.BarGraphItem(
-                x=[selected_process.start_time + selected_process.burst_time/2], 
-                height=[0.8], 
-                width=[selected_process.burst_time],
-                brush=color
-            )
-            gantt_bars.append(bar)
+    def run_now(self, name):
+        self.run_source(self.sources[name])
+        
+    def set_interval(self, name, interval_ms, budget_ms=None):
+        source = self.sources[name]
+        source.interval_ms = interval_ms
+        if budget_ms is not None:
+            source.budget_ms = budget_ms
+        source.backoff = 1
+        self.schedule(source)
+        
+    def set_hidden(self, hidden):
+        if hidden == self.hidden:
+            return
+        self.hidden = hidden
+        for source in self.sources.values():
+            self.schedule(source)
+
+class RenderScheduler(QObject):
+    # Redraws at most once per display frame. A sample only marks its part
+    # dirty, so several samples between frames cost one redraw of the latest
+    # state. Frames are skipped while the window is hidden, minimized or fully
+    # obscured; dirty parts are drawn as soon as it is exposed again.
+    def __init__(self, window, timings=None):
+        super().__init__(window)
+        self.window = window
+        self.timings = timings if timings is not None else StageTimings()
+        self.parts = {}
+        self.dirty = set()
+        self.frame_ms = 16
+        self.last_frame = 0.0
+        self.coalesced = 0
+        self.skipped = 0
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.render_frame)
+        
+    def add_part(self, name, callback):
+        self.parts[name] = callback
+        
+    def attach(self):
+        # Expose events go to the native window, not the widget
+        handle = self.window.windowHandle()
+        if handle is not None:
+            handle.installEventFilter(self)
+            screen = handle.screen()
+            if screen is not None and screen.refreshRate() > 0:
+                self.frame_ms = max(1, int(1000 / screen.refreshRate()))
+                
+    def eventFilter(self, obj, event):
+        # Draw straight away: anything queued (e.g. loading the graphs) would
+        # otherwise run before the first frame
+        if event.type() == QEvent.Expose and self.dirty:
+            self.timer.stop()
+            self.render_frame()
+        return False
+        
+    def request(self, name):
+        if name in self.dirty:
+            self.coalesced += 1
+        self.dirty.add(name)
+        if not self.timer.isActive():
+            wait = self.frame_ms - (time.monotonic() - self.last_frame) * 1000
+            self.timer.start(max(0, int(wait)))
             
-            # Add label
-            text = pg.TextItem(text=f"P{selected_process.pid}", anchor=(0.5, 0.5), color='k')
-            text.setPos(selected_process.start_time + selected_process.burst_time/2, 0.4)
-            gantt_labels.append(text)
-        
-        # Add all bars and labels to chart
-        for bar in gantt_bars:
-            self.gantt_chart.addItem(bar)
-        for label in gantt_labels:
-            self.gantt_chart.addItem(label)
+    def flush(self):
+        if self.dirty and not self.timer.isActive():
+            self.timer.start(0)
             
-        # Set chart range
-        self.gantt_chart.setXRange(0, current_time)
-        self.gantt_chart.setYRange(0, 1)
-        
-        # Add time markers
-        for t in range(0, current_time + 1):
-            time_label = pg.TextItem(text=str(t), anchor=(0.5, 0), color='w')
-            time_label.setPos(t, -0.1)
-            self.gantt_chart.addItem(time_label)
+    def can_render(self):
+        window = self.window
+        if not window.isVisible() or window.isMinimized():
+            return False
+        handle = window.windowHandle()
+        return handle is None or handle.isExposed()
+        
+    def render_frame(self):
+        if not self.dirty:
+            return
+        if not self.can_render():
+            self.skipped += 1
+            return
+        self.last_frame = time.monotonic()
+        dirty, self.dirty = self.dirty, set()
+        for name, callback in self.parts.items():
+            if name in dirty:
+                with self.timings.stage(f"render.{name}"):
+                    callback()
+                    
+class LifetimeDialog(QDialog):
+    # Newest first. Rows are only added for events the dialog hasn't seen, so
+    # a refresh costs as much as the events since the last one.
+    HEADERS = ["Time", "Event", "PID", "Name", "Lifetime", "CPU Time", "Exit Code", "Seen by Scans"]
+    MAX_ROWS = 1000
     
-    def run_round_robin(self, quantum):
-        self.gantt_chart.clear()
+    def __init__(self, tracker, parent=None):
+        super().__init__(parent)
+        self.tracker = tracker
+        self.seq = 0
+        self.setWindowTitle("Process Starts and Exits")
+        self.resize(900, 500)
+        layout = QVBoxLayout(self)
+        self.summary_label = QLabel()
+        self.short_lived_only = QCheckBox("Only processes missed by the scans")
+        self.table = QTableWidget(0, len(self.HEADERS))
+        self.table.setHorizontalHeaderLabels(self.HEADERS)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        header = QHBoxLayout()
+        header.addWidget(self.summary_label)
+        header.addStretch()
+        header.addWidget(self.short_lived_only)
+        layout.addLayout(header)
+        layout.addWidget(self.table)
+        self.short_lived_only.toggled.connect(self.reload)
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.refresh)
+        
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.refresh()
+        self.timer.start(500)
+        
+    def hideEvent(self, event):
+        self.timer.stop()
+        super().hideEvent(event)
+        
+    def reload(self):
+        self.seq = 0
+        self.table.setRowCount(0)
+        self.refresh()
+        
+    def refresh(self):
+        events, self.seq = self.tracker.log.since(self.seq)
+        if self.short_lived_only.isChecked():
+            events = [event for event in events if event.kind == 'exit' and not event.scanned]
+        events = events[-self.MAX_ROWS:]
+        if events:
+            self.table.setUpdatesEnabled(False)
+            for event in events:
+                self.table.insertRow(0)
+                for column, text in enumerate(self.event_texts(event)):
+                    self.table.setItem(0, column, QTableWidgetItem(text))
+            if self.table.rowCount() > self.MAX_ROWS:
+                self.table.setRowCount(self.MAX_ROWS)
+            self.table.setUpdatesEnabled(True)
+        self.summary_label.setText(
+            f"Tracking: {self.tracker.mode}, {len(self.tracker.log)} events recorded"
+        )
         
-        if quantum <= 0:
-            return
-            
-        # Sort processes by arrival time initially
-        processes = sorted(self.processes, key=lambda x: x.arrival_time)
-        
-        # Create temporary copies for simulation
-        process_copies = []
-        for p in processes:
-            process_copy = Process(p.pid, p.name, p.burst_time, p.priority, p.arrival_time)
-            process_copies.append(process_copy)
-        
-        current_time = 0
-        ready_queue = []
-        gantt_bars = []
-        gantt_labels = []
-        completed = 0
-        total_processes = len(process_copies)
-        process_colors = {}
-        
-        while completed < total_processes:
-            # Add newly arrived processes to ready queue
-            for proc in process_copies:
-                if not proc.completed and proc.arrival_time <= current_time and proc not in ready_queue:
-                    ready_queue.append(proc)
-            
-            if not ready_queue:
-                # No process in ready queue, advance time
-                arrived = False
-                for proc in process_copies:
-                    if not proc.completed and proc.arrival_time > current_time:
-                        current_time = proc.arrival_time
-                        arrived = True
-                        break
-                        
-                if not arrived:
-                    break
-                continue
-            
-            # Get next process from ready queue
-            current_proc = ready_queue.pop(0)
-            
-            # Set start time if first execution
-            if current_proc.start_time == -1:
-                current_proc.start_time = current_time
-            
-            # Determine execution time for this quantum
-            execution_time = min(quantum, current_proc.remaining_time)
-            
-            # Execute for quantum time or until completion
-            start_execution = current_time
-            current_time += execution_time
-            current_proc.remaining_time -= execution_time
-            
-            # Create color for the process if not already assigned
-            if current_proc.pid not in process_colors:
-                process_colors[current_proc.pid] = QColor(random.randint(50, 200), random.randint(50, 200), random.randint(50, 200))
-            
-            # Create gantt chart bar for this execution block
-            bar = pg.BarGraphItem(
-                x=[start_execution + execution_time/2], 
-                height=[0.8], 
-                width=[execution_time],
-                brush=process_colors[current_proc.pid]
-            )
-            gantt_bars.append(bar)
-            
-            # Add label
-            text = pg.TextItem(text=f"P{current_proc.pid}", anchor=(0.5, 0.5), color='k')
-            text.setPos(start_execution + execution_time/2, 0.4)
-            gantt_labels.append(text)
-            
-            # Check if process is completed
-            if current_proc.remaining_time == 0:
-                current_proc.end_time = current_time
-                current_proc.turnaround_time = current_proc.end_time - current_proc.arrival_time
-                current_proc.waiting_time = current_proc.turnaround_time - current_proc.burst_time
-                current_proc.completed = True
-                completed += 1
-                
-                # Update original process
-                for orig_proc in self.processes:
-                    if orig_proc.pid == current_proc.pid:
-                        orig_proc.waiting_time = current_proc.waiting_time
-                        orig_proc.turnaround_time = current_proc.turnaround_time
-                        orig_proc.completed = True
-                        break
-            else:
-                # Put back in ready queue if not completed
-                ready_queue.append(current_proc)
-        
-        # Add all bars and labels to chart
-        for bar in gantt_bars:
-            self.gantt_chart.addItem(bar)
-        for label in gantt_labels:
-            self.gantt_chart.addItem(label)
-            
-        # Set chart range
-        self.gantt_chart.setXRange(0, current_time)
-        self.gantt_chart.setYRange(0, 1)
-        
-        # Add time markers (with fewer markers for longer timelines)
-        step = max(1, current_time // 20)
-        for t in range(0, current_time + 1, step):
-            time_label = pg.TextItem(text=str(t), anchor=(0.5, 0), color='w')
-            time_label.setPos(t, -0.1)
-            self.gantt_chart.addItem(time_label)
+    def event_texts(self, event):
+        return [
+            datetime.fromtimestamp(event.time).strftime("%H:%M:%S.%f")[:-3],
+            event.kind,
+            str(event.pid),
+            event.name,
+            "" if event.duration is None else f"{event.duration:.2f} s",
+            "" if event.cpu_time is None else f"{event.cpu_time:.2f} s",
+            "" if event.exit_code is None else str(event.exit_code),
+            "" if event.kind == 'start' else "yes" if event.scanned else "no"
+        ]
 
 class SettingsDialog(QDialog):
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, settings=None):
         super().__init__(parent)
         self.setWindowTitle("Settings")
         self.setMinimumWidth(400)
         self.setup_ui()
+        if settings is not None:
+            self.set_settings(settings)
         
     def setup_ui(self):
         layout = QVBoxLayout(self)
@@ -591,6 +624,15 @@ class SettingsDialog(QDialog):
         self.memory_threshold.setValue(70)
         alert_layout.addRow("Memory Threshold (%):", self.memory_threshold)
         
+        self.anomaly_sensitivity = QDoubleSpinBox()
+        self.anomaly_sensitivity.setRange(0, 10)
+        self.anomaly_sensitivity.setSingleStep(0.5)
+        self.anomaly_sensitivity.setSpecialValueText("Off")
+        self.anomaly_sensitivity.setValue(4.0)
+        self.anomaly_sensitivity.setSuffix(" σ")
+        self.anomaly_sensitivity.setToolTip("Alert on spikes this many standard deviations above the recent average")
+        alert_layout.addRow("Anomaly Threshold:", self.anomaly_sensitivity)
+        
         alert_group.setLayout(alert_layout)
         
         # Display Settings
@@ -603,9 +645,32 @@ class SettingsDialog(QDialog):
         self.update_interval.setSuffix(" seconds")
         display_layout.addRow("Update Interval:", self.update_interval)
         
+        self.metrics_interval = QSpinBox()
+        self.metrics_interval.setRange(100, 5000)
+        self.metrics_interval.setSingleStep(50)
+        self.metrics_interval.setValue(250)
+        self.metrics_interval.setSuffix(" ms")
+        display_layout.addRow("CPU/Memory Interval:", self.metrics_interval)
+        
+        self.scan_budget = QSpinBox()
+        self.scan_budget.setRange(10, 5000)
+        self.scan_budget.setValue(200)
+        self.scan_budget.setSuffix(" ms")
+        self.scan_budget.setToolTip("Process scans that take longer than this are run less often")
+        display_layout.addRow("Process Scan Budget:", self.scan_budget)
+        
+        self.memory_detail_budget = QSpinBox()
+        self.memory_detail_budget.setRange(0, 1000)
+        self.memory_detail_budget.setSpecialValueText("Off")
+        self.memory_detail_budget.setValue(25)
+        self.memory_detail_budget.setSuffix(" ms")
+        self.memory_detail_budget.setToolTip("Time per scan spent reading USS/PSS/swap, largest processes first")
+        display_layout.addRow("USS/PSS Budget:", self.memory_detail_budget)
+        
         self.max_processes = QSpinBox()
-        self.max_processes.setRange(5, 50)
-        self.max_processes.setValue(15)
+        self.max_processes.setRange(0, 100000)
+        self.max_processes.setSpecialValueText("All")
+        self.max_processes.setValue(0)
         display_layout.addRow("Max Processes Display:", self.max_processes)
         
         display_group.setLayout(display_layout)
@@ -622,12 +687,51 @@ class SettingsDialog(QDialog):
         self.show_system_processes.setChecked(False)
         process_layout.addRow(self.show_system_processes)
         
+        self.fast_collector = QCheckBox("Read /proc directly (faster, Linux only)")
+        self.fast_collector.setChecked(False)
+        self.fast_collector.setEnabled(ProcfsCollector.available())
+        process_layout.addRow(self.fast_collector)
+        
+        self.share_scans = QCheckBox("Share process scans with other monitors on this host")
+        self.share_scans.setChecked(True)
+        self.share_scans.setEnabled(SharedCollector.available())
+        self.share_scans.setToolTip("One monitor scans and the others read its results from shared memory")
+        process_layout.addRow(self.share_scans)
+        
+        self.lifetime_source = QComboBox()
+        for label, mode in (("Automatic", 'auto'), ("Kernel events (netlink, needs root)", 'netlink'),
+                            ("Poll /proc every 50 ms", 'proc'), ("Process scans only", 'scan')):
+            self.lifetime_source.addItem(label, mode)
+        self.lifetime_source.setToolTip("How process starts and exits are detected; scans miss short-lived processes")
+        process_layout.addRow("Start/Exit Tracking:", self.lifetime_source)
+        
+        self.cgroup_grouping = QComboBox()
+        self.cgroup_grouping.addItem("Service / container", 'unit')
+        self.cgroup_grouping.addItem("Cgroup path", 'path')
+        self.cgroup_grouping.setEnabled(CgroupSampler.available())
+        self.cgroup_grouping.setToolTip("What \"Group by Cgroup\" puts in one group")
+        process_layout.addRow("Cgroup Groups:", self.cgroup_grouping)
+        
         process_group.setLayout(process_layout)
         
+        # Export Settings
+        export_group = QGroupBox("Export Settings")
+        export_layout = QFormLayout()
+        
+        self.metrics_port = QSpinBox()
+        self.metrics_port.setRange(0, 65535)
+        self.metrics_port.setSpecialValueText("Off")
+        self.metrics_port.setValue(0)
+        self.metrics_port.setToolTip("Serve Prometheus/OpenMetrics text on http://127.0.0.1:<port>/metrics")
+        export_layout.addRow("Metrics Endpoint Port:", self.metrics_port)
+        
+        export_group.setLayout(export_layout)
+        
         # Add all groups to main layout
         layout.addWidget(alert_group)
         layout.addWidget(display_group)
         layout.addWidget(process_group)
+        layout.addWidget(export_group)
         
         # Add buttons
         button_box = QDialogButtonBox(
@@ -637,14 +741,40 @@ class SettingsDialog(QDialog):
         button_box.rejected.connect(self.reject)
         layout.addWidget(button_box)
         
+    def set_settings(self, settings):
+        self.cpu_threshold.setValue(settings['cpu_threshold'])
+        self.memory_threshold.setValue(settings['memory_threshold'])
+        self.anomaly_sensitivity.setValue(settings['anomaly_z'])
+        self.update_interval.setValue(settings['update_interval'])
+        self.metrics_interval.setValue(settings['metrics_interval_ms'])
+        self.scan_budget.setValue(settings['scan_budget_ms'])
+        self.memory_detail_budget.setValue(settings['memory_detail_budget_ms'])
+        self.max_processes.setValue(settings['max_processes'])
+        self.sort_by_cpu.setChecked(settings['sort_by_cpu'])
+        self.show_system_processes.setChecked(settings['show_system_processes'])
+        self.fast_collector.setChecked(settings['fast_collector'])
+        self.share_scans.setChecked(settings['share_scans'])
+        self.lifetime_source.setCurrentIndex(max(0, self.lifetime_source.findData(settings['lifetime_source'])))
+        self.cgroup_grouping.setCurrentIndex(max(0, self.cgroup_grouping.findData(settings['cgroup_grouping'])))
+        self.metrics_port.setValue(settings['metrics_port'])
+        
     def get_settings(self):
         return {
             'cpu_threshold': self.cpu_threshold.value(),
             'memory_threshold': self.memory_threshold.value(),
+            'anomaly_z': self.anomaly_sensitivity.value(),
             'update_interval': self.update_interval.value(),
+            'metrics_interval_ms': self.metrics_interval.value(),
+            'scan_budget_ms': self.scan_budget.value(),
+            'memory_detail_budget_ms': self.memory_detail_budget.value(),
             'max_processes': self.max_processes.value(),
             'sort_by_cpu': self.sort_by_cpu.isChecked(),
-            'show_system_processes': self.show_system_processes.isChecked()
+            'show_system_processes': self.show_system_processes.isChecked(),
+            'fast_collector': self.fast_collector.isChecked(),
+            'share_scans': self.share_scans.isChecked(),
+            'lifetime_source': self.lifetime_source.currentData(),
+            'cgroup_grouping': self.cgroup_grouping.currentData(),
+            'metrics_port': self.metrics_port.value()
         }
 
 class ProcessControlPanel(QFrame):
@@ -795,21 +925,456 @@ class ProcessControlPanel(QFrame):
             }}
         """)
 
+SPARK_BLOCKS = "▁▂▃▄▅▆▇█"
+
+def sparkline(values):
+    # Text sparkline scaled to the series' own maximum; blank where NaN
+    values = np.asarray(values, dtype=np.float64)
+    if not len(values):
+        return ""
+    top = np.nanmax(values) if not np.isnan(values).all() else 0
+    levels = np.zeros(len(values), dtype=np.int64) if not top else np.clip(
+        np.nan_to_num(values / top * (len(SPARK_BLOCKS) - 1)).round().astype(np.int64), 0, len(SPARK_BLOCKS) - 1)
+    return "".join(" " if missing else SPARK_BLOCKS[level] for level, missing in zip(levels.tolist(), np.isnan(values).tolist()))
+
+def fit_samples(values, size):
+    # The last `size` values, zero-padded at the front if there are fewer
+    fitted = np.zeros(size)
+    count = min(size, len(values))
+    if count:
+        fitted[size - count:] = values[len(values) - count:]
+    return fitted
+
+def format_rate(bytes_per_second):
+    if bytes_per_second != bytes_per_second:
+        return "…"
+    return f"{format_bytes(bytes_per_second)}/s"
+
+@lru_cache(maxsize=16384)
+def format_start_time(create_time):
+    # create_time never changes for a process, so each one is formatted once
+    return datetime.fromtimestamp(create_time).strftime('%H:%M:%S')
+
+class ProcessTableModel(QAbstractTableModel):
+    HEADERS = [
+        "PID", "Name", "CPU %", "Memory %", "Status", "User", "Start Time", "Read/s", "Write/s",
+        "RSS", "USS", "PSS", "Swap"
+    ]
+    IO_COLUMNS = (7, 8)
+    RSS_COLUMN = 9
+    # USS/PSS/Swap are refreshed every 30 s while the budget keeps up; values
+    # left well past that are dimmed
+    DETAIL_COLUMNS = (10, 11, 12)
+    DETAIL_STALE_AFTER = 60
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.snapshot = ProcessSnapshot([], [], [], [], [], [], [])
+        self.process_filter = ProcessFilter()
+        # Snapshot positions of the filtered, sorted rows; the view only asks
+        # for the cells it is showing, so row count doesn't drive paint cost
+        self.rows = np.zeros(0, dtype=np.int64)
+        self.sort_column = 2
+        self.sort_order = Qt.DescendingOrder
+        self.limit = 0
+        self.timings = StageTimings()
+        # pid -> (read, write) bytes/s, only for the rows last on screen
+        self.io_rates = {}
+        # pid -> (create_time, sampled_at, uss, pss, swap), see MemoryDetailSampler
+        self.memory_details = {}
+        self.total_memory = psutil.virtual_memory().total
+        
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+        
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+        
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return None
+        
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == Qt.TextAlignmentRole:
+            return Qt.AlignCenter
+        if role in (Qt.ToolTipRole, Qt.ForegroundRole) and index.column() in self.DETAIL_COLUMNS:
+            return self.detail_age_data(index, role)
+        if role != Qt.DisplayRole:
+            return None
+            
+        row = self.rows[index.row()]
+        column = index.column()
+        snapshot = self.snapshot
+        if column == 0:
+            return str(snapshot.pids[row])
+        elif column == 1:
+            return snapshot.names[row]
+        elif column == 2:
+            return f"{snapshot.cpu_percent[row]:.1f}"
+        elif column == 3:
+            return f"{snapshot.memory_percent[row]:.1f}"
+        elif column == 4:
+            return snapshot.statuses[row]
+        elif column == 5:
+            return snapshot.usernames[row]
+        elif column == 6:
+            return format_start_time(snapshot.create_times[row])
+        elif column in self.IO_COLUMNS:
+            rates = self.io_rates.get(int(snapshot.pids[row]))
+            return "" if rates is None else format_rate(rates[column - 7])
+        elif column == self.RSS_COLUMN:
+            return format_bytes(snapshot.memory_percent[row] * self.total_memory / 100)
+        detail = self.memory_details.get(int(snapshot.pids[row]))
+        if detail is None:
+            return ""
+        value = detail[column - 8]
+        return "n/a" if value is None else format_bytes(value)
+        
+    def detail_age_data(self, index, role):
+        detail = self.memory_details.get(self.pid_at(index.row()))
+        if detail is None:
+            return None
+        age = time.time() - detail[1]
+        if role == Qt.ToolTipRole:
+            return f"Sampled {age:.0f} s ago"
+        return QColor("gray") if age > self.DETAIL_STALE_AFTER else None
+        
+    def sort(self, column, order=Qt.AscendingOrder):
+        self.sort_column = column
+        self.sort_order = order
+        self.refresh()
+        
+    def set_snapshot(self, snapshot):
+        self.snapshot = snapshot
+        self.refresh()
+        
+    def set_filter(self, process_filter):
+        self.process_filter = process_filter
+        self.refresh()
+        
+    def sort_key(self, column):
+        snapshot = self.snapshot
+        if column == 0:
+            return snapshot.pids
+        elif column == 1:
+            return snapshot.codes('names')[1]
+        elif column == 2:
+            return snapshot.cpu_percent
+        elif column == 3:
+            return snapshot.memory_percent
+        elif column == 4:
+            return snapshot.codes('statuses')[1]
+        elif column == 5:
+            return snapshot.codes('usernames')[1]
+        elif column == 6:
+            return snapshot.create_times
+        elif column == self.RSS_COLUMN:
+            return snapshot.memory_percent
+        # Unsampled rows sort below idle ones
+        if column in self.IO_COLUMNS:
+            values = {pid: rates[column - 7] for pid, rates in self.io_rates.items()}
+        else:
+            values = {pid: detail[column - 8] for pid, detail in self.memory_details.items()}
+        key = np.full(len(snapshot), -1.0)
+        if values:
+            positions = snapshot.positions(list(values))
+            found = np.array([-1.0 if value is None else value for value in values.values()])
+            key[positions[positions >= 0]] = np.nan_to_num(found, nan=-1.0)[positions >= 0]
+        return key
+        
+    def refresh(self):
+        with self.timings.stage('filter'):
+            rows = np.nonzero(self.process_filter.mask(self.snapshot))[0]
+        with self.timings.stage('sort'):
+            key = self.sort_key(self.sort_column)[rows]
+            if self.sort_order == Qt.DescendingOrder:
+                # Stable descending sort that keeps ties in scan order
+                order = np.argsort(-key.astype(np.float64), kind='stable')
+            else:
+                order = np.argsort(key, kind='stable')
+            rows = rows[order]
+            if self.limit:
+                rows = rows[:self.limit]
+                
+        with self.timings.stage('model_reset'):
+            self.beginResetModel()
+            self.rows = rows
+            self.endResetModel()
+        
+    def pid_at(self, row):
+        return int(self.snapshot.pids[self.rows[row]])
+        
+    def rows_of_pids(self, pids):
+        # Inverse of self.rows for the given PIDs, skipping ones not shown
+        positions = self.snapshot.positions(pids)
+        lookup = np.full(len(self.snapshot), -1, dtype=np.int64)
+        lookup[self.rows] = np.arange(len(self.rows))
+        rows = lookup[positions[positions >= 0]]
+        return rows[rows >= 0].tolist()
+
+class ProcessFilterBar(QFrame):
+    changed = Signal()
+    
+    STATUSES = ["running", "sleeping", "disk-sleep", "stopped", "zombie", "idle"]
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setup_ui()
+        
+    def setup_ui(self):
+        layout = QHBoxLayout(self)
+        layout.setContentsMargins(5, 5, 5, 5)
+        layout.setSpacing(8)
+        
+        self.search_input = QLineEdit()
+        self.search_input.setPlaceholderText("Filter by name...")
+        self.search_input.setClearButtonEnabled(True)
+        self.regex_check = QCheckBox("Regex")
+        
+        self.user_combo = QComboBox()
+        self.user_combo.addItem("All users")
+        self.status_combo = QComboBox()
+        self.status_combo.addItem("All statuses")
+        self.status_combo.addItems(self.STATUSES)
+        
+        self.cpu_min = self.make_range_spin("CPU ≥ ")
+        self.cpu_max = self.make_range_spin("CPU ≤ ", 10000)
+        self.mem_min = self.make_range_spin("Mem ≥ ")
+        self.mem_max = self.make_range_spin("Mem ≤ ", 100)
+        
+        self.match_label = QLabel("")
+        
+        layout.addWidget(self.search_input, stretch=2)
+        layout.addWidget(self.regex_check)
+        layout.addWidget(self.user_combo)
+        layout.addWidget(self.status_combo)
+        for spin in (self.cpu_min, self.cpu_max, self.mem_min, self.mem_max):
+            layout.addWidget(spin)
+        layout.addWidget(self.match_label)
+        
+        self.search_input.textChanged.connect(self.changed)
+        self.regex_check.toggled.connect(self.changed)
+        self.user_combo.currentIndexChanged.connect(self.changed)
+        self.status_combo.currentIndexChanged.connect(self.changed)
+        for spin in (self.cpu_min, self.cpu_max, self.mem_min, self.mem_max):
+            spin.valueChanged.connect(self.changed)
+            
+    def make_range_spin(self, prefix, maximum=None):
+        spin = QDoubleSpinBox()
+        spin.setPrefix(prefix)
+        spin.setSuffix("%")
+        spin.setDecimals(1)
+        # CPU % can exceed 100 on multi-core machines
+        spin.setRange(0, maximum or 10000)
+        spin.setValue(maximum or 0)
+        return spin
+        
+    def set_users(self, users):
+        current = self.user_combo.currentText()
+        existing = [self.user_combo.itemText(i) for i in range(1, self.user_combo.count())]
+        users = [user for user in users if user]
+        if users == existing:
+            return
+        self.user_combo.blockSignals(True)
+        self.user_combo.clear()
+        self.user_combo.addItem("All users")
+        self.user_combo.addItems(users)
+        index = self.user_combo.findText(current)
+        self.user_combo.setCurrentIndex(max(index, 0))
+        self.user_combo.blockSignals(False)
+        
+    def build_filter(self, hide_system):
+        text = self.search_input.text()
+        regex = self.regex_check.isChecked()
+        try:
+            process_filter = ProcessFilter(
+                text=text,
+                regex=regex,
+                user=self.user_combo.currentText() if self.user_combo.currentIndex() > 0 else None,
+                status=self.status_combo.currentText() if self.status_combo.currentIndex() > 0 else None,
+                cpu_range=(self.cpu_min.value(), self.cpu_max.value()),
+                memory_range=(self.mem_min.value(), self.mem_max.value()),
+                hide_system=hide_system
+            )
+            self.search_input.setStyleSheet("")
+        except re.error:
+            # Keep the previous filter until the pattern compiles
+            self.search_input.setStyleSheet("border: 1px solid #FF4C4C;")
+            return None
+        return process_filter
+        
+    def set_match_count(self, shown, total):
+        self.match_label.setText(f"{shown} / {total}")
+
+class DebugOverlay(QFrame):
+    # Floating panel with the monitor's own per-stage timings (toggle with F12)
+    def __init__(self, timings, parent=None):
+        super().__init__(parent)
+        self.timings = timings
+        self.setup_ui()
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.timeout.connect(self.refresh)
+        self.hide()
+        
+    def setup_ui(self):
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(8, 8, 8, 8)
+        layout.setSpacing(5)
+        
+        header_label = QLabel("Monitor Overhead (ms)")
+        header_label.setStyleSheet("font-weight: bold;")
+        
+        self.stats_label = QLabel("")
+        self.stats_label.setFont(QFontDatabase.systemFont(QFontDatabase.SystemFont.FixedFont))
+        self.stats_label.setTextInteractionFlags(Qt.TextSelectableByMouse)
+        
+        # Profile capture controls
+        profile_layout = QHBoxLayout()
+        self.profile_ticks = QSpinBox()
+        self.profile_ticks.setRange(1, 1000)
+        self.profile_ticks.setValue(10)
+        self.profile_ticks.setSuffix(" ticks")
+        self.trace_memory = QCheckBox("tracemalloc")
+        self.profile_btn = QPushButton("Profile")
+        profile_layout.addWidget(self.profile_ticks)
+        profile_layout.addWidget(self.trace_memory)
+        profile_layout.addWidget(self.profile_btn)
+        
+        self.export_btn = QPushButton("Export JSON")
+        
+        layout.addWidget(header_label)
+        layout.addWidget(self.stats_label)
+        layout.addLayout(profile_layout)
+        layout.addWidget(self.export_btn)
+        
+        self.export_btn.clicked.connect(self.export_json)
+        self.profile_btn.clicked.connect(self.start_profile)
+        
+    def toggle(self):
+        if self.isVisible():
+            self.refresh_timer.stop()
+            self.hide()
+        else:
+            self.refresh()
+            self.show()
+            self.raise_()
+            self.refresh_timer.start(1000)
+            
+    def refresh(self):
+        self.stats_label.setText(self.timings.format_table())
+        self.adjustSize()
+        self.reposition()
+        
+    def reposition(self):
+        parent = self.parentWidget()
+        if parent is not None:
+            self.move(parent.width() - self.width() - 20, 60)
+            
+    def export_json(self):
+        path, _ = QFileDialog.getSaveFileName(self, "Export Timings", "monitor-timings.json", "JSON (*.json)")
+        if path:
+            self.timings.export_json(path)
+            
+    def start_profile(self):
+        self.profile_btn.setEnabled(False)
+        self.parentWidget().start_profile_capture(self.profile_ticks.value(), self.trace_memory.isChecked())
+        
+    def profile_finished(self):
+        self.profile_btn.setEnabled(True)
+        
+    def apply_theme(self, colors):
+        self.setStyleSheet(f"""
+            QFrame {{
+                background-color: {colors['secondary_bg']};
+                border: 1px solid {colors['border']};
+                border-radius: 5px;
+                color: {colors['text']};
+            }}
+            QLabel {{
+                border: none;
+                color: {colors['text']};
+            }}
+        """)
+
 class SystemMonitor(QMainWindow):
-    def __init__(self):
+    # Seconds between rows of recorded history
+    HISTORY_INTERVAL = 1.0
+    # Per-process I/O is only read for this many on-screen rows
+    MAX_IO_ROWS = 100
+    # Theme names saved in the session state, in theme selector order
+    THEMES = ['dark', 'light', 'cyberpunk']
+    # Graph buffers restored from the session state
+    GRAPHS = ['cpu_data', 'mem_data', 'disk_data', 'net_data']
+    # Seconds of CPU/memory shown by the bar graphs, whatever the sampling
+    # interval
+    GRAPH_SECONDS = 30
+    # Anomaly alerts shown per scan, the rest are summarized
+    MAX_ANOMALY_ALERTS = 3
+    # Where a group's (CPU, memory) came from: the cgroup's own files or a
+    # sum over its processes
+    GROUP_ACCOUNTING = {
+        (True, True): "cgroup", (True, False): "cgroup CPU, summed memory",
+        (False, True): "summed CPU, cgroup memory", (False, False): "summed"
+    }
+    
+    def __init__(self, persist=True):
         super().__init__()
         self.setWindowTitle("Process Visualization Tool")
+        # Whether settings and session state are loaded from and saved to disk
+        self.persist = persist
         self.current_theme = ThemeColors.DARK
+        # Per-stage timings of the monitor's own refresh pipeline
+        self.timings = StageTimings()
+        self.profile_capture = None
         self.settings = {
             'cpu_threshold': 80,
             'memory_threshold': 70,
+            'anomaly_z': 4.0,
             'update_interval': 1,
-            'max_processes': 15,
+            'metrics_interval_ms': 250,
+            'scan_budget_ms': 200,
+            'memory_detail_budget_ms': 25,
+            'max_processes': 0,
             'sort_by_cpu': True,
-            'show_system_processes': False
+            'show_system_processes': False,
+            'fast_collector': False,
+            'share_scans': True,
+            'lifetime_source': 'auto',
+            'cgroup_grouping': 'unit',
+            'metrics_port': 0
         }
+        if persist:
+            self.settings = load_settings(self.settings)
+        # CPU/memory history at HISTORY_INTERVAL resolution, for export
+        self.history = MetricHistory([
+            'cpu_percent', 'memory_percent', 'memory_used', 'process_count',
+            'disk_read_bps', 'disk_write_bps', 'net_recv_bps', 'net_sent_bps'
+        ])
+        self.io_sampler = SystemIOSampler()
+        self.process_io = ProcessIOSampler()
+        self.memory_detail = MemoryDetailSampler(self.settings['memory_detail_budget_ms'])
+        # Start/exit events of local processes, including ones too short-lived
+        # for the process scans to see
+        self.lifetime = LifetimeTracker()
+        self.lifetime_dialog = None
+        self.detail_pane = None
+        # Per-cgroup CPU/memory of local processes, when cgroup v2 is mounted
+        self.cgroups = CgroupSampler(self.settings['cgroup_grouping']) if CgroupSampler.available() else None
+        # Spikes and leaks in the process scans, on top of the static thresholds
+        self.anomalies = AnomalyDetector(self.settings['anomaly_z'])
+        self.last_history_time = 0
+        self.process_count = np.nan
+        self.exporter = None
         self.setup_ui()
         self.apply_theme(self.current_theme)
+        self.alert_panel.cpu_threshold = self.settings['cpu_threshold']
+        self.alert_panel.memory_threshold = self.settings['memory_threshold']
+        self.set_metrics_port(self.settings['metrics_port'])
+        if persist:
+            self.restore_state()
         
     def setup_ui(self):
         # Create main widget and layout
@@ -839,25 +1404,16 @@ class SystemMonitor(QMainWindow):
         self.cpu_progress = QProgressBar()
         self.cpu_progress.setRange(0, 100)
         
-        self.cpu_plot = pg.PlotWidget(background=None)
-        self.cpu_plot.setMaximumHeight(100)
-        self.cpu_plot.setYRange(0, 100)
-        self.cpu_plot.showGrid(True, True, alpha=0.3)
-        self.cpu_data = np.zeros(30)
-        
-        self.cpu_bars = pg.BarGraphItem(
-            x=range(len(self.cpu_data)),
-            height=self.cpu_data,
-            width=0.8,
-            brush=self.current_theme['graph_cpu'],
-            pen=None
-        )
-        self.cpu_plot.addItem(self.cpu_bars)
-        self.cpu_plot.getAxis('bottom').setStyle(showValues=False)
+        # Graphs are created once the window is up, keep their space reserved
+        self.cpu_data = np.zeros(self.graph_samples())
+        self.cpu_plot = None
+        self.cpu_bars = None
+        self.cpu_plot_placeholder = QWidget()
+        self.cpu_plot_placeholder.setFixedHeight(100)
         
         cpu_layout.addLayout(cpu_header)
         cpu_layout.addWidget(self.cpu_progress)
-        cpu_layout.addWidget(self.cpu_plot)
+        cpu_layout.addWidget(self.cpu_plot_placeholder)
         
         # Memory Usage Display
         mem_frame = QFrame()
@@ -875,30 +1431,44 @@ class SystemMonitor(QMainWindow):
         self.mem_progress = QProgressBar()
         self.mem_progress.setRange(0, 100)
         
-        self.mem_plot = pg.PlotWidget(background=None)
-        self.mem_plot.setMaximumHeight(100)
-        self.mem_plot.setYRange(0, 100)
-        self.mem_plot.showGrid(True, True, alpha=0.3)
-        self.mem_data = np.zeros(30)
-        
-        self.mem_bars = pg.BarGraphItem(
-            x=range(len(self.mem_data)),
-            height=self.mem_data,
-            width=0.8,
-            brush=self.current_theme['graph_memory'],
-            pen=None
-        )
-        self.mem_plot.addItem(self.mem_bars)
-        self.mem_plot.getAxis('bottom').setStyle(showValues=False)
+        self.mem_data = np.zeros(self.graph_samples())
+        self.mem_plot = None
+        self.mem_bars = None
+        self.mem_plot_placeholder = QWidget()
+        self.mem_plot_placeholder.setFixedHeight(100)
         
         mem_layout.addLayout(mem_header)
         mem_layout.addWidget(self.mem_label_detail)
         mem_layout.addWidget(self.mem_progress)
-        mem_layout.addWidget(self.mem_plot)
-        
-        # Add CPU and Memory frames to top panel
+        mem_layout.addWidget(self.mem_plot_placeholder)
+        
+        # Disk and network throughput
+        io_frame = QFrame()
+        io_layout = QVBoxLayout(io_frame)
+        io_layout.setSpacing(5)
+        
+        self.io_label = QLabel("DISK & NETWORK")
+        self.disk_value = QLabel("Disk: R 0 B/s · W 0 B/s")
+        self.net_value = QLabel("Net: ↓ 0 B/s · ↑ 0 B/s")
+        self.io_detail = QLabel("")
+        
+        self.disk_data = np.zeros(60)
+        self.net_data = np.zeros(60)
+        self.io_plot = None
+        self.io_curves = None
+        self.io_plot_placeholder = QWidget()
+        self.io_plot_placeholder.setFixedHeight(100)
+        
+        io_layout.addWidget(self.io_label)
+        io_layout.addWidget(self.disk_value)
+        io_layout.addWidget(self.net_value)
+        io_layout.addWidget(self.io_detail)
+        io_layout.addWidget(self.io_plot_placeholder)
+        
+        # Add CPU, Memory and I/O frames to top panel
         top_layout.addWidget(cpu_frame, stretch=1)
         top_layout.addWidget(mem_frame, stretch=1)
+        top_layout.addWidget(io_frame, stretch=1)
         
         # Process List
         process_frame = QFrame()
@@ -910,20 +1480,89 @@ class SystemMonitor(QMainWindow):
         process_label = QLabel("ACTIVE PROCESSES")
         process_label.setStyleSheet("font-size: 16px; font-weight: bold;")
         self.control_panel = ProcessControlPanel()
+        self.tree_toggle = QCheckBox("Tree View")
+        self.group_toggle = QCheckBox("Group by Cgroup")
+        self.group_toggle.setEnabled(self.cgroups is not None)
+        self.group_toggle.setToolTip("Group local processes by service or container (cgroup v2)")
+        # Which host the process list and graphs show; remote hosts are
+        # agents streaming from remote_agent.py
+        self.host_combo = QComboBox()
+        self.host_combo.addItem("Local", None)
+        self.host_combo.setMinimumWidth(180)
+        self.add_host_btn = QPushButton("+")
+        self.add_host_btn.setToolTip("Connect to a remote agent")
+        self.add_host_btn.setFixedWidth(30)
+        self.fleet_btn = QPushButton("Fleet")
+        self.fleet_btn.setToolTip("Overview of every connected host")
+        self.export_btn = QPushButton("Export")
+        self.export_btn.setToolTip("Export recorded CPU/memory history to CSV or Parquet")
+        self.lifetime_btn = QPushButton("Starts/Exits")
+        self.lifetime_btn.setToolTip("Recently started and exited processes")
         process_header.addWidget(process_label)
+        process_header.addWidget(self.host_combo)
+        process_header.addWidget(self.add_host_btn)
+        process_header.addWidget(self.fleet_btn)
+        process_header.addWidget(self.export_btn)
+        process_header.addWidget(self.lifetime_btn)
+        process_header.addWidget(self.tree_toggle)
+        process_header.addWidget(self.group_toggle)
         process_header.addWidget(self.control_panel)
         
-        self.process_table = QTableWidget()
-        self.process_table.setColumnCount(7)
-        self.process_table.setHorizontalHeaderLabels([
-            "PID", "Name", "CPU %", "Memory %", "Status", "User", "Start Time"
-        ])
+        self.filter_bar = ProcessFilterBar()
+        
+        # Model/view table over the full snapshot; only visible rows are painted
+        self.process_model = ProcessTableModel(self)
+        self.process_model.limit = self.settings['max_processes']
+        self.process_model.timings = self.timings
+        self.process_model.process_filter = ProcessFilter(hide_system=not self.settings['show_system_processes'])
+        self.process_table = QTableView()
+        self.process_table.setModel(self.process_model)
         self.process_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
-        self.process_table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
-        self.process_table.setSelectionMode(QTableWidget.SelectionMode.SingleSelection)
+        self.process_table.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        self.process_table.verticalHeader().setVisible(False)
+        self.process_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.process_table.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
+        self.process_table.setContextMenuPolicy(Qt.CustomContextMenu)
+        self.process_table.setSortingEnabled(True)
+        self.apply_sort_setting()
+        
+        # Tree mode: processes grouped under their parent with subtree totals
+        self.process_tree = QTreeWidget()
+        self.process_tree.setColumnCount(7)
+        self.process_tree.setHeaderLabels([
+            "PID", "Name", "CPU %", "Memory %", "Tree CPU %", "Tree Memory %", "Processes"
+        ])
+        self.process_tree.header().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.process_tree.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
+        self.process_tree.setContextMenuPolicy(Qt.CustomContextMenu)
+        self.collector = self.make_local_collector()
+        self.tree_index = ProcessTreeIndex()
+        self.tree_indexes = {None: self.tree_index}
+        self.fleet = None
+        self.fleet_overview = None
+        self.tree_state = None
+        self.expanded_pids = set()
+        
+        # Group mode: one collapsible row per cgroup, totals read from the
+        # cgroup itself; member processes are only added when expanded
+        self.group_tree = QTreeWidget()
+        self.group_tree.setColumnCount(7)
+        self.group_tree.setHeaderLabels([
+            "Group / Process", "PID", "CPU %", "Memory", "Processes", "Accounting", "CPU History"
+        ])
+        self.group_tree.header().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.group_tree.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
+        self.group_tree.setContextMenuPolicy(Qt.CustomContextMenu)
+        self.expanded_groups = set()
+        
+        self.process_stack = QStackedWidget()
+        self.process_stack.addWidget(self.process_table)
+        self.process_stack.addWidget(self.process_tree)
+        self.process_stack.addWidget(self.group_tree)
         
         process_layout.addLayout(process_header)
-        process_layout.addWidget(self.process_table)
+        process_layout.addWidget(self.filter_bar)
+        process_layout.addWidget(self.process_stack)
         
         # Right panel for alerts
         self.alert_panel = AlertPanel()
@@ -935,6 +1574,28 @@ class SystemMonitor(QMainWindow):
         self.control_panel.theme_combo.currentTextChanged.connect(self.change_theme)
         self.control_panel.scheduling_btn.clicked.connect(self.show_scheduling_dialog)
         self.control_panel.settings_btn.clicked.connect(self.show_settings_dialog)
+        self.process_table.customContextMenuRequested.connect(self.show_process_menu)
+        self.process_table.doubleClicked.connect(self.table_row_activated)
+        self.process_tree.itemDoubleClicked.connect(self.tree_item_activated)
+        self.process_tree.customContextMenuRequested.connect(self.show_process_menu)
+        self.process_tree.itemExpanded.connect(self.tree_item_expanded)
+        self.process_tree.itemCollapsed.connect(self.tree_item_collapsed)
+        self.tree_toggle.toggled.connect(self.toggle_tree_view)
+        self.group_tree.customContextMenuRequested.connect(self.show_process_menu)
+        self.group_tree.itemExpanded.connect(self.group_item_expanded)
+        self.group_tree.itemCollapsed.connect(self.group_item_collapsed)
+        self.group_toggle.toggled.connect(self.toggle_group_view)
+        self.host_combo.currentIndexChanged.connect(self.select_host)
+        self.add_host_btn.clicked.connect(self.prompt_remote_host)
+        self.fleet_btn.clicked.connect(self.show_fleet_overview)
+        self.export_btn.clicked.connect(self.export_history)
+        self.lifetime_btn.clicked.connect(self.show_lifetime_dialog)
+        self.filter_bar.changed.connect(self.apply_process_filter)
+        
+        # Bulk process actions run off the GUI thread
+        self.action_pool = QThreadPool()
+        self.action_pool.setMaxThreadCount(4)
+        self.action_jobs = []
         
         # Add all components to main layout
         layout.addWidget(top_panel, 0, 0, 1, 2)
@@ -945,10 +1606,30 @@ class SystemMonitor(QMainWindow):
         layout.setColumnStretch(0, 8)  # Increased from 7 to 8
         layout.setColumnStretch(1, 2)  # Decreased from 3 to 2
         
-        # Setup update timer
-        self.timer = QTimer()
-        self.timer.timeout.connect(self.update_stats)
-        self.timer.start(1000)
+        # Cheap system metrics and the process scan are sampled independently
+        self.last_alert_time = {}
+        self.scheduler = SamplingScheduler(self, self.timings)
+        self.scheduler.add_source(
+            'system', self.update_system_stats,
+            self.settings['metrics_interval_ms'], hidden_interval_ms=1000
+        )
+        self.scheduler.add_source(
+            'processes', self.update_process_list,
+            self.settings['update_interval'] * 1000, budget_ms=self.settings['scan_budget_ms']
+        )
+        self.first_show = True
+        
+        # Sampling only updates state; widgets are redrawn at most once per
+        # display frame from the latest state
+        self.system_state = None
+        self.process_snapshot = None
+        self.renderer = RenderScheduler(self, self.timings)
+        self.renderer.add_part('system', self.render_system_stats)
+        self.renderer.add_part('processes', self.render_process_list)
+        
+        # Debug overlay with the monitor's own overhead
+        self.debug_overlay = DebugOverlay(self.timings, self)
+        QShortcut(QKeySequence("F12"), self, self.debug_overlay.toggle)
         
         # Window settings
         self.setMinimumSize(1400, 800)  # Increased width from 1200 to 1400
@@ -980,7 +1661,7 @@ class SystemMonitor(QMainWindow):
                 border: 1px solid {colors['border']};
                 border-radius: 10px;
             }}
-            QTableWidget {{
+            QTableView {{
                 background-color: {colors['secondary_bg']};
                 color: {colors['text']};
                 gridline-color: {colors['border']};
@@ -1005,22 +1686,27 @@ class SystemMonitor(QMainWindow):
                 background-color: {colors['progress_normal']};
                 border-radius: 5px;
             }}
-            QTableWidget::item {{
+            QTableView::item {{
                 padding: 5px;
             }}
-            QTableWidget::item:selected {{
+            QTableView::item:selected {{
                 background-color: {colors['button_settings']};
                 color: {colors['text']};
             }}
         """)
         
         # Update plot colors
-        self.cpu_plot.setBackground(colors['secondary_bg'])
-        self.mem_plot.setBackground(colors['secondary_bg'])
-        
-        # Update bar colors using setOpts
-        self.cpu_bars.setOpts(brush=colors['graph_cpu'])
-        self.mem_bars.setOpts(brush=colors['graph_memory'])
+        if self.cpu_plot is not None:
+            self.cpu_plot.setBackground(colors['secondary_bg'])
+            self.mem_plot.setBackground(colors['secondary_bg'])
+            
+            # Update bar colors using setOpts
+            self.cpu_bars.setOpts(brush=colors['graph_cpu'])
+            self.mem_bars.setOpts(brush=colors['graph_memory'])
+            
+            self.io_plot.setBackground(colors['secondary_bg'])
+            self.io_curves[0].setPen(colors['graph_disk'], width=2)
+            self.io_curves[1].setPen(colors['graph_network'], width=2)
         
         # Update progress bar colors based on usage
         self.update_progress_colors()
@@ -1028,6 +1714,9 @@ class SystemMonitor(QMainWindow):
         # Apply theme to panels
         self.alert_panel.apply_theme(colors)
         self.control_panel.apply_theme(colors)
+        self.debug_overlay.apply_theme(colors)
+        if self.fleet_overview is not None:
+            self.fleet_overview.apply_theme(colors)
         
         # Update CPU and Memory labels with larger font
         self.cpu_label.setStyleSheet(f"font-size: 16px; font-weight: bold; color: {colors['text']};")
@@ -1035,6 +1724,10 @@ class SystemMonitor(QMainWindow):
         self.cpu_value.setStyleSheet(f"font-size: 24px; font-weight: bold; color: {colors['text']};")
         self.mem_value.setStyleSheet(f"font-size: 24px; font-weight: bold; color: {colors['text']};")
         self.mem_label_detail.setStyleSheet(f"font-size: 14px; color: {colors['text']};")
+        self.io_label.setStyleSheet(f"font-size: 16px; font-weight: bold; color: {colors['text']};")
+        self.disk_value.setStyleSheet(f"font-size: 16px; font-weight: bold; color: {colors['graph_disk']};")
+        self.net_value.setStyleSheet(f"font-size: 16px; font-weight: bold; color: {colors['graph_network']};")
+        self.io_detail.setStyleSheet(f"font-size: 14px; color: {colors['text']};")
         
     def update_progress_colors(self):
         # CPU Progress Bar
@@ -1067,91 +1760,729 @@ class SystemMonitor(QMainWindow):
             }}
         """)
         
+    def visible_pids(self):
+        # PIDs of the table rows currently on screen
+        rows = self.process_model.rowCount()
+        if not rows:
+            return []
+        first = max(self.process_table.rowAt(0), 0)
+        last = self.process_table.rowAt(self.process_table.viewport().height() - 1)
+        last = rows - 1 if last < 0 else last
+        last = min(last, first + self.MAX_IO_ROWS - 1)
+        return [self.process_model.pid_at(row) for row in range(first, last + 1)]
+        
+    def selected_pids(self):
+        if self.tree_toggle.isChecked():
+            return [int(item.text(0)) for item in self.process_tree.selectedItems()]
+        if self.group_toggle.isChecked():
+            # Group rows themselves aren't processes
+            return [int(item.text(1)) for item in self.group_tree.selectedItems() if item.parent() is not None]
+        rows = self.process_table.selectionModel().selectedRows()
+        return [self.process_model.pid_at(index.row()) for index in rows]
+        
     def kill_selected_process(self):
-        selected_items = self.process_table.selectedItems()
-        if not selected_items:
+        # Terminate every selected process, escalating to SIGKILL if needed
+        self.run_bulk_action('terminate', self.selected_pids())
+        
+    def show_process_menu(self, pos):
+        pids = self.selected_pids()
+        if not pids:
+            return
+            
+        menu = QMenu(self)
+        for action in ('terminate', 'kill', 'kill_tree', 'suspend', 'resume'):
+            menu_action = menu.addAction(ProcessActionTask.ACTION_LABELS[action])
+            menu_action.triggered.connect(lambda checked=False, a=action: self.run_bulk_action(a, pids))
+        menu.addSeparator()
+        menu.addAction("Renice...").triggered.connect(lambda: self.renice_processes(pids))
+        menu.addAction("Set CPU Affinity...").triggered.connect(lambda: self.set_processes_affinity(pids))
+        # The table, the tree and the group view all open this menu; pos is
+        # relative to whichever one asked
+        view = self.sender() or self.process_stack.currentWidget()
+        menu.exec(view.viewport().mapToGlobal(pos))
+        
+    def renice_processes(self, pids):
+        value, ok = QInputDialog.getInt(self, "Renice", f"Nice value for {len(pids)} process(es):", 0, -20, 19)
+        if ok:
+            self.run_bulk_action('renice', pids, value)
+            
+    def set_processes_affinity(self, pids):
+        cpu_count = psutil.cpu_count() or 1
+        text, ok = QInputDialog.getText(
+            self, "CPU Affinity", f"CPUs for {len(pids)} process(es) (e.g. 0,1 of 0-{cpu_count - 1}):"
+        )
+        if not ok:
+            return
+        try:
+            cpus = sorted({int(cpu) for cpu in text.split(',') if cpu.strip()})
+        except ValueError:
+            self.alert_panel.add_alert(f"Invalid CPU list: {text}", "critical")
+            return
+        if not cpus or cpus[0] < 0 or cpus[-1] >= cpu_count:
+            self.alert_panel.add_alert(f"Invalid CPU list: {text}", "critical")
             return
+        self.run_bulk_action('affinity', pids, cpus)
+        
+    def run_bulk_action(self, action, pids, argument=None):
+        # The agent protocol is read-only
+        if self.current_host() is not None:
+            self.alert_panel.add_alert("Process actions are only available on the local host", "warning")
+            return
+        # Never act on the monitor itself
+        pids = [pid for pid in pids if pid != os.getpid()]
+        if not pids:
+            return
+            
+        job = BulkActionJob(action, pids, argument, self)
+        job.completed.connect(self.bulk_action_finished)
+        self.action_jobs.append(job)
+        job.start(self.action_pool)
+        
+    def bulk_action_finished(self, result):
+        job = self.sender()
+        if job in self.action_jobs:
+            self.action_jobs.remove(job)
+            job.deleteLater()
+            
+        level = "critical" if result.has_errors() else "warning"
+        self.alert_panel.add_alert(result.summary(), level)
+        for label, pids in (("Access denied", result.access_denied), ("Failed", result.failed)):
+            if pids:
+                shown = ", ".join(str(pid) for pid in pids[:10])
+                more = f" (+{len(pids) - 10} more)" if len(pids) > 10 else ""
+                self.alert_panel.add_alert(f"{label}: {shown}{more}", "critical")
+        
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.debug_overlay.reposition()
+        
+    def changeEvent(self, event):
+        if event.type() == QEvent.WindowStateChange:
+            self.scheduler.set_hidden(self.isMinimized() or not self.isVisible())
+            self.renderer.flush()
+        super().changeEvent(event)
+        
+    def showEvent(self, event):
+        self.scheduler.set_hidden(self.isMinimized())
+        super().showEvent(event)
+        self.renderer.flush()
+        if self.first_show:
+            # Let the window paint first, then show a cheap sample, then load
+            # the graphs and run the first full process scan
+            self.first_show = False
+            QTimer.singleShot(0, self.start_sampling)
             
-        row = selected_items[0].row()
-        pid = int(self.process_table.item(row, 0).text())
+    def start_sampling(self):
+        self.renderer.attach()
+        self.lifetime.start(self.settings['lifetime_source'])
+        self.update_system_stats()
+        # Draw the first sample before pyqtgraph is loaded
+        self.renderer.render_frame()
+        QTimer.singleShot(0, self.setup_graphs)
+        QTimer.singleShot(0, self.update_process_list)
+        self.scheduler.start()
+        
+    def setup_graphs(self):
+        if self.cpu_plot is not None:
+            return
+        self.cpu_plot, self.cpu_bars = self.make_bar_plot(self.cpu_data, self.current_theme['graph_cpu'])
+        self.mem_plot, self.mem_bars = self.make_bar_plot(self.mem_data, self.current_theme['graph_memory'])
+        self.io_plot, self.io_curves = self.make_rate_plot(
+            (self.disk_data, self.net_data), (self.current_theme['graph_disk'], self.current_theme['graph_network'])
+        )
+        for placeholder, plot in (
+            (self.cpu_plot_placeholder, self.cpu_plot),
+            (self.mem_plot_placeholder, self.mem_plot),
+            (self.io_plot_placeholder, self.io_plot)
+        ):
+            placeholder.parentWidget().layout().replaceWidget(placeholder, plot)
+            placeholder.deleteLater()
+        self.cpu_plot.setBackground(self.current_theme['secondary_bg'])
+        self.mem_plot.setBackground(self.current_theme['secondary_bg'])
+        self.io_plot.setBackground(self.current_theme['secondary_bg'])
+        
+    def make_bar_plot(self, data, color):
+        pg = load_pyqtgraph()
+        plot = pg.PlotWidget(background=None)
+        plot.setMaximumHeight(100)
+        plot.setYRange(0, 100)
+        plot.showGrid(True, True, alpha=0.3)
+        
+        bars = pg.BarGraphItem(
+            x=range(len(data)),
+            height=data,
+            width=0.8,
+            brush=color,
+            pen=None
+        )
+        plot.addItem(bars)
+        plot.getAxis('bottom').setStyle(showValues=False)
+        return plot, bars
+        
+    def make_rate_plot(self, series, colors):
+        # Throughput has no fixed scale, so these are auto-ranged lines
+        pg = load_pyqtgraph()
+        plot = pg.PlotWidget(background=None)
+        plot.setMaximumHeight(100)
+        plot.showGrid(True, True, alpha=0.3)
+        plot.getAxis('bottom').setStyle(showValues=False)
+        plot.getAxis('left').setStyle(showValues=False)
+        curves = [plot.plot(data, pen=pg.mkPen(color, width=2)) for data, color in zip(series, colors)]
+        return plot, curves
+        
+    def hideEvent(self, event):
+        self.scheduler.set_hidden(True)
+        # Scans pause while hidden, let another monitor publish meanwhile
+        if isinstance(self.collector, SharedCollector):
+            self.collector.release()
+        super().hideEvent(event)
+        
+    def closeEvent(self, event):
+        if self.persist:
+            self.save_state()
+        if isinstance(self.collector, SharedCollector):
+            self.collector.close()
+        super().closeEvent(event)
+        
+    def save_state(self):
         try:
-            psutil.Process(pid).terminate()
-            self.alert_panel.add_alert(f"Process {pid} terminated", "warning")
-        except psutil.NoSuchProcess:
-            self.alert_panel.add_alert(f"Process {pid} not found", "critical")
-        except psutil.AccessDenied:
-            self.alert_panel.add_alert(f"Access denied to terminate process {pid}", "critical")
+            save_state(
+                self.history, {name: getattr(self, name) for name in self.GRAPHS},
+                self.THEMES[self.control_panel.theme_combo.currentIndex()],
+                self.alert_panel.saved_alerts(), self.collector.export_static()
+            )
+        except OSError as e:
+            # Nowhere to report it any more, the window is closing
+            sys.stderr.write(f"Could not save session state: {e}\n")
+            
+    def restore_state(self):
+        # Graphs, history, theme and alerts from the last session, plus the
+        # static per-PID attributes so the first scan doesn't re-read them
+        state = load_state()
+        if state is None:
+            return
+        if state['history'] is not None and state['history_columns'] == self.history.columns:
+            self.history.restore(state['history'])
+        for name in self.GRAPHS:
+            values = state['graphs'].get(name)
+            if values is not None:
+                # The interval may have changed since, keep the latest samples
+                setattr(self, name, fit_samples(np.array(values, dtype=np.float64), len(getattr(self, name))))
+        if state['theme'] in self.THEMES:
+            self.control_panel.theme_combo.setCurrentIndex(self.THEMES.index(state['theme']))
+        self.alert_panel.restore_alerts(state['alerts'])
+        if state['static'] is not None:
+            self.collector.import_static(state['static'])
+        
+    def graph_samples(self):
+        return max(1, -(-self.GRAPH_SECONDS * 1000 // self.settings['metrics_interval_ms']))
+        
+    def resize_graphs(self):
+        # After a change of the CPU/Memory interval
+        size = self.graph_samples()
+        if size == len(self.cpu_data):
+            return
+        self.cpu_data = fit_samples(self.cpu_data, size)
+        self.mem_data = fit_samples(self.mem_data, size)
+        if self.cpu_bars is not None:
+            self.cpu_bars.setOpts(x=np.arange(size), height=self.cpu_data)
+            self.mem_bars.setOpts(x=np.arange(size), height=self.mem_data)
+        
+    def local_collector_name(self):
+        # Name of the collector make_local_collector() would create
+        if self.settings['share_scans'] and SharedCollector.available():
+            return SharedCollector.collector_name(self.settings['fast_collector'])
+        return collector_name(self.settings['fast_collector'])
+        
+    def make_local_collector(self):
+        if self.settings['share_scans'] and SharedCollector.available():
+            return SharedCollector(self.settings['fast_collector'])
+        return make_collector(self.settings['fast_collector'])
+        
+    def check_threshold(self, key, value, threshold, message):
+        # The fast metrics tick several times per update interval, alert at
+        # most once per interval for each metric
+        if value <= threshold:
+            return
+        now = time.monotonic()
+        if now - self.last_alert_time.get(key, 0) < self.settings['update_interval']:
+            return
+        self.last_alert_time[key] = now
+        self.alert_panel.add_alert(message, "critical")
         
     def update_stats(self):
-        # Update CPU
-        cpu_percent = psutil.cpu_percent()
-        self.cpu_value.setText(f"{cpu_percent}%")
-        self.cpu_progress.setValue(int(cpu_percent))
+        self.update_system_stats()
+        self.update_process_list()
+        
+    def update_system_stats(self):
+        timings = self.timings
+        host = self.current_host()
+        if host is None:
+            with timings.stage('system_sample'):
+                cpu_percent = psutil.cpu_percent()
+                mem = psutil.virtual_memory()
+            with timings.stage('io_sample'):
+                io = self.io_sampler.sample()
+            system = {
+                'time': time.time(),
+                'cpu_percent': cpu_percent,
+                'memory_percent': mem.percent,
+                'memory_used': mem.used,
+                'memory_total': mem.total,
+                **io
+            }
+            self.record_system_sample(system)
+            # Also restores it after a remote host's total was shown
+            self.process_model.total_memory = mem.total
+        else:
+            system = host.snapshot()[1]
+        cpu_percent = system.get('cpu_percent', 0.0)
+        mem_percent = system.get('memory_percent', 0.0)
+            
+        # Every sample goes into the graphs and alerts; widgets are only
+        # redrawn on the next frame, see render_system_stats
+        self.system_state = system
         self.cpu_data = np.roll(self.cpu_data, -1)
         self.cpu_data[-1] = cpu_percent
-        self.cpu_bars.setOpts(height=self.cpu_data)
-        
-        # Update progress bar colors
-        self.update_progress_colors()
+        self.mem_data = np.roll(self.mem_data, -1)
+        self.mem_data[-1] = mem_percent
+        self.disk_data = np.roll(self.disk_data, -1)
+        self.disk_data[-1] = system.get('disk_read_bps', 0.0) + system.get('disk_write_bps', 0.0)
+        self.net_data = np.roll(self.net_data, -1)
+        self.net_data[-1] = system.get('net_recv_bps', 0.0) + system.get('net_sent_bps', 0.0)
+        self.check_threshold('cpu', cpu_percent, self.alert_panel.cpu_threshold, f"High CPU usage: {cpu_percent}%")
+        self.check_threshold('memory', mem_percent, self.alert_panel.memory_threshold, f"High Memory usage: {mem_percent}%")
+        self.renderer.request('system')
+        
+    def render_system_stats(self):
+        timings = self.timings
+        system = self.system_state
+        cpu_percent = system.get('cpu_percent', 0.0)
+        mem_percent = system.get('memory_percent', 0.0)
+        mem_used = system.get('memory_used', 0)
+        mem_total = system.get('memory_total', 0)
         
-        # Check CPU threshold
-        if cpu_percent > self.alert_panel.cpu_threshold:
-            self.alert_panel.add_alert(f"High CPU usage: {cpu_percent}%", "critical")
+        # Update CPU
+        with timings.stage('labels'):
+            self.cpu_value.setText(f"{cpu_percent}%")
+            self.cpu_progress.setValue(int(cpu_percent))
+        if self.cpu_bars is not None:
+            with timings.stage('graph_setOpts'):
+                self.cpu_bars.setOpts(height=self.cpu_data)
         
         # Update Memory
-        mem = psutil.virtual_memory()
-        mem_percent = mem.percent
-        used_gb = mem.used / (1024 ** 3)
-        total_gb = mem.total / (1024 ** 3)
-        
-        self.mem_value.setText(f"{mem_percent}%")
-        self.mem_label_detail.setText(f"Used: {used_gb:.1f} GB / Total: {total_gb:.1f} GB")
-        self.mem_progress.setValue(int(mem_percent))
-        self.mem_data = np.roll(self.mem_data, -1)
-        self.mem_data[-1] = mem_percent
-        self.mem_bars.setOpts(height=self.mem_data)
+        used_gb = mem_used / (1024 ** 3)
+        total_gb = mem_total / (1024 ** 3)
+        
+        with timings.stage('labels'):
+            self.mem_value.setText(f"{mem_percent}%")
+            self.mem_label_detail.setText(f"Used: {used_gb:.1f} GB / Total: {total_gb:.1f} GB")
+            self.mem_progress.setValue(int(mem_percent))
+        if self.mem_bars is not None:
+            with timings.stage('graph_setOpts'):
+                self.mem_bars.setOpts(height=self.mem_data)
+        
+        # Update Disk & Network
+        with timings.stage('labels'):
+            self.disk_value.setText(
+                f"Disk: R {format_rate(system.get('disk_read_bps', 0.0))} · W {format_rate(system.get('disk_write_bps', 0.0))}"
+            )
+            self.net_value.setText(
+                f"Net: ↓ {format_rate(system.get('net_recv_bps', 0.0))} · ↑ {format_rate(system.get('net_sent_bps', 0.0))}"
+            )
+            busiest = self.io_sampler.busiest() if self.current_host() is None else []
+            self.io_detail.setText("  ".join(f"{name} {format_rate(rate)}" for name, rate in busiest))
+        if self.io_curves is not None:
+            with timings.stage('graph_setOpts'):
+                self.io_curves[0].setData(self.disk_data)
+                self.io_curves[1].setData(self.net_data)
         
-        # Check Memory threshold
-        if mem_percent > self.alert_panel.memory_threshold:
-            self.alert_panel.add_alert(f"High Memory usage: {mem_percent}%", "critical")
+        # Update progress bar colors
+        with timings.stage('progress_colors'):
+            self.update_progress_colors()
+        
+    def record_system_sample(self, system):
+        # Local samples only; remote hosts keep their own history
+        if self.exporter is not None:
+            self.exporter.publish(system=system)
+        now = system['time']
+        if now - self.last_history_time >= self.HISTORY_INTERVAL:
+            self.last_history_time = now
+            self.history.append(now, [
+                self.process_count if column == 'process_count' else system[column]
+                for column in self.history.columns[1:]
+            ])
+            
+    def set_metrics_port(self, port):
+        if self.exporter is not None and self.exporter.port == port:
+            return
+        if self.exporter is not None:
+            self.exporter.stop()
+            self.exporter = None
+        if not port:
+            return
+        exporter = MetricsExporter(port)
+        try:
+            exporter.start()
+        except OSError as e:
+            self.alert_panel.add_alert(f"Metrics endpoint on port {port} failed: {e}", "critical")
+            return
+        self.exporter = exporter
+        self.alert_panel.add_alert(f"Serving metrics on http://127.0.0.1:{port}/metrics", "info")
         
+    def export_history(self):
+        path, _ = QFileDialog.getSaveFileName(
+            self, "Export History", "process-monitor-history.csv", "CSV (*.csv);;Parquet (*.parquet)"
+        )
+        if not path:
+            return
+        task = HistoryExportTask(self.history, path)
+        task.signals.finished.connect(self.history_export_finished)
+        self.action_pool.start(task)
+        
+    def history_export_finished(self, result):
+        path, rows, error = result
+        if error:
+            self.alert_panel.add_alert(f"Export to {path} failed: {error}", "critical")
+        else:
+            self.alert_panel.add_alert(f"Exported {rows} samples to {path}", "info")
+            
+    def update_process_list(self):
         # Update Process List with settings
-        processes = []
-        for proc in psutil.process_iter(['pid', 'name', 'cpu_percent', 'memory_percent', 'status', 'username', 'create_time']):
-            try:
-                pinfo = proc.info
-                if not self.settings['show_system_processes'] and pinfo['username'] == 'root':
-                    continue
-                    
-                cpu_percent = pinfo['cpu_percent'] if pinfo['cpu_percent'] is not None else 0.0
-                mem_percent = pinfo['memory_percent'] if pinfo['memory_percent'] is not None else 0.0
-                create_time = datetime.fromtimestamp(pinfo['create_time']).strftime('%H:%M:%S')
-                processes.append([
-                    str(pinfo['pid']),
-                    pinfo['name'],
-                    f"{cpu_percent:.1f}",
-                    f"{mem_percent:.1f}",
-                    pinfo['status'],
-                    pinfo['username'],
-                    create_time
-                ])
-            except (psutil.NoSuchProcess, psutil.AccessDenied):
-                pass
-        
-        # Sort based on settings
-        if self.settings['sort_by_cpu']:
-            processes.sort(key=lambda x: float(x[2]), reverse=True)
+        if self.fleet is not None:
+            self.update_host_labels()
+        host = self.current_host()
+        if host is None:
+            with self.timings.stage('process_iter'):
+                snapshot = self.collector.collect()
+            self.process_count = len(snapshot)
+            with self.timings.stage('lifetime'):
+                self.lifetime.observe(snapshot)
+            if self.cgroups is not None:
+                with self.timings.stage('cgroups'):
+                    self.cgroups.update(snapshot, self.process_model.total_memory)
+            if self.exporter is not None:
+                cgroups = self.cgroups
+                groups = None if cgroups is None else (cgroups.keys, cgroups.cpu_percent, cgroups.memory_bytes)
+                self.exporter.publish(snapshot=snapshot, timings=self.timings, groups=groups)
+            if self.process_stack.currentWidget() is self.process_table:
+                with self.timings.stage('process_io'):
+                    self.process_model.io_rates = self.process_io.sample(self.visible_pids())
+            with self.timings.stage('memory_detail'):
+                self.memory_detail.update(snapshot, self.process_model.total_memory)
+            self.process_model.memory_details = self.memory_detail.results
         else:
-            processes.sort(key=lambda x: float(x[3]), reverse=True)
+            # Remote snapshots are rebuilt from the agent's deltas on demand
+            with self.timings.stage('remote_snapshot'):
+                snapshot, system = host.snapshot()
+            self.process_model.io_rates = {}
+            self.process_model.memory_details = {}
+            self.process_model.total_memory = system.get('memory_total', 0)
+        with self.timings.stage('tree_index'):
+            new_pids, exited_pids = self.tree_index.update(snapshot)
+        self.expanded_pids.difference_update(exited_pids)
+        # A remote host without a sample yet has nothing to compare against
+        if self.settings['anomaly_z'] and (host is None or system):
+            with self.timings.stage('anomalies'):
+                detections = self.anomalies.update(
+                    snapshot, self.system_state if host is None else system, self.process_model.total_memory
+                )
+            self.report_anomalies(detections)
+        self.process_snapshot = snapshot
+        self.renderer.request('processes')
+            
+        if self.profile_capture is not None:
+            report = self.profile_capture.tick()
+            if report is not None:
+                self.profile_capture = None
+                self.debug_overlay.profile_finished()
+                self.alert_panel.add_alert(f"Profile written to {report}", "info")
+                
+    def report_anomalies(self, detections):
+        # A burst (e.g. a build starting) can trip many processes at once,
+        # list the strongest and summarize the rest
+        for detection in detections[:self.MAX_ANOMALY_ALERTS]:
+            self.alert_panel.add_alert(detection.message, detection.level)
+        if len(detections) > self.MAX_ANOMALY_ALERTS:
+            self.alert_panel.add_alert(f"... and {len(detections) - self.MAX_ANOMALY_ALERTS} more anomalies", "info")
+            
+    def render_process_list(self):
+        snapshot = self.process_snapshot
+        if self.tree_toggle.isChecked():
+            with self.timings.stage('tree_items'):
+                self.update_process_tree(snapshot)
+        elif self.group_toggle.isChecked():
+            with self.timings.stage('group_items'):
+                self.update_group_tree(snapshot)
+        else:
+            self.filter_bar.set_users(snapshot.codes('usernames')[0])
+            self.set_process_snapshot(snapshot)
+            
+    def start_profile_capture(self, ticks, trace_memory):
+        if self.profile_capture is not None:
+            return
+        output_dir = os.path.join(tempfile.gettempdir(), "process-visualization-profiles")
+        self.profile_capture = ProfileCapture(ticks, output_dir, trace_memory)
+        self.profile_capture.start()
+        self.alert_panel.add_alert(f"Profiling the next {ticks} process scans", "info")
+
+    def current_host(self):
+        address = self.host_combo.currentData()
+        return None if address is None else self.fleet.hosts.get(address)
+        
+    def ensure_fleet(self):
+        if self.fleet is None:
+            # Only pull in asyncio and the protocol once a remote host is used
+            from remote_agent import FleetClient
+            self.fleet = FleetClient()
+        return self.fleet
+        
+    def add_remote_host(self, address):
+        self.ensure_fleet()
+        if address not in self.fleet.hosts:
+            self.fleet.add_host(address)
+            self.tree_indexes[address] = ProcessTreeIndex()
+            self.host_combo.addItem(address, address)
+        return self.host_combo.findData(address)
+        
+    def prompt_remote_host(self):
+        address, ok = QInputDialog.getText(
+            self, "Connect to Agent", "Agent address (tcp://host:port or unix:///path):"
+        )
+        address = address.strip()
+        if ok and address:
+            self.host_combo.setCurrentIndex(self.add_remote_host(address))
+            
+    def update_host_labels(self):
+        for address in self.fleet.take_changed('host_combo'):
+            host = self.fleet.hosts.get(address)
+            index = self.host_combo.findData(address)
+            if host is None or index < 0:
+                continue
+            label = host.label if host.connected else f"{host.label} (offline)"
+            # Alert on the transition only, not on every reconnect attempt
+            if label != self.host_combo.itemText(index) and host.error:
+                self.alert_panel.add_alert(f"{host.label}: {host.error}", "warning")
+            self.host_combo.setItemText(index, label)
+                
+    def show_fleet_overview(self):
+        if self.fleet_overview is None:
+            from fleet_view import FleetOverview
+            self.fleet_overview = FleetOverview(self.ensure_fleet(), self.current_theme, self.timings, self)
+            self.fleet_overview.set_thresholds(self.alert_panel.cpu_threshold, self.alert_panel.memory_threshold)
+            self.fleet_overview.host_activated.connect(self.activate_host)
+        self.fleet_overview.show()
+        self.fleet_overview.raise_()
+        
+    def activate_host(self, address):
+        self.host_combo.setCurrentIndex(self.host_combo.findData(address))
+        self.raise_()
+        self.activateWindow()
+        
+    def select_host(self, index):
+        # Each host keeps its own tree index so switching back is incremental
+        self.tree_index = self.tree_indexes[self.host_combo.itemData(index)]
+        # Cgroups are only read for local processes
+        local = self.host_combo.itemData(index) is None
+        if not local:
+            self.group_toggle.setChecked(False)
+        self.group_toggle.setEnabled(local and self.cgroups is not None)
+        self.expanded_pids.clear()
+        self.process_tree.clear()
+        self.tree_state = None
+        # Another host's series would all look like anomalies
+        self.anomalies.reset()
+        self.update_stats()
+        
+    def set_process_snapshot(self, snapshot):
+        # Keep the selection and scroll position across the model reset
+        selected = self.selected_pids()
+        scroll = self.process_table.verticalScrollBar().value()
+        self.process_model.set_snapshot(snapshot)
+        self.restore_process_selection(selected)
+        self.process_table.verticalScrollBar().setValue(scroll)
+        self.filter_bar.set_match_count(self.process_model.rowCount(), len(snapshot))
+        
+    def restore_process_selection(self, pids):
+        if not pids:
+            return
+        selection = QItemSelection()
+        last_column = self.process_model.columnCount() - 1
+        for row in self.process_model.rows_of_pids(pids):
+            selection.select(self.process_model.index(row, 0), self.process_model.index(row, last_column))
+        self.process_table.selectionModel().select(selection, QItemSelectionModel.ClearAndSelect)
+        
+    def apply_process_filter(self):
+        process_filter = self.filter_bar.build_filter(not self.settings['show_system_processes'])
+        if process_filter is None:
+            return
+        selected = self.selected_pids()
+        self.process_model.set_filter(process_filter)
+        self.restore_process_selection(selected)
+        self.filter_bar.set_match_count(self.process_model.rowCount(), len(self.process_model.snapshot))
+        
+    def apply_sort_setting(self):
+        column = 2 if self.settings['sort_by_cpu'] else 3
+        self.process_table.sortByColumn(column, Qt.DescendingOrder)
+        
+    def toggle_tree_view(self, checked):
+        if checked:
+            self.group_toggle.setChecked(False)
+        self.process_stack.setCurrentWidget(self.process_tree if checked else self.process_table)
+        # Filters apply to the flat list only
+        self.filter_bar.setVisible(not checked)
+        # Redraw from the last scan rather than scanning again
+        if self.process_snapshot is not None:
+            self.renderer.request('processes')
+        
+    def toggle_group_view(self, checked):
+        if checked:
+            self.tree_toggle.setChecked(False)
+        self.process_stack.setCurrentWidget(self.group_tree if checked else self.process_table)
+        self.filter_bar.setVisible(not checked)
+        if self.process_snapshot is not None:
+            self.renderer.request('processes')
+            
+    def update_group_tree(self, snapshot):
+        cgroups = self.cgroups
+        if cgroups is None or len(cgroups.codes) != len(snapshot):
+            return
+        key = cgroups.cpu_percent if self.settings['sort_by_cpu'] else cgroups.memory_bytes
+        scroll = self.group_tree.verticalScrollBar().value()
+        self.group_tree.setUpdatesEnabled(False)
+        self.group_tree.clear()
+        for position in np.argsort(-key, kind='stable').tolist():
+            group = cgroups.keys[position]
+            item = QTreeWidgetItem(self.group_tree, [
+                cgroup_label(group),
+                "",
+                f"{cgroups.cpu_percent[position]:.1f}",
+                format_bytes(cgroups.memory_bytes[position]),
+                str(cgroups.process_counts[position]),
+                self.GROUP_ACCOUNTING[bool(cgroups.exact_cpu[position]), bool(cgroups.exact_memory[position])],
+                sparkline(cgroups.series(group)[0][-30:])
+            ])
+            item.setData(0, Qt.UserRole, group)
+            item.setToolTip(0, group or "PIDs whose cgroup could not be read")
+            item.setToolTip(5, "cgroup: read from the cgroup's cpu.stat/memory.current; "
+                               "summed: added up over member processes")
+            item.setChildIndicatorPolicy(QTreeWidgetItem.ChildIndicatorPolicy.ShowIndicator)
+            if group in self.expanded_groups:
+                self.populate_group_children(item)
+                item.setExpanded(True)
+        self.group_tree.setUpdatesEnabled(True)
+        self.group_tree.verticalScrollBar().setValue(scroll)
+        
+    def populate_group_children(self, item):
+        if item.childCount():
+            return
+        snapshot = self.process_snapshot
+        rows = self.cgroups.rows_of(item.data(0, Qt.UserRole))
+        key = snapshot.cpu_percent if self.settings['sort_by_cpu'] else snapshot.memory_percent
+        for row in rows[np.argsort(-key[rows], kind='stable')].tolist():
+            QTreeWidgetItem(item, [
+                snapshot.names[row],
+                str(int(snapshot.pids[row])),
+                f"{snapshot.cpu_percent[row]:.1f}",
+                format_bytes(snapshot.memory_percent[row] * self.process_model.total_memory / 100),
+                "", "", ""
+            ])
             
-        self.process_table.setRowCount(min(len(processes), self.settings['max_processes']))
+    def group_item_expanded(self, item):
+        if item.parent() is None:
+            self.expanded_groups.add(item.data(0, Qt.UserRole))
+            self.populate_group_children(item)
+            
+    def group_item_collapsed(self, item):
+        if item.parent() is None:
+            self.expanded_groups.discard(item.data(0, Qt.UserRole))
+        
+    def update_process_tree(self, snapshot):
+        # The tree always covers every process: hiding root-owned processes
+        # would hide the ancestors of everything else
+        parents = self.tree_index.parent_positions(snapshot)
+        tree_cpu, tree_memory, tree_count = self.tree_index.subtree_totals(snapshot, parents)
+        self.tree_state = (snapshot, tree_cpu, tree_memory, tree_count)
+        
+        scroll = self.process_tree.verticalScrollBar().value()
+        self.process_tree.setUpdatesEnabled(False)
+        self.process_tree.clear()
+        roots = np.nonzero(parents < 0)[0]
+        for row in self.sorted_tree_rows(roots):
+            self.add_tree_item(self.process_tree.invisibleRootItem(), row)
+        self.process_tree.setUpdatesEnabled(True)
+        self.process_tree.verticalScrollBar().setValue(scroll)
+        
+    def sorted_tree_rows(self, rows):
+        snapshot, tree_cpu, tree_memory, _ = self.tree_state
+        key = tree_cpu if self.settings['sort_by_cpu'] else tree_memory
+        rows = np.asarray(rows, dtype=np.int64)
+        return rows[np.argsort(-key[rows], kind='stable')]
+        
+    def add_tree_item(self, parent_item, row):
+        snapshot, tree_cpu, tree_memory, tree_count = self.tree_state
+        pid = int(snapshot.pids[row])
+        item = QTreeWidgetItem(parent_item, [
+            str(pid),
+            snapshot.names[row],
+            f"{snapshot.cpu_percent[row]:.1f}",
+            f"{snapshot.memory_percent[row]:.1f}",
+            f"{tree_cpu[row]:.1f}",
+            f"{tree_memory[row]:.1f}",
+            str(tree_count[row])
+        ])
+        if tree_count[row] > 1:
+            item.setChildIndicatorPolicy(QTreeWidgetItem.ChildIndicatorPolicy.ShowIndicator)
+            # Only expanded subtrees get child items, so cost follows what's visible
+            if pid in self.expanded_pids:
+                self.populate_tree_children(item)
+                item.setExpanded(True)
+        return item
+        
+    def populate_tree_children(self, item):
+        snapshot = self.tree_state[0]
+        if item.childCount():
+            return
+        children = snapshot.positions(list(self.tree_index.children_of(int(item.text(0)))))
+        for row in self.sorted_tree_rows(children[children >= 0]):
+            self.add_tree_item(item, row)
+            
+    def tree_item_expanded(self, item):
+        self.expanded_pids.add(int(item.text(0)))
+        self.populate_tree_children(item)
         
-        for i, proc in enumerate(processes[:self.settings['max_processes']]):
-            for j, value in enumerate(proc):
-                item = QTableWidgetItem(str(value))
-                item.setTextAlignment(Qt.AlignCenter)
-                self.process_table.setItem(i, j, item)
+    def tree_item_collapsed(self, item):
+        self.expanded_pids.discard(int(item.text(0)))
 
+    def table_row_activated(self, index):
+        model = self.process_model
+        row = model.rows[index.row()]
+        self.show_process_detail(model.pid_at(index.row()), float(model.snapshot.create_times[row]),
+                                 model.snapshot.names[row])
+        
+    def tree_item_activated(self, item):
+        snapshot = self.tree_state[0]
+        row = int(snapshot.positions([int(item.text(0))])[0])
+        if row >= 0:
+            self.show_process_detail(int(snapshot.pids[row]), float(snapshot.create_times[row]), snapshot.names[row])
+            
+    def show_process_detail(self, pid, create_time, name):
+        if self.current_host() is not None:
+            self.alert_panel.add_alert("Process details are only available for local processes", "info")
+            return
+        if self.detail_pane is None:
+            # Loaded on first use, like the scheduling simulator
+            from process_detail import ProcessDetailPane
+            self.detail_pane = ProcessDetailPane(self)
+            self.addDockWidget(Qt.RightDockWidgetArea, self.detail_pane)
+        self.detail_pane.set_process(pid, create_time, name)
+        
+    def show_lifetime_dialog(self):
+        if self.lifetime_dialog is None:
+            self.lifetime_dialog = LifetimeDialog(self.lifetime, self)
+        self.lifetime_dialog.show()
+        self.lifetime_dialog.raise_()
+        
     def show_scheduling_dialog(self):
         dialog = QDialog(self)
         dialog.setWindowTitle("Select CPU Scheduling Algorithm")
@@ -1165,6 +2496,8 @@ class SystemMonitor(QMainWindow):
             def make_callback(algorithm):
                 def callback():
                     dialog.accept()
+                    # The simulator is only loaded when first used
+                    from scheduling import SchedulingWindow
                     self.scheduling_window = SchedulingWindow(algorithm, self)
                     self.scheduling_window.show()
                 return callback
@@ -1175,16 +2508,59 @@ class SystemMonitor(QMainWindow):
         dialog.exec()
 
     def show_settings_dialog(self):
-        dialog = SettingsDialog(self)
+        dialog = SettingsDialog(self, self.settings)
         if dialog.exec() == QDialog.Accepted:
             self.settings = dialog.get_settings()
+            if self.persist:
+                try:
+                    save_settings(self.settings)
+                except OSError as e:
+                    self.alert_panel.add_alert(f"Could not save settings: {e}", "critical")
             self.alert_panel.cpu_threshold = self.settings['cpu_threshold']
             self.alert_panel.memory_threshold = self.settings['memory_threshold']
-            self.timer.setInterval(self.settings['update_interval'] * 1000)
+            if self.fleet_overview is not None:
+                self.fleet_overview.set_thresholds(self.settings['cpu_threshold'], self.settings['memory_threshold'])
+            self.scheduler.set_interval('system', self.settings['metrics_interval_ms'])
+            self.resize_graphs()
+            self.scheduler.set_interval(
+                'processes', self.settings['update_interval'] * 1000, self.settings['scan_budget_ms']
+            )
+            self.process_model.limit = self.settings['max_processes']
+            self.memory_detail.budget_ms = self.settings['memory_detail_budget_ms']
+            if not self.anomalies.z_threshold:
+                # Detection was off, the series are out of date
+                self.anomalies.reset()
+            self.anomalies.z_threshold = self.settings['anomaly_z']
+            if self.cgroups is not None and self.cgroups.by != self.settings['cgroup_grouping']:
+                self.cgroups = CgroupSampler(self.settings['cgroup_grouping'])
+                self.expanded_groups.clear()
+            if self.settings['lifetime_source'] != self.lifetime.requested:
+                self.lifetime.start(self.settings['lifetime_source'])
+            self.set_metrics_port(self.settings['metrics_port'])
+            # Switching collectors drops per-PID state, keep the current one if unchanged
+            if self.local_collector_name() != self.collector.name:
+                if isinstance(self.collector, SharedCollector):
+                    self.collector.close()
+                self.collector = self.make_local_collector()
+            self.apply_sort_setting()
+            self.apply_process_filter()
             self.update_stats()
 
 if __name__ == '__main__':
-    app = QApplication(sys.argv)
-    window = SystemMonitor()
+    parser = argparse.ArgumentParser(description="Process Visualization Tool")
+    parser.add_argument("--connect", action="append", default=[], metavar="ADDRESS",
+                        help="remote agent to add to the host list (repeatable)")
+    parser.add_argument("--metrics-port", type=int, default=0, metavar="PORT",
+                        help="serve Prometheus/OpenMetrics metrics on this port")
+    parser.add_argument("--no-state", action="store_true",
+                        help="start from default settings and don't load or save session state")
+    args, qt_args = parser.parse_known_args()
+    app = QApplication(sys.argv[:1] + qt_args)
+    window = SystemMonitor(persist=not args.no_state)
+    if args.metrics_port:
+        window.settings['metrics_port'] = args.metrics_port
+        window.set_metrics_port(args.metrics_port)
+    for address in args.connect:
+        window.add_remote_host(address)
     window.show()
     sys.exit(app.exec())
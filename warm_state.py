@@ -0,0 +1,110 @@
+import os
+import json
+import time
+import tempfile
+import numpy as np
+import psutil
+
+# What the monitor keeps between launches. Settings are JSON in the config
+# directory, written when the settings dialog is accepted. On exit a compact
+# snapshot of the session goes to the state directory: the metric history as
+# one .npy file, memory-mapped back on the next start so it costs nothing
+# until a chart or an export reads it, and a small JSON file with the
+# graphs' recent samples, the theme, the alerts and the collector's per-PID
+# cache of static attributes (so the first scan only reads what changes).
+
+APP_DIR = "process-visualization-tool"
+STATE_VERSION = 1
+
+def config_dir():
+    base = os.environ.get('XDG_CONFIG_HOME') or os.path.join(os.path.expanduser("~"), ".config")
+    return os.path.join(base, APP_DIR)
+
+def state_dir():
+    base = os.environ.get('XDG_STATE_HOME') or os.path.join(os.path.expanduser("~"), ".local", "state")
+    return os.path.join(base, APP_DIR)
+
+def write_atomic(path, write):
+    # write(f) fills a temporary file that then replaces path, so a crash
+    # never leaves a half-written file and a reader (or a mapping of the old
+    # file) never sees one
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, temporary = tempfile.mkstemp(dir=directory, prefix="." + os.path.basename(path))
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            write(f)
+        os.replace(temporary, path)
+    except BaseException:
+        os.unlink(temporary)
+        raise
+
+def load_settings(defaults, path=None):
+    # Saved values override the defaults; unknown keys and values of another
+    # type (e.g. from a different version) are ignored
+    path = path or os.path.join(config_dir(), "settings.json")
+    settings = dict(defaults)
+    try:
+        with open(path) as f:
+            saved = json.load(f)
+    except (OSError, ValueError):
+        return settings
+    if not isinstance(saved, dict):
+        return settings
+    for key, value in saved.items():
+        if key not in defaults:
+            continue
+        default = defaults[key]
+        if isinstance(default, float) and type(value) is int:
+            value = float(value)
+        if type(value) is type(default):
+            settings[key] = value
+    return settings
+
+def save_settings(settings, path=None):
+    path = path or os.path.join(config_dir(), "settings.json")
+    body = json.dumps(settings, indent=2, sort_keys=True).encode()
+    write_atomic(path, lambda f: f.write(body))
+
+def save_state(history, graphs, theme, alerts, static, directory=None):
+    # history: MetricHistory; graphs: name -> array; alerts: [(text, level)],
+    # newest first; static: the collector's export_static()
+    directory = directory or state_dir()
+    blocks = list(history.iter_chunks())
+    if blocks:
+        rows = np.concatenate(blocks)
+        write_atomic(os.path.join(directory, "history.npy"), lambda f: np.save(f, rows))
+    state = {
+        'version': STATE_VERSION,
+        'saved_at': time.time(),
+        'boot_time': psutil.boot_time(),
+        'history_columns': history.columns if blocks else None,
+        'graphs': {name: np.asarray(values).tolist() for name, values in graphs.items()},
+        'theme': theme,
+        'alerts': alerts,
+        'static': static
+    }
+    body = json.dumps(state, separators=(',', ':')).encode()
+    write_atomic(os.path.join(directory, "state.json"), lambda f: f.write(body))
+
+def load_state(directory=None):
+    # The saved state as a dict, with 'history' a read-only memory map of the
+    # rows (or None); None if there is nothing usable
+    directory = directory or state_dir()
+    try:
+        with open(os.path.join(directory, "state.json")) as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(state, dict) or state.get('version') != STATE_VERSION:
+        return None
+    # PIDs (and procfs start times) only identify a process within one boot
+    if abs(state.get('boot_time', 0) - psutil.boot_time()) > 1:
+        state['static'] = None
+    state['history'] = None
+    if state.get('history_columns'):
+        try:
+            state['history'] = np.load(os.path.join(directory, "history.npy"), mmap_mode='r')
+        except (OSError, ValueError):
+            pass
+    return state